@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the simulation, the statistics output and the visualizations.
+
+Every benchmark reports operations per second (turns, moves, rolls or calls)
+and peak memory, and is compared with a stored baseline. The speed of the
+machine drifts between runs, so every timing is taken next to a fixed
+calibration loop, and the regression check compares the operations done in
+the time of one calibration loop rather than the raw operations per second:
+
+    python -m benchmarks.bench                  # compare with benchmarks/baseline.json
+    python -m benchmarks.bench --save           # record a new baseline
+    python -m benchmarks.bench --threshold 0.3  # allow 30% regressions
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import statistics
+import time
+import tracemalloc
+import warnings
+
+# Make the simulation packages importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.dice import Dice
+from game.game_logic import Game
+from game.simulation import run_simulation, save_statistics
+from models.board import Board
+from models.player import Player
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Largest allowed relative regression
+DEFAULT_REPEAT = 15  # Timed runs per benchmark, the median is kept
+MIN_SECONDS = 0.05  # Shortest timed run, a benchmark is called again until it lasts that long
+MEMORY_SLACK_KIB = 64  # Growth of peak memory always allowed, for benchmarks that allocate next to nothing
+
+# Registered benchmarks: {name: setup}
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark.
+
+    The decorated function is a context manager that prepares the benchmark
+    and yields ``(run, operations)``: a function to time, and how many
+    operations one call of it performs.
+    """
+    def register(setup):
+        BENCHMARKS[name] = contextlib.contextmanager(setup)
+        return setup
+    return register
+
+
+def _players(game: Game, count: int):
+    players = [Player(f"Player {i + 1}") for i in range(count)]
+    for player in players:
+        player.position = game.game_start()
+    return players
+
+
+@benchmark("board_construction")
+def bench_board_construction(count: int = 200):
+    def run():
+        for _ in range(count):
+            Board()
+    yield run, count
+
+
+@benchmark("board_traverse")
+def bench_board_traverse(count: int = 100000):
+    board = Board()
+    steps = [step % 11 + 2 for step in range(count)]
+
+    def run():
+        position = board.start
+        for step in steps:
+            position = board.traverse(step, position)
+    yield run, count
+
+
+@benchmark("move_player")
+def bench_move_player(count: int = 50000):
+    board = Board()
+    game = Game(board, dice=Dice(0))
+    player = _players(game, 1)[0]
+    steps = [step % 11 + 2 for step in range(count)]
+
+    def run():
+        for step in steps:
+            game.move_player(player, step)
+            player.in_jail = False
+    yield run, count
+
+
+@benchmark("roll_dice")
+def bench_roll_dice(count: int = 100000):
+    game = Game(Board(), dice=Dice(0))
+
+    def run():
+        for _ in range(count):
+            game.roll_dice()
+    yield run, count
+
+
+@benchmark("player_turn")
+def bench_player_turn(count: int = 50000):
+    game = Game(Board(), dice=Dice(0))
+    player = _players(game, 1)[0]
+
+    def run():
+        for _ in range(count):
+            game.player_turn(player)
+    yield run, count
+
+
+@benchmark("full_game")
+def bench_full_game(rounds: int = 1000, players: int = 4):
+    """A whole game without money; operations are turns."""
+    board = Board()
+
+    def run():
+        game = Game(board, dice=Dice(0))
+        game_players = _players(game, players)
+        for _ in range(rounds):
+            game.play_round(game_players)
+    yield run, rounds * players
+
+
+@benchmark("save_statistics")
+def bench_save_statistics(count: int = 50):
+    result = run_simulation(100, 4, seed=0)
+    with tempfile.TemporaryDirectory() as directory:
+        def run():
+            for _ in range(count):
+                save_statistics(result, directory)
+        yield run, count
+
+
+def _visualizer(module_name: str, function_name: str, loader_name: str, runs: int = 50):
+    """Benchmark a visualizer function of ``stats`` on the CSV statistics of several runs."""
+    def setup():
+        import matplotlib
+        matplotlib.use("Agg")
+        module = importlib.import_module(f"stats.{module_name}")
+        function = getattr(module, function_name)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            for run in range(runs):
+                save_statistics(run_simulation(50, run % 5 + 2, seed=run), os.path.join(directory, "data"))
+            # The visualizers read and write the data directory of the working directory
+            os.chdir(directory)
+            try:
+                df = getattr(module, loader_name)()
+
+                def run():
+                    # Keep the messages and library warnings of the visualizers out of the report
+                    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        function(df)
+                yield run, 1
+            finally:
+                os.chdir(cwd)
+    return setup
+
+
+for _name in ("visualize_landing_frequency", "visualize_property_heatmap", "visualize_by_game_size"):
+    benchmark(_name)(_visualizer("visualize_properties", _name, "load_property_data"))
+for _name in ("visualize_dice_combinations", "visualize_dice_sums", "visualize_doubles_percentage"):
+    benchmark(_name)(_visualizer("visualize_dice", _name, "load_dice_data"))
+
+
+def calibration():
+    """A fixed pure-Python workload that the benchmarks are timed against."""
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    return total
+
+
+def _time(function):
+    """Return the seconds of one call of a function, over calls lasting at least MIN_SECONDS."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+        seconds = time.perf_counter() - start
+        if seconds >= MIN_SECONDS:
+            return seconds / calls
+
+
+def measure(name: str, repeat: int = DEFAULT_REPEAT):
+    """Run a benchmark and return its metrics.
+
+    Each timed run of the benchmark repeats it for at least MIN_SECONDS and
+    is preceded by a timing of the calibration loop, short enough that both
+    see the same speed of the machine.
+
+    Returns:
+        dict: ``ops_per_second``, the median of ``repeat`` timed runs,
+            ``calibrated_ops``, the median of the operations done in the time
+            of one calibration loop, and ``peak_kib``, the peak memory
+            allocated during one more run traced with tracemalloc.
+    """
+    with BENCHMARKS[name]() as (run, operations):
+        seconds = []
+        calibrated = []
+        for _ in range(repeat):
+            calibration_seconds = _time(calibration)
+            seconds.append(_time(run))
+            calibrated.append(operations * calibration_seconds / seconds[-1])
+
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "ops_per_second": round(operations / statistics.median(seconds), 1),
+        "calibrated_ops": float(f"{statistics.median(calibrated):.4g}"),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(names=None, repeat: int = DEFAULT_REPEAT, output=None):
+    """Measure several benchmarks, all of them by default, and return {name: metrics}."""
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = measure(name, repeat)
+        if output is not None:
+            print(f"{name:30} {results[name]['ops_per_second']:>14,.1f} ops/s "
+                  f"{results[name]['calibrated_ops']:>12,.4g} ops/calibration "
+                  f"{results[name]['peak_kib']:>12,.1f} KiB", file=output)
+    return results
+
+
+def compare(results, baseline, threshold: float = DEFAULT_THRESHOLD, memory_threshold: float = None):
+    """Return the regressions of results against a baseline.
+
+    A benchmark regresses when its speed drops by more than ``threshold``, or
+    its peak memory grows by more than ``memory_threshold``
+    (``threshold`` by default) and MEMORY_SLACK_KIB, relative to the baseline.
+    The speed is ``calibrated_ops`` when both sides have it, and
+    ``ops_per_second`` otherwise. Benchmarks missing from either side are
+    ignored.
+
+    Returns:
+        list: (name, metric, baseline value, value) of every regression.
+    """
+    if memory_threshold is None:
+        memory_threshold = threshold
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        speed = "calibrated_ops" if "calibrated_ops" in metrics and "calibrated_ops" in expected else "ops_per_second"
+        if metrics[speed] < expected[speed] * (1 - threshold):
+            regressions.append((name, speed, expected[speed], metrics[speed]))
+        if metrics["peak_kib"] > expected["peak_kib"] * (1 + memory_threshold) + MEMORY_SLACK_KIB:
+            regressions.append((name, "peak_kib", expected["peak_kib"], metrics["peak_kib"]))
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH):
+    """Load the benchmark metrics of a baseline file."""
+    with open(path) as baseline_file:
+        return json.load(baseline_file)["benchmarks"]
+
+
+def save_baseline(results, path: str = BASELINE_PATH):
+    """Save benchmark metrics as a baseline, with the machine they were measured on."""
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    with open(path, "w") as baseline_file:
+        json.dump(data, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation and compare with a baseline.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (all by default)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="largest allowed relative drop in speed")
+    parser.add_argument("--memory-threshold", type=float,
+                        help="largest allowed relative growth of peak memory (--threshold by default)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timed runs per benchmark, the median is kept")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.names, args.repeat, output=sys.stdout)
+    if args.save:
+        if args.names and os.path.exists(args.baseline):
+            # Only replace the benchmarks that were run
+            results = {**load_baseline(args.baseline), **results}
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save to record one")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold, args.memory_threshold)
+    for name, metric, expected, value in regressions:
+        print(f"REGRESSION {name} {metric}: {expected:,.4g} -> {value:,.4g}")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
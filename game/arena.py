@@ -0,0 +1,215 @@
+"""Shared-memory counters of running simulations, readable live from other processes"""
+import argparse
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from game.stats import GameStats
+
+FORMAT_VERSION = 1
+
+# Header of the arena: format version, board size, number of slots and whether the run is over
+HEADER = 4
+# Columns of a slot before the landings and dice counts
+SEQUENCE, GAMES, ROUNDS, TURNS = range(4)
+COUNTERS = 4
+
+
+class ArenaSnapshot:
+    """Counts read from an arena, summed over its slots"""
+
+    def __init__(self, stats: GameStats, games: int, rounds: int, turns: int):
+        self.stats = stats
+        self.games = games
+        self.rounds = rounds
+        self.turns = turns
+
+    def report(self, board=None, top: int = 5):
+        """Return the totals, with the most landed squares when a board is given."""
+        lines = [f"{self.games} games, {self.rounds} rounds, {self.turns} turns, {self.stats.total_rolls} rolls"]
+        landings = sum(self.stats.landings)
+        if board is not None and landings:
+            ranked = sorted(self.stats.landing_stats(board).items(), key=lambda item: item[1], reverse=True)
+            lines.extend(f"  {name:25} {count / landings:7.2%}" for name, count in ranked[:top])
+        return "\n".join(lines)
+
+
+class StatsArena:
+    """Landing, dice, game, round and turn counters in shared memory.
+
+    The arena has one slot per writer, such as one per shard of a parallel
+    run, so that no two processes ever write the same counters. Each slot is a
+    row of int64 counters guarded by a sequence number, odd while the writer
+    updates the row: readers copy a row and retry when the number was odd or
+    changed meanwhile, so every slot they read is consistent (a seqlock).
+
+    Create the arena with ``StatsArena.create``, and attach to it from other
+    processes with ``StatsArena.attach(name)``. The creator unlinks it.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool = False):
+        self.memory = memory
+        self.owner = owner
+        header = np.ndarray((HEADER,), dtype=np.int64, buffer=memory.buf)
+        if header[0] != FORMAT_VERSION:
+            raise ValueError(f"Shared memory {memory.name} is not a statistics arena of format {FORMAT_VERSION}")
+        self.header = header
+        self.size = int(header[1])
+        self.slots = int(header[2])
+        self.rows = np.ndarray((self.slots, COUNTERS + self.size + 36), dtype=np.int64, buffer=memory.buf,
+                               offset=HEADER * 8)
+
+    @classmethod
+    def create(cls, size: int, slots: int = 1, name: str = None):
+        """Create an arena for a board of ``size`` squares with zeroed counters.
+
+        Args:
+            size (int): Number of squares of the board.
+            slots (int): Number of writers.
+            name (str): Name of the shared memory, generated if None.
+        """
+        memory = shared_memory.SharedMemory(name=name, create=True, size=(HEADER + slots * (COUNTERS + size + 36)) * 8)
+        header = np.ndarray((HEADER,), dtype=np.int64, buffer=memory.buf)
+        header[:] = (0, size, slots, 0)
+        np.ndarray((slots * (COUNTERS + size + 36),), dtype=np.int64, buffer=memory.buf, offset=HEADER * 8)[:] = 0
+        # Written last, so that an arena is only valid once initialized
+        header[0] = FORMAT_VERSION
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str):
+        """Attach to the arena of another process by name."""
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False))
+        # Before Python 3.13 attaching registers the memory with the resource
+        # tracker, which would unlink it when a monitor with its own tracker exits
+        own_tracker = resource_tracker._resource_tracker._fd is None
+        memory = shared_memory.SharedMemory(name=name)
+        if own_tracker:
+            resource_tracker.unregister(memory._name, "shared_memory")
+        return cls(memory)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    @property
+    def finished(self):
+        """Whether the creator has closed the arena, so that the counts are final."""
+        return bool(self.header[3])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Detach from the arena, and remove it when this process created it."""
+        if self.owner:
+            self.header[3] = 1
+        # Views of the buffer must go before the memory can be closed
+        self.header = None
+        self.rows = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def add(self, slot: int, landings, dice, games: int = 0, rounds: int = 0, turns: int = 0):
+        """Add counts to a slot, which only this process writes."""
+        row = self.rows[slot]
+        row[SEQUENCE] += 1
+        row[GAMES] += games
+        row[ROUNDS] += rounds
+        row[TURNS] += turns
+        row[COUNTERS:COUNTERS + self.size] += landings
+        row[COUNTERS + self.size:] += dice
+        row[SEQUENCE] += 1
+
+    def read_slot(self, slot: int):
+        """Return a consistent copy of a slot's counters."""
+        row = self.rows[slot]
+        while True:
+            sequence = int(row[SEQUENCE])
+            if not sequence % 2:
+                copy = row.copy()
+                if copy[SEQUENCE] == sequence and row[SEQUENCE] == sequence:
+                    return copy
+            time.sleep(0)
+
+    def snapshot(self):
+        """Return the counts of all the slots, each read consistently.
+
+        Returns:
+            ArenaSnapshot: The summed landings and dice as GameStats, and the
+                games, rounds and turns.
+        """
+        total = sum(self.read_slot(slot) for slot in range(self.slots))
+        counts = total[COUNTERS:].tolist()
+        return ArenaSnapshot(GameStats(self.size, counts[:self.size], counts[self.size:]),
+                             int(total[GAMES]), int(total[ROUNDS]), int(total[TURNS]))
+
+
+class ArenaWriter:
+    """Publishes the growing counts of a GameStats to one slot of an arena.
+
+    Only what was added since the last publication is added to the slot, so a
+    run can publish the stats of a long game as it goes.
+    """
+
+    def __init__(self, arena: StatsArena, slot: int = 0):
+        self.arena = arena
+        self.slot = slot
+        self.landings = np.zeros(arena.size, dtype=np.int64)
+        self.dice = np.zeros(36, dtype=np.int64)
+
+    def reset(self):
+        """Start publishing new GameStats, counted from zero."""
+        self.landings[:] = 0
+        self.dice[:] = 0
+
+    def publish(self, stats: GameStats, games: int = 0, rounds: int = 0, turns: int = 0):
+        landings = np.array(stats.landings, dtype=np.int64)
+        dice = np.array(stats.dice, dtype=np.int64)
+        self.arena.add(self.slot, landings - self.landings, dice - self.dice, games, rounds, turns)
+        self.landings = landings
+        self.dice = dice
+
+
+def monitor(name: str, interval: float = 1.0, board=None, out=sys.stdout):
+    """Print the counts of an arena every ``interval`` seconds until the run is over or Ctrl-C."""
+    arena = StatsArena.attach(name)
+    try:
+        previous = None
+        while True:
+            finished = arena.finished
+            snapshot = arena.snapshot()
+            rate = ""
+            if previous is not None:
+                rate = f" ({(snapshot.turns - previous.turns) / interval:,.0f} turns/s)"
+            out.write(f"{snapshot.report(board)}{rate}\n")
+            out.flush()
+            if finished:
+                break
+            previous = snapshot
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        arena.close()
+
+
+def main(argv=None):
+    from models.board import Board
+
+    parser = argparse.ArgumentParser(description="Print the live statistics of a running simulation.")
+    parser.add_argument("name", help="name of the shared-memory arena, printed by main.py --live")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between two reports")
+    args = parser.parse_args(argv)
+    monitor(args.name, args.interval, Board())
+
+
+if __name__ == "__main__":
+    main()
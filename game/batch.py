@@ -0,0 +1,188 @@
+"""Vectorized simulation of many games in lockstep"""
+import numpy as np
+
+from models.board import Board
+from game.cards import JAIL, card_tables
+from game.rules import roll_tables
+from game.stats import GameStats
+
+
+class GameBatch:
+    """Simulate a batch of games at once with NumPy arrays.
+
+    Every player of every game is one entry of the state arrays. Movement
+    never depends on the other players, so a round advances every player of
+    every game at once with the same rules as ``Game.player_turn`` and the
+    three doubles check in ``main.py``. Each roll is resolved for all players
+    still rolling with lookups into the tables from ``game.rules.roll_tables``,
+    and each card with a lookup into the tables from ``game.cards.card_tables``.
+    Every draw is a uniformly random card of the deck, like in ``game.markov``.
+    """
+
+    def __init__(self, board: Board, num_games: int, num_players: int, seed=None,
+                 max_jail_turns: int = 3, max_doubles: int = 3):
+        self.board = board
+        self.num_games = num_games
+        self.num_players = num_players
+        self.max_jail_turns = max_jail_turns
+        self.max_doubles = max_doubles
+        self.rng = np.random.default_rng(seed)
+
+        size = len(board)
+        shape = (num_games, num_players)
+        # Square index, or len(board) + jail_turns for a player in jail
+        self.state = np.zeros(shape, dtype=np.int32)
+        # Consecutive doubles rolled during the last turn
+        self.doubles = np.zeros(shape, dtype=np.int32)
+        self.rounds = 0
+
+        # Landings per game and square, plus a column for rolls that did not move
+        self._landings = np.zeros((num_games, size + 1), dtype=np.int64)
+        # Ordered dice outcomes per game: dice[game, dice1 - 1, dice2 - 1]
+        self.dice = np.zeros((num_games, 6, 6), dtype=np.int64)
+
+        # Roll tables for every roll of a turn but the last, and for the last one
+        self._tables = [
+            [np.array(table, dtype=np.int32) for table in roll_tables(board, max_jail_turns, last_roll)]
+            for last_roll in (False, True)
+        ]
+
+        # Card destinations, and the deck size of every square with a 0 for rolls that did not move
+        destination, deck_size = card_tables(board)
+        self._card_destination = np.array(destination, dtype=np.int32)
+        self._deck_size = np.array(deck_size + [0], dtype=np.int32)
+
+        # Offsets of each player's game in the flattened count arrays
+        game = np.repeat(np.arange(num_games, dtype=np.int64), num_players)
+        self._landing_offset = game * (size + 1)
+        self._dice_offset = game * 36
+
+        # Landing and dice indexes buffered between flushes into the count arrays
+        self._pending_landings = []
+        self._pending_dice = []
+        self._pending = 0
+
+    @property
+    def landings(self):
+        """Landings per game and square: landings[game, square]."""
+        return self._landings[:, :-1]
+
+    @property
+    def position(self):
+        """Square index of every player."""
+        return np.where(self.in_jail, self.board.jail_position, self.state)
+
+    @property
+    def in_jail(self):
+        """Whether every player is in jail."""
+        return self.state >= len(self.board)
+
+    @property
+    def jail_turns(self):
+        """Failed rolls of every player in jail."""
+        return np.where(self.in_jail, self.state - len(self.board), 0)
+
+    def play_round(self):
+        """Play one turn, including extra rolls for doubles, for every player of every game."""
+        state = self.state.reshape(-1)
+        doubles = self.doubles.reshape(-1)
+        doubles[:] = 0
+        jail = self.board.jail_position
+
+        # Players still rolling this turn, everyone on the first roll
+        idx = None
+        for roll in range(self.max_doubles):
+            last_roll = roll == self.max_doubles - 1
+            next_state, landed, again, speeding = self._tables[last_roll]
+
+            if idx is None:
+                current, landing_offset, dice_offset = state, self._landing_offset, self._dice_offset
+            else:
+                current, landing_offset, dice_offset = state[idx], self._landing_offset[idx], self._dice_offset[idx]
+
+            # One draw per roll: outcome = (dice1 - 1) * 6 + (dice2 - 1)
+            outcome = self.rng.integers(0, 36, size=len(current), dtype=np.int32)
+            key = current * 36 + outcome
+            square = landed.take(key)
+            new_state = next_state.take(key)
+            rolls_again = again.take(key)
+            sent_to_jail = speeding.take(key)
+            self._draw_cards(square, new_state, rolls_again, sent_to_jail)
+            self._pending_dice.append(dice_offset + outcome)
+            self._pending_landings.append(landing_offset + square)
+
+            if idx is None:
+                state[:] = new_state
+            else:
+                state[idx] = new_state
+
+            if last_roll:
+                # Third double: counted on the square rolled to, then as a Jail landing
+                sent = sent_to_jail.nonzero()[0]
+                self._pending_landings.append(landing_offset[sent] + jail)
+                break
+
+            rolling = rolls_again.nonzero()[0]
+            if not len(rolling):
+                break
+            idx = rolling if idx is None else idx[rolling]
+            doubles[idx] = roll + 1
+
+        self.rounds += 1
+        self._pending += self.state.size
+        if self._pending >= self._landings.size:
+            self.flush()
+
+    def _draw_cards(self, square, new_state, rolls_again, sent_to_jail):
+        """Follow the cards drawn by the players who landed on a card square, in place."""
+        size = len(self.board)
+        drawing = self._deck_size.take(square).nonzero()[0]
+        while len(drawing):
+            cards = self._deck_size.take(square[drawing])
+            slot = (self.rng.random(len(drawing)) * cards).astype(np.int32)
+            origin = square[drawing]
+            destination = self._card_destination.take(slot * size + origin)
+
+            jailed = destination == JAIL
+            destination[jailed] = self.board.jail_position
+            square[drawing] = destination
+            # Players sent to jail by the third double stay there, the others go where the card sends them
+            new_state[drawing] = np.where(jailed, size, np.where(new_state[drawing] >= size, size, destination))
+            rolls_again[drawing[jailed]] = False
+            sent_to_jail[drawing[jailed]] = False
+
+            # Cards moving to another card square draw again
+            moved = ~jailed & (destination != origin)
+            drawing = drawing[moved][self._deck_size.take(destination[moved]) > 0]
+
+    def flush(self):
+        """Add the landings and dice rolls buffered by play_round to the count arrays."""
+        if self._pending_landings:
+            landed = np.concatenate(self._pending_landings)
+            self._landings += np.bincount(landed, minlength=self._landings.size).reshape(self._landings.shape)
+        if self._pending_dice:
+            rolled = np.concatenate(self._pending_dice)
+            self.dice += np.bincount(rolled, minlength=self.dice.size).reshape(self.dice.shape)
+        self._pending_landings = []
+        self._pending_dice = []
+        self._pending = 0
+
+    def run(self, num_rounds: int):
+        """Play a number of rounds and return the landing counts."""
+        for _ in range(num_rounds):
+            self.play_round()
+        self.flush()
+        return self.landings
+
+    def stats(self):
+        """Return the landing and dice counts over the whole batch."""
+        self.flush()
+        return GameStats(len(self.board), self.landings.sum(axis=0).tolist(), self.dice.sum(axis=0).reshape(-1).tolist())
+
+    def get_landing_stats(self):
+        """Return landing counts over the whole batch keyed by property name."""
+        return self.stats().landing_stats(self.board)
+
+    def get_dice_stats(self):
+        """Return dice combination counts over the whole batch, (1, 6) and (6, 1) combined."""
+        return self.stats().dice_stats()
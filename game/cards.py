@@ -0,0 +1,219 @@
+"""Chance and Community Chest cards, their decks and movement tables"""
+import random
+from collections import deque
+
+from models.board import Board
+from models.property_model import SquareKind
+
+JAIL = -1  # Destination of the cards that send the player to jail
+
+
+class Card:
+    """A Chance or Community Chest card"""
+
+    def __init__(self, text: str, advance: str = None, nearest: SquareKind = None, back: int = 0, jail: bool = False,
+                 money: int = 0, each_player: int = 0, repairs: tuple = None, keep: bool = False):
+        self.text = text
+        # Name of the square to advance to, collecting the salary when passing Go
+        self.advance = advance
+        # Kind of the nearest square to advance to, where the rent is higher
+        self.nearest = nearest
+        # Number of squares to go back
+        self.back = back
+        self.jail = jail
+        # Money from the bank, or paid to it when negative
+        self.money = money
+        # Money from every other player, or paid to each of them when negative
+        self.each_player = each_player
+        # Cost of repairs (per house, per hotel)
+        self.repairs = repairs
+        # Kept until used to get out of jail
+        self.keep = keep
+
+
+CHANCE_CARDS = [
+    Card("Advance to Boardwalk", advance="Boardwalk"),
+    Card("Advance to Go (Collect $200)", advance="Go"),
+    Card("Advance to Illinois Avenue. If you pass Go, collect $200", advance="Illinois Avenue"),
+    Card("Advance to St. Charles Place. If you pass Go, collect $200", advance="St. Charles Place"),
+    Card("Advance to the nearest Railroad and pay the owner twice the rent", nearest=SquareKind.RAILROAD),
+    Card("Advance to the nearest Railroad and pay the owner twice the rent", nearest=SquareKind.RAILROAD),
+    Card("Advance to the nearest Utility and pay the owner ten times the dice roll", nearest=SquareKind.UTILITY),
+    Card("Bank pays you dividend of $50", money=50),
+    Card("Get Out of Jail Free", keep=True),
+    Card("Go Back 3 Spaces", back=3),
+    Card("Go to Jail", jail=True),
+    Card("Make general repairs on all your property: $25 per house, $100 per hotel", repairs=(25, 100)),
+    Card("Speeding fine $15", money=-15),
+    Card("Take a trip to Reading Railroad. If you pass Go, collect $200", advance="Reading Railroad"),
+    Card("You have been elected Chairman of the Board. Pay each player $50", each_player=-50),
+    Card("Your building loan matures. Collect $150", money=150),
+]
+
+COMMUNITY_CHEST_CARDS = [
+    Card("Advance to Go (Collect $200)", advance="Go"),
+    Card("Bank error in your favor. Collect $200", money=200),
+    Card("Doctor's fee. Pay $50", money=-50),
+    Card("From sale of stock you get $50", money=50),
+    Card("Get Out of Jail Free", keep=True),
+    Card("Go to Jail", jail=True),
+    Card("Holiday fund matures. Receive $100", money=100),
+    Card("Income tax refund. Collect $20", money=20),
+    Card("It is your birthday. Collect $10 from every player", each_player=10),
+    Card("Life insurance matures. Collect $100", money=100),
+    Card("Pay hospital fees of $100", money=-100),
+    Card("Pay school fees of $50", money=-50),
+    Card("Receive $25 consultancy fee", money=25),
+    Card("You are assessed for street repairs: $40 per house, $115 per hotel", repairs=(40, 115)),
+    Card("You have won second prize in a beauty contest. Collect $10", money=10),
+    Card("You inherit $100", money=100),
+]
+
+
+def destinations(board: Board, cards):
+    """Compile where every card sends a player who draws it on every square.
+
+    Returns:
+        list: Indexed by ``card * len(board) + square``, the square the player
+            moves to, the square itself for cards that do not move, or JAIL.
+    """
+    size = len(board)
+    table = []
+    for card in cards:
+        for square in range(size):
+            if card.jail:
+                destination = JAIL
+            elif card.advance is not None:
+                # Cards naming a square the board does not have do not move
+                destination = board.positions.get(card.advance, [square])[0]
+            elif card.nearest is not None:
+                destination = next(
+                    ((square + step) % size for step in range(1, size + 1)
+                     if board.kinds[(square + step) % size] == card.nearest),
+                    square,
+                )
+            else:
+                destination = (square - card.back) % size
+
+            if destination == board.go_to_jail_position:
+                destination = JAIL
+            table.append(destination)
+    return table
+
+
+def card_tables(board: Board, chance=CHANCE_CARDS, chest=COMMUNITY_CHEST_CARDS):
+    """Build the movement of a card drawn on any square as lookup tables.
+
+    Each draw is taken as a uniformly random card of the deck of the square,
+    and Get Out of Jail Free cards as cards that do not move.
+
+    Returns:
+        tuple: ``(destination, deck_size)`` where ``destination[slot * len(board) + square]``
+            is where the slot-th card of the deck of the square sends the player,
+            and ``deck_size[square]`` is the number of cards of that deck, 0 on
+            squares without a deck.
+    """
+    size = len(board)
+    decks = {SquareKind.CHANCE: destinations(board, chance), SquareKind.CHEST: destinations(board, chest)}
+    sizes = {SquareKind.CHANCE: len(chance), SquareKind.CHEST: len(chest)}
+    slots = max(sizes.values())
+
+    deck_size = [sizes.get(kind, 0) for kind in board.kinds]
+    destination = []
+    for slot in range(slots):
+        for square, kind in enumerate(board.kinds):
+            if slot < deck_size[square]:
+                destination.append(decks[kind][slot * size + square])
+            else:
+                destination.append(square)
+    return destination, deck_size
+
+
+def card_outcomes(board: Board, chance=CHANCE_CARDS, chest=COMMUNITY_CHEST_CARDS):
+    """Return where a player landing on every square ends up after drawing cards.
+
+    Cards that move to another card square draw again.
+
+    Returns:
+        list: For every square, a list of (probability, destination) pairs
+            where destination may be JAIL.
+    """
+    size = len(board)
+    destination, deck_size = card_tables(board, chance, chest)
+
+    def resolve(square, probability, outcomes):
+        cards = deck_size[square]
+        for slot in range(cards):
+            target = destination[slot * size + square]
+            if target != JAIL and target != square and deck_size[target]:
+                resolve(target, probability / cards, outcomes)
+            else:
+                outcomes[target] = outcomes.get(target, 0) + probability / cards
+
+    result = []
+    for square in range(size):
+        if not deck_size[square]:
+            result.append([(1.0, square)])
+            continue
+        outcomes = {}
+        resolve(square, 1.0, outcomes)
+        result.append([(probability, target) for target, probability in outcomes.items()])
+    return result
+
+
+class Deck:
+    """A shuffled deck drawn from the top, every card going back to the bottom"""
+
+    def __init__(self, name: str, cards, board: Board, rng: random.Random):
+        self.name = name
+        self.cards = list(cards)
+        order = list(range(len(self.cards)))
+        rng.shuffle(order)
+        self.order = deque(order)
+        # Where every card sends a player drawing it on every square
+        self.destinations = destinations(board, self.cards)
+        self.size = len(board)
+
+    def draw(self):
+        """Draw the top card and return its index. Kept cards only go back with put_back."""
+        card = self.order.popleft()
+        if not self.cards[card].keep:
+            self.order.append(card)
+        return card
+
+    def put_back(self, card: int):
+        """Put a kept card back at the bottom of the deck."""
+        self.order.append(card)
+
+    def destination(self, card: int, square: int):
+        """Where a card sends a player who drew it on a square."""
+        return self.destinations[card * self.size + square]
+
+
+class CardDecks:
+    """The Chance and Community Chest decks of a game"""
+
+    def __init__(self, board: Board, seed=None, chance=CHANCE_CARDS, chest=COMMUNITY_CHEST_CARDS):
+        rng = random.Random(seed)
+        self.chance = Deck("Chance", chance, board, rng)
+        self.chest = Deck("Community Chest", chest, board, rng)
+        # Deck drawn on every square, None on squares without cards
+        decks = {SquareKind.CHANCE: self.chance, SquareKind.CHEST: self.chest}
+        self.by_square = [decks.get(kind) for kind in board.kinds]
+        self.by_name = {deck.name: deck for deck in (self.chance, self.chest)}
+
+    def collect(self, players):
+        """Put the Get Out of Jail Free cards the players still hold back in their decks, at the end of a game."""
+        for player in players:
+            for deck, card in player.jail_cards:
+                deck.put_back(card)
+            player.jail_cards = []
+
+    def getstate(self):
+        """Return the order of the cards of every deck: {deck name: [card, ...]}."""
+        return {name: list(deck.order) for name, deck in self.by_name.items()}
+
+    def setstate(self, state):
+        """Put the cards of every deck back in an order returned by getstate."""
+        for name, order in state.items():
+            self.by_name[name].order = deque(order)
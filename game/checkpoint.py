@@ -0,0 +1,122 @@
+"""Checkpoints of long simulations, to resume them where they stopped"""
+import json
+import os
+import time
+
+from game.convergence import ConvergenceTracker
+from game.stats import GameStats
+
+FORMAT_VERSION = 1
+
+
+def game_state(game, players):
+    """Return the state of a game between two rounds as plain data.
+
+    Positions are square indices. No doubles streak is running between rounds,
+    so none is kept.
+    """
+    economy = game.economy
+    return {
+        "players": [
+            [player.square, player.in_jail, player.jail_turns, player.money, player.bankrupt,
+             [[deck.name, card] for deck, card in player.jail_cards]]
+            for player in players
+        ],
+        "dice": game.dice.getstate(),
+        "decks": game.cards.getstate(),
+        "stats": [game.stats.landings, game.stats.dice],
+        "economy": economy.getstate() if economy is not None else None,
+    }
+
+
+def restore_game(game, players, state):
+    """Restore a state returned by game_state into a game and its new players."""
+    squares = game.board.squares
+    decks = game.cards.by_name
+    for player, (square, in_jail, jail_turns, money, bankrupt, jail_cards) in zip(players, state["players"]):
+        player.position = squares[square]
+        player.in_jail = in_jail
+        player.jail_turns = jail_turns
+        player.money = money
+        player.bankrupt = bankrupt
+        player.jail_cards = [(decks[name], card) for name, card in jail_cards]
+    game.dice.setstate(state["dice"])
+    game.cards.setstate(state["decks"])
+    game.stats = GameStats(len(game.board), *state["stats"])
+    if state["economy"] is not None:
+        game.economy.setstate(state["economy"])
+
+
+def tracker_state(tracker: ConvergenceTracker):
+    """Return the running statistics of a convergence tracker as plain data, or None."""
+    if tracker is None:
+        return None
+    return [[running.count, running.mean, running.m2] for running in (tracker.landings, tracker.dice)]
+
+
+def restore_tracker(tracker: ConvergenceTracker, state):
+    """Restore a state returned by tracker_state into a new tracker."""
+    for running, (count, mean, m2) in zip((tracker.landings, tracker.dice), state):
+        running.count = count
+        running.mean = mean
+        running.m2 = m2
+
+
+def save_checkpoint(path: str, state: dict):
+    """Write a checkpoint, replacing the previous one atomically."""
+    temporary = path + ".tmp"
+    text = json.dumps({"format": FORMAT_VERSION, **state}, separators=(",", ":"))
+    with open(temporary, "w") as checkpoint_file:
+        checkpoint_file.write(text)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str, params: dict = None):
+    """Read a checkpoint, or return None when there is none.
+
+    Raises:
+        ValueError: If the checkpoint was written by a run with other parameters.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as checkpoint_file:
+        state = json.load(checkpoint_file)
+    if state.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format in {path}: {state.get('format')}")
+    if params is not None and state["params"] != params:
+        raise ValueError(f"Checkpoint {path} is of a run with other parameters: {state['params']}")
+    return state
+
+
+class Checkpointer:
+    """Decides when to write checkpoints: every so many rounds, every so many seconds, or both.
+
+    The run only asks every ``check_every`` rounds, counting them down itself,
+    so that waiting for the next checkpoint costs next to nothing.
+    """
+
+    def __init__(self, path: str, every_rounds: int = None, every_seconds: float = None, check_every: int = 100,
+                 clock=time.monotonic):
+        if every_rounds is None and every_seconds is None:
+            every_seconds = 60.0
+        self.path = path
+        self.every_rounds = every_rounds
+        self.every_seconds = every_seconds
+        self.clock = clock
+        # Rounds between two looks at the round count and the clock
+        self.check_every = min(check_every, every_rounds) if every_rounds else check_every
+        self.rounds = 0
+        self.last = clock()
+        self.saved = 0
+
+    def due(self, rounds: int):
+        """Count rounds played since the last call and return whether a checkpoint is due."""
+        self.rounds += rounds
+        return ((self.every_rounds is not None and self.rounds >= self.every_rounds)
+                or (self.every_seconds is not None and self.clock() - self.last >= self.every_seconds))
+
+    def save(self, state: dict):
+        save_checkpoint(self.path, state)
+        self.rounds = 0
+        self.last = self.clock()
+        self.saved += 1
@@ -0,0 +1,82 @@
+"""Streaming convergence statistics across games"""
+import math
+from statistics import NormalDist
+
+from game.stats import GameStats
+
+
+class RunningStats:
+    """Running mean and variance of a vector of values (Welford's algorithm)"""
+
+    def __init__(self, size: int):
+        self.count = 0
+        self.mean = [0.0] * size
+        self.m2 = [0.0] * size
+
+    def add(self, values):
+        """Add one observation of every value."""
+        self.count += 1
+        count = self.count
+        mean = self.mean
+        m2 = self.m2
+        for i, value in enumerate(values):
+            delta = value - mean[i]
+            mean[i] += delta / count
+            m2[i] += delta * (value - mean[i])
+
+    def variance(self):
+        """Return the sample variance of every value."""
+        if self.count < 2:
+            return [math.inf] * len(self.mean)
+        return [m2 / (self.count - 1) for m2 in self.m2]
+
+    def half_widths(self, confidence: float = 0.95):
+        """Return the half-width of the confidence interval of every mean."""
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return [z * math.sqrt(variance / self.count) for variance in self.variance()]
+
+    def confidence_intervals(self, confidence: float = 0.95):
+        """Return the (low, high) confidence interval of every mean."""
+        return [
+            (mean - half_width, mean + half_width)
+            for mean, half_width in zip(self.mean, self.half_widths(confidence))
+        ]
+
+
+class ConvergenceTracker:
+    """Landing and dice frequencies per game, accumulated across games.
+
+    Each game adds the share of its landings on every square and the share of
+    its rolls for every ordered dice outcome.
+    """
+
+    def __init__(self, size: int, confidence: float = 0.95):
+        self.confidence = confidence
+        self.landings = RunningStats(size)
+        self.dice = RunningStats(36)
+
+    @property
+    def games(self):
+        return self.landings.count
+
+    def add(self, stats: GameStats):
+        """Add the counts of one game."""
+        landings = sum(stats.landings)
+        rolls = sum(stats.dice)
+        if landings:
+            self.landings.add([count / landings for count in stats.landings])
+        if rolls:
+            self.dice.add([count / rolls for count in stats.dice])
+
+    def max_half_width(self):
+        """Return the widest landing frequency confidence interval half-width."""
+        return max(self.landings.half_widths(self.confidence))
+
+    def converged(self, tolerance: float, min_games: int = 10):
+        """Whether every square's landing frequency is known within the tolerance."""
+        return self.games >= max(min_games, 2) and self.max_half_width() < tolerance
+
+    def report(self):
+        """Return a one line summary of the convergence so far."""
+        return (f"{self.games} games, landing frequency {self.confidence:.0%} CI "
+                f"half-width up to {self.max_half_width():.5f}")
@@ -0,0 +1,87 @@
+"""Dice for the game: seedable, generated in blocks, recorded and replayed"""
+import operator
+
+import numpy as np
+
+# (dice1, dice2, total) of every ordered outcome (dice1 - 1) * 6 + (dice2 - 1)
+ROLLS = [(dice1, dice2, dice1 + dice2) for dice1 in range(1, 7) for dice2 in range(1, 7)]
+
+
+class Dice:
+    """Two dice with their own random generator.
+
+    Outcomes are drawn a block at a time and served from a buffer, so a roll
+    costs one lookup instead of two calls to ``random.randint``.
+    """
+
+    def __init__(self, seed=None, block_size: int = 4096):
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Restart the dice from a seed, random if None."""
+        self.rng = np.random.default_rng(seed)
+        self._rolls = iter(())
+        # Generator state the current block was drawn from, None before the first block
+        self._block_state = None
+
+    def _draw_block(self):
+        self._block_state = self.rng.bit_generator.state
+        outcomes = self.rng.integers(0, 36, size=self.block_size).tolist()
+        self._rolls = iter(list(map(ROLLS.__getitem__, outcomes)))
+
+    def roll(self):
+        """Return (dice1, dice2, total) of the next roll."""
+        try:
+            return next(self._rolls)
+        except StopIteration:
+            self._draw_block()
+            return next(self._rolls)
+
+    def getstate(self):
+        """Return the state of the dice as plain data, to continue them later with setstate."""
+        if self._block_state is None:
+            return {"rng": self.rng.bit_generator.state, "used": None}
+        # The block is drawn again from its generator state, and the rolls served so far are skipped
+        return {"rng": self._block_state, "used": self.block_size - operator.length_hint(self._rolls)}
+
+    def setstate(self, state):
+        """Continue the dice from a state returned by getstate."""
+        self.rng.bit_generator.state = state["rng"]
+        if state["used"] is None:
+            self._rolls = iter(())
+            self._block_state = None
+        else:
+            self._draw_block()
+            self._rolls.__setstate__(state["used"])
+
+
+class RecordingDice:
+    """Dice that keep every roll of other dice in ``history``, as (dice1, dice2) pairs"""
+
+    def __init__(self, dice=None):
+        self.dice = dice if dice is not None else Dice()
+        self.history = []
+
+    def roll(self):
+        roll = self.dice.roll()
+        self.history.append(roll[:2])
+        return roll
+
+
+class ReplayDice:
+    """Dice that roll a given sequence of (dice1, dice2) pairs, such as a recorded history"""
+
+    def __init__(self, rolls):
+        self.rolls = []
+        for dice1, dice2 in rolls:
+            if not (1 <= dice1 <= 6 and 1 <= dice2 <= 6):
+                raise ValueError(f"Invalid roll: ({dice1}, {dice2})")
+            self.rolls.append(ROLLS[(dice1 - 1) * 6 + dice2 - 1])
+        self._rolls = iter(self.rolls)
+
+    def roll(self):
+        try:
+            return next(self._rolls)
+        except StopIteration:
+            raise IndexError(f"All {len(self.rolls)} rolls have been replayed") from None
@@ -0,0 +1,442 @@
+"""Money, ownership, rent, buildings, mortgages and bankruptcy"""
+from models.board import Board
+from models.player import Player
+from models.property_model import SquareKind
+from game.events import EventType, NullSink
+from game.strategy import DEFAULT_STRATEGY
+
+BANK = -1  # Owner of the squares nobody bought
+HOTEL = 5  # Houses on a square with a hotel
+
+SALARY = 200  # Collected when passing Go
+JAIL_FINE = 50  # Paid when leaving Jail after 3 turns, or to leave it at once
+LUXURY_TAX = 75
+HOUSES = 32  # Houses the bank has
+HOTELS = 12  # Hotels the bank has
+
+RAILROAD_RENTS = (25, 50, 100, 200)  # By the number of railroads owned
+UTILITY_MULTIPLIERS = (4, 10)  # Times the dice roll, by the number of utilities owned
+
+# Rent levels of a square, the column of the rent table:
+#   streets: 0 without the whole group, 1 with it and no houses, 2 to 5 with 1 to 4 houses, 6 with a hotel
+#   railroads and utilities: the number owned in the group minus 1
+LEVELS = 7
+
+# Number of squares in a group bitmask (groups have at most 4 squares)
+POPCOUNT = [bin(mask).count("1") for mask in range(16)]
+
+
+class Economy:
+    """Ownership and money of the players of one game.
+
+    Ownership lives in per-square arrays (``owner``, ``houses``, ``mortgaged``),
+    and every player has a bitmask per group of the squares they own in it, so a
+    full group is one comparison. The rent of every square at every level is
+    precomputed in ``rents``, indexed by ``square * LEVELS + level``, and the
+    current level of each square is updated when its group changes, so a
+    landing costs a couple of lookups.
+    """
+
+    def __init__(self, board: Board, players, sink=None, build_reserve: int = 200):
+        self.board = board
+        self.players = list(players)
+        self.sink = sink if sink is not None else NullSink()
+        # Cash a player keeps when building houses
+        self.build_reserve = build_reserve
+        self.player_index = {player: i for i, player in enumerate(self.players)}
+        self.active = len(self.players)
+        self.houses_left = HOUSES
+        self.hotels_left = HOTELS
+
+        size = len(board)
+        self.owner = [BANK] * size
+        self.houses = [0] * size
+        self.mortgaged = [False] * size
+        self.level = [0] * size
+        self.price = [node.value.purchase or 0 for node in board.squares]
+        # Income tax is charged on the first square of that name, if the board has one
+        self.income_tax_position = board.positions.get("Income Tax", [None])[0]
+
+        # Groups of squares, and the bit of each square in its group
+        self.group = [-1] * size
+        self.bit = [0] * size
+        self.group_squares = []
+        self.group_kinds = []
+        names = {}
+        for node in board.squares:
+            prop = node.value
+            if prop.group is None:
+                continue
+            if prop.group not in names:
+                names[prop.group] = len(self.group_squares)
+                self.group_squares.append([])
+                self.group_kinds.append(prop.kind)
+            group = names[prop.group]
+            self.group[node.index] = group
+            self.bit[node.index] = 1 << len(self.group_squares[group])
+            self.group_squares[group].append(node.index)
+        self.full_mask = [(1 << len(squares)) - 1 for squares in self.group_squares]
+        # Squares owned by every player in every group: owned[player][group]
+        self.owned = [[0] * len(self.group_squares) for _ in self.players]
+        # Street groups every player owns entirely, one bit per group
+        self.monopoly = [0] * len(self.players)
+        # Mortgaged squares of every player
+        self.mortgages = [0] * len(self.players)
+
+        # Rent of every square and level
+        self.rents = [0] * (size * LEVELS)
+        for node in board.squares:
+            prop = node.value
+            base = node.index * LEVELS
+            if prop.kind == SquareKind.STREET and prop.rents is not None:
+                self.rents[base] = prop.rents[0]
+                self.rents[base + 1] = 2 * prop.rents[0]
+                self.rents[base + 2:base + LEVELS] = prop.rents[1:]
+            elif prop.kind == SquareKind.RAILROAD:
+                self.rents[base:base + len(RAILROAD_RENTS)] = RAILROAD_RENTS
+            elif prop.kind == SquareKind.UTILITY:
+                self.rents[base:base + len(UTILITY_MULTIPLIERS)] = UTILITY_MULTIPLIERS
+
+    @property
+    def finished(self):
+        """Whether at most one player is left."""
+        return self.active <= 1
+
+    def winner(self):
+        """Return the last player left, or None while the game goes on."""
+        if not self.finished:
+            return None
+        return next((player for player in self.players if not player.bankrupt), None)
+
+    def _refresh(self, group: int):
+        """Update the rent level of the owned squares of a group."""
+        full = self.full_mask[group]
+        street = self.group_kinds[group] == SquareKind.STREET
+        for square in self.group_squares[group]:
+            owner = self.owner[square]
+            if owner == BANK:
+                continue
+            mask = self.owned[owner][group]
+            if street:
+                self.level[square] = 1 + self.houses[square] if mask == full else 0
+            else:
+                self.level[square] = POPCOUNT[mask] - 1
+
+    def _set_owner(self, square: int, owner: int):
+        """Give a square to a player, or back to the bank."""
+        prop = self.board.squares[square].value
+        group = self.group[square]
+        group_bit = 1 << group
+        mortgaged = self.mortgaged[square]
+        previous = self.owner[square]
+        if previous != BANK:
+            self.owned[previous][group] &= ~self.bit[square]
+            self.monopoly[previous] &= ~group_bit
+            self.mortgages[previous] -= mortgaged
+            self.players[previous].remove_property(prop)
+        self.owner[square] = owner
+        if owner != BANK:
+            self.owned[owner][group] |= self.bit[square]
+            if self.owned[owner][group] == self.full_mask[group] and self.group_kinds[group] == SquareKind.STREET:
+                self.monopoly[owner] |= group_bit
+            self.mortgages[owner] += mortgaged
+            self.players[owner].add_property(prop, mortgaged)
+        self._refresh(group)
+
+    def rent(self, square: int, roll: int):
+        """Return the rent of a square for a dice roll."""
+        if self.mortgaged[square]:
+            return 0
+        rent = self.rents[square * LEVELS + self.level[square]]
+        if self.group_kinds[self.group[square]] == SquareKind.UTILITY:
+            rent *= roll
+        return rent
+
+    def land(self, player: Player, square: int, roll: int, card=None):
+        """Buy the square, pay its rent or pay its tax.
+
+        Args:
+            player (Player): The player landing on the square.
+            square (int): Index of the square.
+            roll (int): Dice roll, for utility rent.
+            card (Card): Card that sent the player there, which may raise the rent.
+        """
+        owner = self.owner[square]
+        if owner == BANK:
+            price = self.price[square]
+            if price:
+                if self.wants_to_buy(player, square):
+                    self.buy(player, square)
+            elif self.board.kinds[square] == SquareKind.TAX:
+                if square == self.income_tax_position:
+                    self.pay(player, self.board.income_tax_due(player), reason="tax")
+                else:
+                    self.pay(player, LUXURY_TAX, reason="tax")
+            return
+
+        if owner != self.player_index[player]:
+            rent = self.rent(square, roll)
+            if rent and card is not None and card.nearest is not None:
+                # Twice the railroad rent, ten times the roll for a utility
+                if card.nearest == SquareKind.UTILITY:
+                    rent = UTILITY_MULTIPLIERS[-1] * roll
+                else:
+                    rent *= 2
+            if rent:
+                self.pay(player, rent, self.players[owner], reason="rent")
+
+    def wants_to_buy(self, player: Player, square: int):
+        """Whether the player buys an unowned square, as their strategy decides."""
+        strategy = player.strategy or DEFAULT_STRATEGY
+        return strategy.wants_to_buy(player, self.board.squares[square].value, self.price[square])
+
+    def buy(self, player: Player, square: int):
+        """Buy an unowned square from the bank."""
+        price = self.price[square]
+        player.money -= price
+        self._set_owner(square, self.player_index[player])
+        if self.sink.enabled:
+            self.sink.emit(EventType.BOUGHT, player, square=self.board.squares[square].value.name, price=price)
+
+    def collect_salary(self, player: Player):
+        """Collect the salary for passing Go."""
+        player.money += SALARY
+        if self.sink.enabled:
+            self.sink.emit(EventType.COLLECTED, player, amount=SALARY, reason="salary")
+
+    def pay(self, player: Player, amount: int, creditor: Player = None, reason: str = "rent"):
+        """Pay a player, or the bank when creditor is None, raising cash or going bankrupt if needed.
+
+        Returns:
+            bool: Whether the player could pay.
+        """
+        if player.money < amount:
+            if player.money + player.portfolio.liquidation < amount:
+                # Even selling and mortgaging everything would not be enough
+                self.go_bankrupt(player, creditor)
+                return False
+            self.raise_cash(player, amount)
+            if player.money < amount:
+                self.go_bankrupt(player, creditor)
+                return False
+
+        player.money -= amount
+        if creditor is not None:
+            creditor.money += amount
+        if self.sink.enabled:
+            self.sink.emit(EventType.PAID, player, amount=amount, to=creditor.name if creditor else None,
+                           reason=reason)
+        return True
+
+    def apply_card(self, player: Player, card):
+        """Collect or pay the money of a card that does not move the player."""
+        if card.money > 0:
+            player.money += card.money
+            if self.sink.enabled:
+                self.sink.emit(EventType.COLLECTED, player, amount=card.money, reason="card")
+        elif card.money < 0:
+            self.pay(player, -card.money, reason="card")
+
+        if card.each_player:
+            others = [other for other in self.players if other is not player and not other.bankrupt]
+            for other in others:
+                if card.each_player > 0:
+                    self.pay(other, card.each_player, player, reason="card")
+                elif not self.pay(player, -card.each_player, other, reason="card"):
+                    break
+
+        if card.repairs:
+            per_house, per_hotel = card.repairs
+            cost = 0
+            for square in self.owned_squares(player):
+                houses = self.houses[square]
+                cost += per_hotel if houses == HOTEL else per_house * houses
+            if cost:
+                self.pay(player, cost, reason="card")
+
+    def owned_squares(self, player: Player):
+        """Return the squares a player owns, in board order."""
+        index = self.player_index[player]
+        return [square for square, owner in enumerate(self.owner) if owner == index]
+
+    def raise_cash(self, player: Player, amount: int):
+        """Sell buildings, then mortgage squares, until the player has amount or nothing is left."""
+        squares = self.owned_squares(player)
+        # Sell the buildings of the most developed squares first
+        while player.money < amount:
+            built = [square for square in squares if self.houses[square]]
+            if not built:
+                break
+            self.sell_building(max(built, key=self.houses.__getitem__))
+
+        for square in squares:
+            if player.money >= amount:
+                break
+            if not self.mortgaged[square] and not self.group_built(self.group[square]):
+                self.mortgage(square)
+
+    def group_built(self, group: int):
+        """Whether any square of a group has buildings."""
+        return any(self.houses[square] for square in self.group_squares[group])
+
+    def monopolies(self, player: Player):
+        """Return the street groups a player owns entirely."""
+        mask = self.monopoly[self.player_index[player]]
+        return [group for group in range(len(self.group_squares)) if mask >> group & 1]
+
+    def develop(self, player: Player):
+        """Pay off mortgages, then build houses evenly on full groups while cash stays above the reserve."""
+        index = self.player_index[player]
+        reserve = self.build_reserve if player.strategy is None else player.strategy.build_reserve
+        if self.mortgages[index]:
+            for square in self.owned_squares(player):
+                if self.mortgaged[square] and player.money - self.unmortgage_cost(square) >= reserve:
+                    self.unmortgage(square)
+
+        if not self.monopoly[index]:
+            return
+        for group in self.monopolies(player):
+            squares = self.group_squares[group]
+            if any(self.mortgaged[square] for square in squares):
+                continue
+            cost = self.board.squares[squares[0]].value.house_cost
+            while player.money - cost >= reserve:
+                # Build on the least developed square of the group
+                square = min(squares, key=self.houses.__getitem__)
+                if not self.build(square):
+                    break
+
+    def build(self, square: int):
+        """Build a house, or a hotel on 4 houses, if the bank has one left.
+
+        Returns:
+            bool: Whether a building was bought.
+        """
+        houses = self.houses[square]
+        if houses == HOTEL:
+            return False
+        if houses == HOTEL - 1:
+            if not self.hotels_left:
+                return False
+            self.hotels_left -= 1
+            self.houses_left += HOTEL - 1
+        else:
+            if not self.houses_left:
+                return False
+            self.houses_left -= 1
+
+        prop = self.board.squares[square].value
+        player = self.players[self.owner[square]]
+        player.money -= prop.house_cost
+        player.portfolio.add_buildings(prop)
+        self.houses[square] = houses + 1
+        self._refresh(self.group[square])
+        if self.sink.enabled:
+            self.sink.emit(EventType.BUILT, player, square=prop.name, houses=houses + 1)
+        return True
+
+    def sell_building(self, square: int):
+        """Sell a house, or a hotel, back to the bank for half its cost.
+
+        A hotel goes back to 4 houses, or is sold with them when the bank has no houses left.
+        """
+        prop = self.board.squares[square].value
+        player = self.players[self.owner[square]]
+        houses = self.houses[square]
+        if houses == HOTEL:
+            self.hotels_left += 1
+            if self.houses_left >= HOTEL - 1:
+                self.houses_left -= HOTEL - 1
+                sold = 1
+            else:
+                sold = HOTEL
+        else:
+            self.houses_left += 1
+            sold = 1
+
+        player.money += sold * (prop.house_cost // 2)
+        player.portfolio.remove_buildings(prop, sold)
+        self.houses[square] = houses - sold
+        self._refresh(self.group[square])
+        if self.sink.enabled:
+            self.sink.emit(EventType.SOLD, player, square=prop.name, houses=houses - sold)
+
+    def mortgage(self, square: int):
+        """Mortgage a square for half its price."""
+        amount = self.price[square] // 2
+        player = self.players[self.owner[square]]
+        player.money += amount
+        player.portfolio.mortgage(self.board.squares[square].value)
+        self.mortgaged[square] = True
+        self.mortgages[self.owner[square]] += 1
+        if self.sink.enabled:
+            self.sink.emit(EventType.MORTGAGED, player, square=self.board.squares[square].value.name, amount=amount)
+
+    def unmortgage_cost(self, square: int):
+        """Return the mortgage of a square plus 10% interest."""
+        return self.price[square] // 2 * 11 // 10
+
+    def unmortgage(self, square: int):
+        """Pay off the mortgage of a square with 10% interest."""
+        amount = self.unmortgage_cost(square)
+        player = self.players[self.owner[square]]
+        player.money -= amount
+        player.portfolio.unmortgage(self.board.squares[square].value)
+        self.mortgaged[square] = False
+        self.mortgages[self.owner[square]] -= 1
+        if self.sink.enabled:
+            self.sink.emit(EventType.UNMORTGAGED, player, square=self.board.squares[square].value.name,
+                           amount=amount)
+
+    def getstate(self):
+        """Return the ownership, buildings and mortgages as plain data, to restore them with setstate."""
+        return {
+            "owner": list(self.owner),
+            "houses": list(self.houses),
+            "mortgaged": list(self.mortgaged),
+            "houses_left": self.houses_left,
+            "hotels_left": self.hotels_left,
+        }
+
+    def setstate(self, state):
+        """Restore a state returned by getstate into a new economy of the same players.
+
+        The money and bankruptcy of the players are theirs to restore first.
+        """
+        for square, owner in enumerate(state["owner"]):
+            if owner != BANK:
+                self.mortgaged[square] = state["mortgaged"][square]
+                self._set_owner(square, owner)
+        for square, houses in enumerate(state["houses"]):
+            if houses:
+                self.houses[square] = houses
+                self.players[self.owner[square]].portfolio.add_buildings(self.board.squares[square].value, houses)
+                self._refresh(self.group[square])
+        self.houses_left = state["houses_left"]
+        self.hotels_left = state["hotels_left"]
+        self.active = sum(not player.bankrupt for player in self.players)
+
+    def go_bankrupt(self, player: Player, creditor: Player = None):
+        """Hand everything a player has to the creditor, or back to the bank, and take them out of the game."""
+        creditor_index = self.player_index[creditor] if creditor is not None else BANK
+        for square in self.owned_squares(player):
+            # Buildings are sold back to the bank, and the money goes to the creditor
+            while self.houses[square]:
+                self.sell_building(square)
+            self._set_owner(square, creditor_index)
+            if creditor is None:
+                # The bank takes the squares back unmortgaged
+                self.mortgaged[square] = False
+
+        # Get Out of Jail Free cards go back to their decks
+        for deck, card in player.jail_cards:
+            deck.put_back(card)
+        player.jail_cards = []
+
+        if creditor is not None:
+            creditor.money += player.money
+        player.money = 0
+        player.bankrupt = True
+        self.active -= 1
+        if self.sink.enabled:
+            self.sink.emit(EventType.BANKRUPT, player, creditor=creditor.name if creditor else None)
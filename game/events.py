@@ -0,0 +1,134 @@
+"""Game events and the sinks that receive them"""
+import sys
+from enum import Enum
+
+
+class EventType(Enum):
+    """Kind of event emitted by a game"""
+
+    ROLLED = "rolled"  # dice1, dice2, total
+    MOVED = "moved"  # square, index
+    DOUBLES = "doubles"  # count
+    JAILED = "jailed"  # reason: "go_to_jail", "doubles" or "card"
+    RELEASED = "released"  # reason: "doubles", "turns", "card" or "fine"
+    STAYED = "stayed"  # jail_turns
+    CARD = "card"  # deck, text
+    BOUGHT = "bought"  # square, price
+    PAID = "paid"  # amount, to (a player name, or None for the bank), reason: "rent", "tax", "fine" or "card"
+    COLLECTED = "collected"  # amount, reason: "salary" or "card"
+    BUILT = "built"  # square, houses (5 is a hotel)
+    SOLD = "sold"  # square, houses
+    MORTGAGED = "mortgaged"  # square, amount
+    UNMORTGAGED = "unmortgaged"  # square, amount
+    BANKRUPT = "bankrupt"  # creditor (a player name, or None for the bank)
+
+
+class EventSink:
+    """Receives the events of a game.
+
+    Games only build events when ``enabled`` is true, so a disabled sink costs
+    one attribute check per event.
+    """
+
+    enabled = True
+
+    def emit(self, event_type: EventType, player, **data):
+        """Receive an event about a player."""
+        raise NotImplementedError
+
+    def write(self, text: str):
+        """Receive free text, such as round headers."""
+
+    def flush(self):
+        """Deliver any buffered events."""
+
+
+class NullSink(EventSink):
+    """Sink that ignores every event"""
+
+    enabled = False
+
+    def emit(self, event_type: EventType, player, **data):
+        pass
+
+
+class BufferedTextSink(EventSink):
+    """Sink that writes events as text to a stream in large chunks"""
+
+    def __init__(self, stream=None, buffer_lines: int = 1000):
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_lines = buffer_lines
+        self.lines = []
+
+    @staticmethod
+    def format(event_type: EventType, player, data):
+        """Return the text of an event."""
+        name = player.name
+        if event_type is EventType.ROLLED:
+            return f"{name} rolled a {data['dice1']} and a {data['dice2']} for a total of {data['total']}"
+        if event_type is EventType.MOVED:
+            return f"{name} landed on {data['square']}"
+        if event_type is EventType.DOUBLES:
+            return f"{name} rolled a double! They get another turn."
+        if event_type is EventType.JAILED:
+            if data["reason"] == "doubles":
+                return f"{name} rolled 3 doubles in a row and is going to jail!"
+            if data["reason"] == "card":
+                return f"{name} drew a card and is going to jail!"
+            return f"{name} was sent to Jail!"
+        if event_type is EventType.RELEASED:
+            if data["reason"] == "doubles":
+                return f"{name} rolled a double and got out of Jail!"
+            if data["reason"] == "card":
+                return f"{name} used a Get Out of Jail Free card!"
+            if data["reason"] == "fine":
+                return f"{name} paid the fine to leave Jail!"
+            return f"{name} has been in Jail for {data['max_jail_turns']} turns and is now released!"
+        if event_type is EventType.STAYED:
+            return (f"{name} failed to roll a double and stays in Jail. "
+                    f"(Turn {data['jail_turns']}/{data['max_jail_turns']})")
+        if event_type is EventType.CARD:
+            return f"{name} drew {data['deck']}: {data['text']}"
+        if event_type is EventType.BOUGHT:
+            return f"{name} bought {data['square']} for ${data['price']}"
+        if event_type is EventType.PAID:
+            return f"{name} paid ${data['amount']} {data['reason']} to {data['to'] or 'the bank'}"
+        if event_type is EventType.COLLECTED:
+            return f"{name} collected ${data['amount']} {data['reason']}"
+        if event_type is EventType.BUILT:
+            building = "a hotel" if data["houses"] == 5 else f"house {data['houses']}"
+            return f"{name} built {building} on {data['square']}"
+        if event_type is EventType.SOLD:
+            return f"{name} sold a building on {data['square']}, {data['houses']} left"
+        if event_type is EventType.MORTGAGED:
+            return f"{name} mortgaged {data['square']} for ${data['amount']}"
+        if event_type is EventType.UNMORTGAGED:
+            return f"{name} paid off the mortgage of {data['square']} for ${data['amount']}"
+        if event_type is EventType.BANKRUPT:
+            return f"{name} went bankrupt to {data['creditor'] or 'the bank'}!"
+        return f"{name}: {event_type.value} {data}"
+
+    def emit(self, event_type: EventType, player, **data):
+        self.write(self.format(event_type, player, data) + "\n")
+
+    def write(self, text: str):
+        self.lines.append(text)
+        if len(self.lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("".join(self.lines))
+            self.lines = []
+        self.stream.flush()
+
+
+class CallbackSink(EventSink):
+    """Sink that hands every event to a callback"""
+
+    def __init__(self, callback):
+        # callback(event_type, player, data)
+        self.callback = callback
+
+    def emit(self, event_type: EventType, player, **data):
+        self.callback(event_type, player, data)
@@ -1,79 +1,144 @@
-import random
-
 from models.board import Board
 from models.player import Player
+from game.cards import JAIL, CardDecks
+from game.dice import Dice
+from game.economy import JAIL_FINE, Economy
+from game.events import EventType, NullSink
+from game.stats import GameStats
+from game.strategy import DEFAULT_STRATEGY
 
 class Game:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, sink=None, dice=None, cards=None, max_jail_turns: int = 3):
         self.board = board
-        # Dictionary to track landing spots: {property_name: count}
-        self.landing_spots = {}
-        # Dictionary to track dice combinations: {(dice1, dice2): count}
-        self.dice_combinations = {}
+        # Turns in jail before a player is released without doubles
+        self.max_jail_turns = max_jail_turns
+        # Event sink for rolls, moves and jail events
+        self.sink = sink if sink is not None else NullSink()
+        # Dice with their own random generator, unseeded by default
+        self.dice = dice if dice is not None else Dice()
+        # Chance and Community Chest decks, unseeded by default
+        self.cards = cards if cards is not None else CardDecks(board)
+        # Landings per square index and ordered dice outcomes
+        self.stats = GameStats(len(board))
+        # Money and ownership, None for movement only
+        self.economy = None
+
+    @property
+    def landing_spots(self):
+        """Landing counts keyed by property name: {property_name: count}"""
+        return self.stats.landing_stats(self.board)
+
+    @property
+    def dice_combinations(self):
+        """Dice combination counts: {(dice1, dice2): count}"""
+        return self.stats.dice_stats()
 
     def game_start(self):
         return self.board.start
 
+    def start_economy(self, players):
+        """Play with money, ownership and rent between these players.
+
+        Returns:
+            Economy: The economy of the game.
+        """
+        self.economy = Economy(self.board, players, self.sink)
+        return self.economy
+
     def move_player(self, player, steps):
         """Move the player a certain number of steps on the board."""
         if player.position is None:
             player.position = self.board.start
 
         # Move the player
-        for _ in range(steps):
-            player.position = player.position.next
+        squares = self.board.squares
+        index = (player.position.index + steps) % len(squares)
+        economy = self.economy
+        if economy is not None and index < player.position.index:
+            economy.collect_salary(player)
+
+        return self.land_player(player, index, steps)
+
+    def land_player(self, player: Player, index: int, steps: int, card=None):
+        """Put the player on a square and apply it: go to jail, draw a card, buy it or pay.
 
-        # Get current property
+        Args:
+            player (Player): The player.
+            index (int): Index of the square.
+            steps (int): Dice roll that brought the player, for utility rent.
+            card (Card): Card that sent the player there, if any.
+        """
+        player.position = self.board.squares[index]
         current_property = player.position.value
-        
-        # Track landing spots (except for Go To Jail which is tracked in go_to_jail method)
-        if current_property.name != "Go To Jail":
-            property_name = current_property.name
-            self.landing_spots[property_name] = self.landing_spots.get(property_name, 0) + 1
+        if self.sink.enabled:
+            self.sink.emit(EventType.MOVED, player, square=current_property.name, index=index)
 
-        # Check if player landed on Go To Jail
-        if current_property.name == "Go To Jail":
+        # Check if player landed on Go To Jail (tracked as a Jail landing in go_to_jail method)
+        if index == self.board.go_to_jail_position:
             self.go_to_jail(player)
-            current_property = player.position.value  # Update current property after going to jail
+            return player.position.value
+
+        # Chance and Community Chest, the landing is counted where the card leaves the player
+        deck = self.cards.by_square[index]
+        if deck is not None:
+            return self.draw_card(player, deck, index, steps)
+
+        # Track landing spots
+        self.stats.landings[index] += 1
+
+        # Buy the square, or pay its rent or tax
+        if self.economy is not None:
+            self.economy.land(player, index, steps, card)
 
         return current_property
 
-    def go_to_jail(self, player: Player):
+    def draw_card(self, player: Player, deck, index: int, steps: int):
+        """Draw a card on a Chance or Community Chest square and follow it."""
+        card_index = deck.draw()
+        card = deck.cards[card_index]
+        if self.sink.enabled:
+            self.sink.emit(EventType.CARD, player, deck=deck.name, text=card.text)
+        if card.keep:
+            player.jail_cards.append((deck, card_index))
+
+        destination = deck.destination(card_index, index)
+        if destination == JAIL:
+            self.go_to_jail(player, reason="card")
+            return player.position.value
+        if destination != index:
+            # Advancing past Go collects the salary, going back does not
+            if self.economy is not None and not card.back and destination < index:
+                self.economy.collect_salary(player)
+            return self.land_player(player, destination, steps, card)
+
+        self.stats.landings[index] += 1
+        if self.economy is not None:
+            self.economy.apply_card(player, card)
+        return player.position.value
+
+    def go_to_jail(self, player: Player, reason: str = "go_to_jail"):
         """Send the player to Jail."""
-        # Find the Jail position
-        current = self.board.start
-        while current.value.name != "Jail":
-            current = current.next
-            
         # Move player to Jail
-        player.position = current
+        player.position = self.board.squares[self.board.jail_position]
         player.in_jail = True
         player.jail_turns = 0  # Reset jail turns counter
-        print(f"{player.name} was sent to Jail!")
+        if self.sink.enabled:
+            self.sink.emit(EventType.JAILED, player, reason=reason)
         
         # Track landing on Jail (via Go To Jail)
-        property_name = "Jail"
-        self.landing_spots[property_name] = self.landing_spots.get(property_name, 0) + 1
+        self.stats.landings[self.board.jail_position] += 1
         
         # Player loses their turn when sent to jail
         return False
         
     def roll_dice(self):
         """Simulate rolling two dice and return the sum."""
-        dice1 = random.randint(1, 6)
-        dice2 = random.randint(1, 6)
+        dice1, dice2, total = self.dice.roll()
         
-        # Track dice combinations (normalize so that (1,6) and (6,1) are the same)
-        # For doubles, keep the order the same
-        if dice1 == dice2:
-            dice_combo = (dice1, dice2)
-        else:
-            # Sort the dice values to normalize the combination
-            dice_combo = tuple(sorted([dice1, dice2]))
-            
-        self.dice_combinations[dice_combo] = self.dice_combinations.get(dice_combo, 0) + 1
+        # Track ordered dice combinations, (1,6) and (6,1) are combined by get_dice_stats
+        self.stats.dice[dice1 * 6 + dice2 - 7] += 1
         
-        return dice1, dice2, dice1 + dice2
+        return dice1, dice2, total
         
     def player_turn(self, player: Player):
         """Handle a player's turn including rolling dice and moving.
@@ -83,78 +148,136 @@ class Game:
                 where rolled_double is a boolean indicating if the player rolled a double,
                 and continue_turn is a boolean indicating if the player's turn should continue.
         """
+        # A Get Out of Jail Free card is used before rolling
+        if player.in_jail and player.jail_cards:
+            deck, card_index = player.jail_cards.pop()
+            deck.put_back(card_index)
+            player.in_jail = False
+            player.jail_turns = 0
+            if self.sink.enabled:
+                self.sink.emit(EventType.RELEASED, player, reason="card")
+
+        # Otherwise the player's strategy may pay the fine instead of rolling for doubles
+        if player.in_jail:
+            fine = JAIL_FINE if self.economy is not None else 0
+            if (player.strategy or DEFAULT_STRATEGY).pays_to_leave_jail(player, fine):
+                if fine and not self.economy.pay(player, fine, reason="fine"):
+                    return None, None, 0, player.position.value, False, False
+                player.in_jail = False
+                player.jail_turns = 0
+                if self.sink.enabled:
+                    self.sink.emit(EventType.RELEASED, player, reason="fine")
+
+        # Roll the dice
+        dice1, dice2, dice_roll = self.roll_dice()
+        if self.sink.enabled:
+            self.sink.emit(EventType.ROLLED, player, dice1=dice1, dice2=dice2, total=dice_roll)
+
+        # Check if the player rolled a double
+        rolled_double = dice1 == dice2
+
         # Check if player is in jail
         if player.in_jail:
-            # Roll the dice
-            dice1, dice2, dice_roll = self.roll_dice()
-            
-            # Check if the player rolled a double
-            rolled_double = dice1 == dice2
-            
             if rolled_double:
                 # Player gets out of jail with a double
                 player.in_jail = False
                 player.jail_turns = 0  # Reset jail turns counter
-                print(f"{player.name} rolled a double and got out of Jail!")
+                if self.sink.enabled:
+                    self.sink.emit(EventType.RELEASED, player, reason="doubles")
                 
                 # Move the player and get the current property
                 current_property = self.move_player(player, dice_roll)
                 
-                # Check if they landed on Go To Jail again
-                if current_property.name == "Go To Jail":
-                    continue_turn = self.go_to_jail(player)
-                    current_property = player.position.value  # Update to Jail
-                else:
-                    continue_turn = True
+                # Turn ends if they landed on Go To Jail again
+                continue_turn = not player.in_jail
             else:
                 # Increment jail turns counter
                 player.jail_turns += 1
                 
                 # Check if player has been in jail for 3 turns
-                if player.jail_turns >= 3:
+                if player.jail_turns >= self.max_jail_turns:
                     # Player gets out of jail after 3 turns
                     player.in_jail = False
                     player.jail_turns = 0  # Reset jail turns counter
-                    print(f"{player.name} has been in Jail for 3 turns and is now released!")
+                    if self.sink.enabled:
+                        self.sink.emit(EventType.RELEASED, player, reason="turns", max_jail_turns=self.max_jail_turns)
+
+                    # Player pays the fine before moving
+                    if self.economy is not None and not self.economy.pay(player, JAIL_FINE, reason="fine"):
+                        return dice1, dice2, dice_roll, player.position.value, rolled_double, False
                     
                     # Move the player and get the current property
                     current_property = self.move_player(player, dice_roll)
                     
-                    # Check if they landed on Go To Jail again
-                    if current_property.name == "Go To Jail":
-                        continue_turn = self.go_to_jail(player)
-                        current_property = player.position.value  # Update to Jail
-                    else:
-                        continue_turn = True
+                    # Turn ends if they landed on Go To Jail again
+                    continue_turn = not player.in_jail
                 else:
                     # Player stays in jail
-                    print(f"{player.name} failed to roll a double and stays in Jail. (Turn {player.jail_turns}/3)")
+                    if self.sink.enabled:
+                        self.sink.emit(EventType.STAYED, player, jail_turns=player.jail_turns,
+                                       max_jail_turns=self.max_jail_turns)
                     current_property = player.position.value  # They're still in Jail
                     continue_turn = False  # End turn
         else:
             # Normal turn for player not in jail
-            dice1, dice2, dice_roll = self.roll_dice()
-            
-            # Check if the player rolled a double
-            rolled_double = dice1 == dice2
-            
             # Move the player and get the current property
             current_property = self.move_player(player, dice_roll)
             
-            # Check if player landed on Go To Jail
-            if current_property.name == "Go To Jail":
-                continue_turn = self.go_to_jail(player)
-                current_property = player.position.value  # Update to Jail
-            else:
-                continue_turn = True
+            # Turn ends if player landed on Go To Jail
+            continue_turn = not player.in_jail
         
         # Return the dice values, current property, whether a double was rolled, and if turn continues
         return dice1, dice2, dice_roll, current_property, rolled_double, continue_turn
+
+    def take_turn(self, player: Player):
+        """Play a player's full turn, rolling again after doubles.
+
+        In Monopoly, if a player rolls 3 doubles in a row, they go to jail.
+
+        Returns:
+            int: The number of doubles rolled during the turn.
+        """
+        # Pay off mortgages and build before rolling
+        if self.economy is not None:
+            self.economy.develop(player)
+
+        doubles_count = 0
+        while True:
+            rolled_double, continue_turn = self.player_turn(player)[4:]
+            if not (rolled_double and continue_turn) or player.bankrupt:
+                return doubles_count
+
+            doubles_count += 1
+            if doubles_count == 3:
+                self.go_to_jail(player, reason="doubles")
+                return doubles_count
+
+            if self.sink.enabled:
+                self.sink.emit(EventType.DOUBLES, player, count=doubles_count)
+
+    def play_round(self, players):
+        """Give every player one full turn."""
+        for player in players:
+            if not player.bankrupt:
+                self.take_turn(player)
+
+    def play_game(self, players, max_rounds: int = 1000):
+        """Play rounds with money until one player is left or max_rounds are played.
+
+        Returns:
+            tuple: (winner, rounds) where winner is None when the game did not finish.
+        """
+        economy = self.start_economy(players)
+        rounds = 0
+        while rounds < max_rounds and not economy.finished:
+            self.play_round(players)
+            rounds += 1
+        return economy.winner(), rounds
         
     def get_landing_stats(self):
         """Return statistics about landing spots."""
-        return self.landing_spots
+        return self.stats.landing_stats(self.board)
     
     def get_dice_stats(self):
         """Return statistics about dice combinations."""
-        return self.dice_combinations
\ No newline at end of file
+        return self.stats.dice_stats()
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""Exact landing probabilities from the Markov chain of a turn"""
+import numpy as np
+
+from models.board import Board
+from game.cards import JAIL, card_outcomes
+from game.rules import roll_tables
+
+# Turn matrices per rule configuration:
+# {(square kinds, jail position, go to jail position, max_jail_turns, max_doubles): (turn, landings)}
+_cache = {}
+
+
+def _roll_matrices(board: Board, max_jail_turns: int, last_roll: bool):
+    """Build the matrices of a single roll from the roll tables.
+
+    Returns:
+        tuple: ``(ending, rolling, landings)`` where ``ending[i, j]`` and
+            ``rolling[i, j]`` are the probabilities of going from state i to
+            state j and ending the turn or rolling again, and ``landings[i, k]``
+            is the expected number of landings on square k.
+    """
+    size = len(board)
+    states = size + max_jail_turns
+    jail = board.jail_position
+    outcomes = card_outcomes(board)
+
+    # Every (state, outcome) pair of the tables has probability 1/36, split
+    # between the squares the cards drawn on its square lead to
+    rows = []
+    for key, row in enumerate(zip(*roll_tables(board, max_jail_turns, last_roll))):
+        next_state, landed, again, speeding = row
+        if landed == size or len(outcomes[landed]) == 1:
+            rows.append((key // 36, next_state, landed, again, speeding, 1 / 36))
+            continue
+        for probability, destination in outcomes[landed]:
+            if destination == JAIL:
+                rows.append((key // 36, size, jail, False, False, probability / 36))
+            else:
+                rows.append((key // 36, size if speeding else destination, destination, again, speeding,
+                             probability / 36))
+
+    source, next_state, landed, again, speeding, probability = (np.array(column) for column in zip(*rows))
+    again = again.astype(bool)
+
+    ending = np.zeros((states, states))
+    rolling = np.zeros((states, states))
+    landings = np.zeros((states, size + 1))
+    np.add.at(ending, (source[~again], next_state[~again]), probability[~again])
+    np.add.at(rolling, (source[again], next_state[again]), probability[again])
+    np.add.at(landings, (source, landed), probability)
+
+    # Third double: counted on the square rolled to, then as a Jail landing
+    speeding = speeding.astype(bool)
+    np.add.at(landings, (source[speeding], jail), probability[speeding])
+
+    # Drop the column of rolls that did not move
+    return ending, rolling, landings[:, :size]
+
+
+def transition_matrices(board: Board, max_jail_turns: int = 3, max_doubles: int = 3):
+    """Return the transition matrix and expected landings of a full turn.
+
+    States are square indexes for players not in jail and
+    ``len(board) + jail_turns`` for players in jail. A turn includes the extra
+    rolls for doubles, following ``Game.player_turn`` and the three doubles
+    check in ``main.py``. Matrices are cached per rule configuration.
+
+    Returns:
+        tuple: ``(turn, landings)`` where ``turn[i, j]`` is the probability of
+            starting a turn in state i and ending it in state j, and
+            ``landings[i, k]`` is the expected number of landings on square k
+            during a turn started in state i.
+    """
+    # Card destinations depend on the square names, so boards are told apart by both
+    key = (tuple(board.kinds), tuple(node.value.name for node in board.squares), board.jail_position, board.go_to_jail_position, max_jail_turns, max_doubles)
+    if key not in _cache:
+        states = len(board) + max_jail_turns
+        turn = np.zeros((states, states))
+        landings = np.zeros((states, len(board)))
+
+        # Probability of still rolling in each state, starting from every state
+        reach = np.eye(states)
+        for roll in range(max_doubles):
+            ending, rolling, roll_landings = _roll_matrices(board, max_jail_turns, roll == max_doubles - 1)
+            turn += reach @ ending
+            landings += reach @ roll_landings
+            reach = reach @ rolling
+
+        turn.setflags(write=False)
+        landings.setflags(write=False)
+        _cache[key] = (turn, landings)
+
+    return _cache[key]
+
+
+def stationary_distribution(board: Board, max_jail_turns: int = 3, max_doubles: int = 3):
+    """Return the long run probability of starting a turn in each state."""
+    turn, _ = transition_matrices(board, max_jail_turns, max_doubles)
+    states = len(turn)
+
+    # Solve pi @ turn = pi with the probabilities summing to 1
+    system = np.vstack([turn.T - np.eye(states), np.ones(states)])
+    target = np.zeros(states + 1)
+    target[-1] = 1
+    distribution, *_ = np.linalg.lstsq(system, target, rcond=None)
+    return distribution
+
+
+def landing_probabilities(board: Board, max_jail_turns: int = 3, max_doubles: int = 3):
+    """Return the long run share of landings on each square."""
+    _, landings = transition_matrices(board, max_jail_turns, max_doubles)
+    per_turn = stationary_distribution(board, max_jail_turns, max_doubles) @ landings
+    return per_turn / per_turn.sum()
+
+
+def expected_landings(board: Board, rounds: int, players: int = 1, max_jail_turns: int = 3, max_doubles: int = 3):
+    """Return the expected landings on each square after exactly a number of rounds.
+
+    Every player starts on "Go" and plays one turn per round.
+    """
+    turn, landings = transition_matrices(board, max_jail_turns, max_doubles)
+    distribution = np.zeros(len(turn))
+    distribution[0] = 1
+
+    counts = np.zeros(len(board))
+    for _ in range(rounds):
+        counts += distribution @ landings
+        distribution = distribution @ turn
+
+    return counts * players
+
+
+def expected_landing_stats(board: Board, rounds: int, players: int = 1, max_jail_turns: int = 3, max_doubles: int = 3):
+    """Return expected landings keyed by property name, like Game.get_landing_stats."""
+    counts = expected_landings(board, rounds, players, max_jail_turns, max_doubles)
+    stats = {}
+    for node in board.squares:
+        stats[node.value.name] = stats.get(node.value.name, 0) + float(counts[node.index])
+    return stats
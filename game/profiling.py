@@ -0,0 +1,183 @@
+"""Opt-in counters and phase timers for profiling simulations"""
+import time
+
+from game.events import EventSink
+from game.game_logic import Game
+from models.player import Player
+
+# Phases the time of an instrumented game is split into
+PHASES = ("dice", "movement", "jail", "stats", "output", "other")
+
+
+class PhaseTimer:
+    """Cumulative time per phase.
+
+    Phases nest: entering a phase pauses the one it was entered from, so every
+    second is counted in exactly one phase.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.stack = ["other"]
+        self.started = clock()
+
+    def enter(self, phase: str):
+        now = self.clock()
+        self.totals[self.stack[-1]] += now - self.started
+        self.stack.append(phase)
+        self.started = now
+
+    def exit(self):
+        now = self.clock()
+        self.totals[self.stack.pop()] += now - self.started
+        self.started = now
+
+    def stop(self):
+        """Count the time spent since the last change of phase."""
+        now = self.clock()
+        self.totals[self.stack[-1]] += now - self.started
+        self.started = now
+
+
+class Instrumentation:
+    """Counters and phase timers of the games played with it"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.turns = 0
+        self.rolls = 0
+        self.jail_entries = 0
+        self.jail_exits = 0
+        # Turns by number of doubles rolled in a row: {length: count}, 3 sends to jail
+        self.doubles_streaks = {}
+        self.squares_traversed = 0
+        self.timer = PhaseTimer(clock)
+        self.started = clock()
+        self.stopped = None
+
+    def stop(self):
+        """Stop the clock of the run."""
+        self.timer.stop()
+        self.stopped = self.clock()
+
+    @property
+    def elapsed(self):
+        """Seconds since the instrumentation was created, until it was stopped."""
+        return (self.stopped if self.stopped is not None else self.clock()) - self.started
+
+    @property
+    def turns_per_second(self):
+        elapsed = self.elapsed
+        return self.turns / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        """Return a compact text summary of the counters, phase times and throughput."""
+        elapsed = self.elapsed
+        streaks = ", ".join(f"{length}: {count}" for length, count in sorted(self.doubles_streaks.items()))
+        lines = [
+            f"Turns: {self.turns:,} in {elapsed:.3f}s ({self.turns_per_second:,.0f} turns/s)",
+            f"Rolls: {self.rolls:,}, squares traversed: {self.squares_traversed:,}",
+            f"Jail: {self.jail_entries:,} entries, {self.jail_exits:,} exits",
+            f"Doubles streaks: {streaks or 'none'}",
+            "Phases:",
+        ]
+        total = sum(self.timer.totals.values())
+        for phase in PHASES:
+            seconds = self.timer.totals[phase]
+            share = seconds / total * 100 if total > 0 else 0
+            lines.append(f"  {phase:10} {seconds:9.3f}s {share:5.1f}%")
+        return "\n".join(lines)
+
+
+class TimedSink(EventSink):
+    """Sink that counts the time spent by another sink as output"""
+
+    def __init__(self, sink: EventSink, timer: PhaseTimer):
+        self.sink = sink
+        self.timer = timer
+        self.enabled = sink.enabled
+
+    def emit(self, event_type, player, **data):
+        self.timer.enter("output")
+        self.sink.emit(event_type, player, **data)
+        self.timer.exit()
+
+    def write(self, text: str):
+        self.timer.enter("output")
+        self.sink.write(text)
+        self.timer.exit()
+
+    def flush(self):
+        self.timer.enter("output")
+        self.sink.flush()
+        self.timer.exit()
+
+
+class InstrumentedGame(Game):
+    """Game that counts its turns, rolls and jail visits and times its phases.
+
+    Only used when profiling, so that ``Game`` itself carries no instrumentation.
+    """
+
+    def __init__(self, board, sink=None, dice=None, cards=None, instrumentation: Instrumentation = None,
+                 max_jail_turns: int = 3):
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.timer = self.instrumentation.timer
+        if sink is not None:
+            sink = TimedSink(sink, self.timer)
+        super().__init__(board, sink, dice, cards, max_jail_turns)
+
+    def take_turn(self, player: Player):
+        doubles_count = super().take_turn(player)
+        instrumentation = self.instrumentation
+        instrumentation.turns += 1
+        if doubles_count:
+            streaks = instrumentation.doubles_streaks
+            streaks[doubles_count] = streaks.get(doubles_count, 0) + 1
+        return doubles_count
+
+    def player_turn(self, player: Player):
+        if not player.in_jail:
+            return super().player_turn(player)
+
+        # Everything but the dice and the movement of a turn started in jail is jail logic
+        entries = self.instrumentation.jail_entries
+        self.timer.enter("jail")
+        try:
+            result = super().player_turn(player)
+        finally:
+            self.timer.exit()
+        # Released, even if sent back during the same turn
+        if not player.in_jail or self.instrumentation.jail_entries > entries:
+            self.instrumentation.jail_exits += 1
+        return result
+
+    def roll_dice(self):
+        timer = self.timer
+        timer.enter("dice")
+        dice1, dice2, total = self.dice.roll()
+        timer.exit()
+
+        timer.enter("stats")
+        self.stats.dice[dice1 * 6 + dice2 - 7] += 1
+        timer.exit()
+
+        self.instrumentation.rolls += 1
+        return dice1, dice2, total
+
+    def move_player(self, player, steps):
+        self.instrumentation.squares_traversed += steps
+        self.timer.enter("movement")
+        try:
+            return super().move_player(player, steps)
+        finally:
+            self.timer.exit()
+
+    def go_to_jail(self, player: Player, reason: str = "go_to_jail"):
+        self.instrumentation.jail_entries += 1
+        self.timer.enter("jail")
+        try:
+            return super().go_to_jail(player, reason)
+        finally:
+            self.timer.exit()
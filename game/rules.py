@@ -0,0 +1,74 @@
+"""Movement rules as lookup tables"""
+from models.board import Board
+
+
+def dice_outcome(dice1: int, dice2: int):
+    """Index of an ordered dice roll in 0..35."""
+    return (dice1 - 1) * 6 + (dice2 - 1)
+
+
+def roll_tables(board: Board, max_jail_turns: int = 3, last_roll: bool = False):
+    """Build the outcome of a single roll from every player state.
+
+    A player state is a square index for a player who is not in jail, or
+    ``len(board) + jail_turns`` for a player in jail. The tables are indexed
+    by ``state * 36 + dice_outcome(dice1, dice2)`` and follow the rules of
+    ``Game.player_turn`` and the three doubles check in ``main.py``.
+
+    Args:
+        board (Board): The board to build the tables for.
+        max_jail_turns (int): Failed rolls before a player is released from jail.
+        last_roll (bool): Whether a double on this roll sends the player to jail
+            instead of giving another roll.
+
+    Returns:
+        tuple: ``(next_state, landed, again, speeding)`` lists where ``landed`` is
+            the square counted as landed on (``len(board)`` when the player did
+            not move), ``again`` tells if the player rolls again and ``speeding``
+            tells if a double on the last roll sent the player to jail.
+    """
+    size = len(board)
+    jail = board.jail_position
+    go_to_jail = board.go_to_jail_position
+    jailed = size  # State of a player just sent to jail
+
+    next_state = []
+    landed = []
+    again = []
+    speeding = []
+
+    for state in range(size + max_jail_turns):
+        in_jail = state >= size
+        for dice1 in range(1, 7):
+            for dice2 in range(1, 7):
+                rolled_double = dice1 == dice2
+
+                # Player stays in jail without a double until max_jail_turns
+                if in_jail and not rolled_double and state - size + 1 < max_jail_turns:
+                    next_state.append(state + 1)
+                    landed.append(size)
+                    again.append(False)
+                    speeding.append(False)
+                    continue
+
+                start = jail if in_jail else state
+                square = (start + dice1 + dice2) % size
+
+                if square == go_to_jail:
+                    # Counted as a Jail landing and ends the turn
+                    next_state.append(jailed)
+                    landed.append(jail)
+                    again.append(False)
+                    speeding.append(False)
+                elif rolled_double and last_roll:
+                    next_state.append(jailed)
+                    landed.append(square)
+                    again.append(False)
+                    speeding.append(True)
+                else:
+                    next_state.append(square)
+                    landed.append(square)
+                    again.append(rolled_double)
+                    speeding.append(False)
+
+    return next_state, landed, again, speeding
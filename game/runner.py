@@ -0,0 +1,116 @@
+"""Monte Carlo runs spread over a process pool"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from models.board import Board
+from models.player import Player
+from game.arena import ArenaWriter, StatsArena
+from game.cards import CardDecks
+from game.dice import Dice
+from game.game_logic import Game
+
+
+def shard_seeds(master_seed, shards: int):
+    """Derive an independent seed for each shard from one master seed."""
+    seeder = random.Random(master_seed)
+    return [seeder.getrandbits(64) for _ in range(shards)]
+
+
+def split_games(games: int, shards: int):
+    """Split a number of games as evenly as possible over the shards."""
+    return [games // shards + (1 if shard < games % shards else 0) for shard in range(shards)]
+
+
+# Rounds of a game between two publications of its counts to an arena
+PUBLISH_ROUNDS = 1000
+
+
+def run_shard(seed: int, games: int, rounds: int, players: int, arena: str = None, slot: int = 0,
+              max_jail_turns: int = 3):
+    """Play a number of games with their own board and game.
+
+    Args:
+        arena (str): Name of a StatsArena to add the counts to as the games go,
+            every game and every PUBLISH_ROUNDS rounds, instead of returning them.
+        slot (int): Slot of the arena written by this shard.
+        max_jail_turns (int): Failed rolls before a player is released from jail.
+
+    Returns:
+        GameStats: The landing and dice counts of all the games, or None with an arena.
+    """
+    board = Board()
+    game = Game(board, dice=Dice(seed), cards=CardDecks(board, seed), max_jail_turns=max_jail_turns)
+    writer = ArenaWriter(StatsArena.attach(arena), slot) if arena is not None else None
+
+    try:
+        for _ in range(games):
+            game_players = [Player(f"Player {i + 1}") for i in range(players)]
+            for player in game_players:
+                player.position = game.game_start()
+
+            if writer is None:
+                for _ in range(rounds):
+                    game.play_round(game_players)
+                game.cards.collect(game_players)
+                continue
+
+            for start in range(0, rounds, PUBLISH_ROUNDS):
+                played = min(PUBLISH_ROUNDS, rounds - start)
+                for _ in range(played):
+                    game.play_round(game_players)
+                writer.publish(game.stats, rounds=played, turns=played * players)
+            game.cards.collect(game_players)
+            writer.publish(game.stats, games=1)
+    finally:
+        if writer is not None:
+            writer.arena.close()
+
+    return game.stats if writer is None else None
+
+
+def run_parallel(games: int, rounds: int, players: int, master_seed=None, shards: int = None, max_workers: int = None,
+                 arena: StatsArena = None, max_jail_turns: int = 3):
+    """Play a number of games split into shards over a process pool.
+
+    The same master seed and number of shards always give the same totals,
+    whatever the number of workers. The shards add their counts in place to a
+    shared-memory StatsArena, one slot each, which the totals are read from.
+
+    Args:
+        games (int): Number of games to play.
+        rounds (int): Number of rounds in each game.
+        players (int): Number of players in each game.
+        master_seed: Seed the shard seeds are derived from, random if None.
+        shards (int): Number of shards, defaults to the number of CPUs.
+        max_workers (int): Number of worker processes, defaults to the number of CPUs.
+        arena (StatsArena): Arena to count in, with a slot per shard, so that
+            other processes can follow the run live. A new one by default.
+        max_jail_turns (int): Failed rolls before a player is released from jail.
+
+    Returns:
+        GameStats: The landing and dice counts of all the games.
+    """
+    if shards is None:
+        shards = os.cpu_count() or 1
+    shards = max(1, min(shards, games))
+
+    seeds = shard_seeds(master_seed, shards)
+    shard_games = split_games(games, shards)
+
+    own_arena = arena is None
+    if own_arena:
+        arena = StatsArena.create(len(Board()), slots=shards)
+    elif arena.slots < shards:
+        raise ValueError(f"The arena has {arena.slots} slots for {shards} shards")
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(
+                run_shard, seeds, shard_games, [rounds] * shards, [players] * shards, [arena.name] * shards,
+                range(shards), [max_jail_turns] * shards,
+            ))
+        return arena.snapshot().stats
+    finally:
+        if own_arena:
+            arena.close()
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Local HTTP/JSON service running simulation jobs on a process pool.
+
+Only the standard library is used, and the service listens on localhost:
+
+    python -m game.service --port 8765 --workers 4
+
+    POST /jobs                {"rounds": 1000, "players": 4, "games": 100, "seed": 42, "economy": false,
+                               "max_jail_turns": 3}
+    GET  /jobs/<id>           status, progress and, once done, the result
+    GET  /jobs/<id>/events    progress as JSON lines, streamed until the job is over
+    GET  /health              queue and cache sizes
+
+A job is split into chunks of games played on the pool, each with a seed
+derived from the job seed, so the same parameters always give the same
+result. Results of seeded jobs are cached in memory and on disk, keyed by the
+job parameters and the code version, so repeated requests cost nothing.
+Finished jobs are forgotten after a while, their results staying in the cache.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Make the simulation packages importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.board import Board
+from game.runner import shard_seeds, split_games
+from game.simulation import run_simulation, summarize
+from game.stats import GameStats
+from game.version import cache_version
+
+CACHE_DIRECTORY = os.path.join("stats", "data", "service_cache")
+MAX_CHUNKS = 16  # Chunks a job is split into, its progress steps
+MAX_BODY = 64 * 1024
+JOB_TTL = 3600  # Seconds a finished job can still be looked up
+MAX_FINISHED_JOBS = 1000  # Most finished jobs kept, the oldest are forgotten first
+
+# Accepted job parameters: (type, smallest, largest)
+LIMITS = {"rounds": (1, 10 ** 7), "players": (2, 8), "games": (1, 10 ** 6), "max_jail_turns": (1, 10)}
+
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+def job_params(body):
+    """Check and normalize the parameters of a job.
+
+    Raises:
+        ValueError: If the job is not a JSON object, or a parameter is missing, unknown or out of range.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("The job must be a JSON object")
+    unknown = set(body) - {"rounds", "players", "games", "seed", "economy", "max_jail_turns"}
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    params = {"games": 1, "seed": None, "economy": False, "max_jail_turns": 3, **body}
+    for name, (smallest, largest) in LIMITS.items():
+        value = params.get(name)
+        if not isinstance(value, int) or isinstance(value, bool) or not smallest <= value <= largest:
+            raise ValueError(f"{name} must be an integer from {smallest} to {largest}")
+    if params["seed"] is not None and (not isinstance(params["seed"], int) or isinstance(params["seed"], bool)):
+        raise ValueError("seed must be an integer or null")
+    if not isinstance(params["economy"], bool):
+        raise ValueError("economy must be true or false")
+    return params
+
+
+def job_key(params: dict, version: str):
+    """Return the cache key of seeded job parameters."""
+    return hashlib.sha256(json.dumps([params, version], sort_keys=True).encode()).hexdigest()
+
+
+def run_chunk(seed: int, games: int, rounds: int, players: int, economy: bool, max_jail_turns: int = 3):
+    """Play a chunk of the games of a job, in a worker process.
+
+    Returns:
+        tuple: (landings, dice, wins) where wins maps player names, or None for
+            unfinished games, to their number of wins with an economy.
+    """
+    result = run_simulation(rounds, players, seed=seed, games=games, economy=economy,
+                            max_jail_turns=max_jail_turns)
+    stats = result["stats"]
+    return stats.landings, stats.dice, result.get("wins", {})
+
+
+def job_result(params: dict, chunks):
+    """Combine the chunks of a job into its JSON result."""
+    stats = GameStats(len(Board()))
+    wins = {}
+    for landings, dice, chunk_wins in chunks:
+        stats.merge(GameStats(len(landings), landings, dice))
+        for name, count in chunk_wins.items():
+            wins[name] = wins.get(name, 0) + count
+
+    board = Board()
+    result = summarize(stats, board, params["rounds"], params["players"], params["games"])
+    data = {
+        "squares": [node.value.name for node in board.squares],
+        "landings": stats.landings,
+        "dice": stats.dice,
+        "landing_stats": result["landing_stats"],
+        "dice_stats": {f"{dice1},{dice2}": count for (dice1, dice2), count in result["dice_stats"].items()},
+        "total_rolls": result["total_rolls"],
+        "doubles_count": result["doubles_count"],
+        "doubles_percentage": result["doubles_percentage"],
+    }
+    if params["economy"]:
+        # Unfinished games are counted under null
+        data["wins"] = [[name, count] for name, count in wins.items()]
+    return data
+
+
+class Job:
+    """A simulation job and its progress"""
+
+    def __init__(self, job_id: str, params: dict, key: str = None):
+        self.id = job_id
+        self.params = params
+        self.key = key
+        self.status = "queued"  # then "running", "done" or "failed"
+        self.chunks_done = 0
+        self.chunks = 0
+        self.result = None
+        self.error = None
+        self.cached = False
+        # Set, and replaced, whenever the job changes
+        self.changed = asyncio.Event()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def progress(self):
+        """Return the status of the job, without its result."""
+        return {
+            "job": self.id,
+            "status": self.status,
+            "progress": self.chunks_done / self.chunks if self.chunks else float(self.status == "done"),
+            "cached": self.cached,
+            "params": self.params,
+            **({"error": self.error} if self.error is not None else {}),
+        }
+
+    def describe(self):
+        """Return the status of the job, with its result once done."""
+        data = self.progress()
+        if self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class SimulationService:
+    """Queue of simulation jobs run on a process pool, with a result cache
+
+    Args:
+        workers (int): Worker processes, defaults to the number of CPUs.
+        queue_size (int): Most jobs waiting to run; more are refused.
+        concurrent_jobs (int): Jobs whose chunks share the pool at a time.
+        cache_directory (str): Directory of the cached results, or None for a
+            cache in memory only.
+        version (str): Code version in the cache keys, ``cache_version()`` if None.
+        executor: Executor to run the chunks on instead of a new process pool.
+        job_ttl (float): Seconds a finished job can still be looked up.
+        max_finished_jobs (int): Most finished jobs kept, the oldest are
+            forgotten first. Their results stay in the cache.
+    """
+
+    def __init__(self, workers: int = None, queue_size: int = 100, concurrent_jobs: int = 2,
+                 cache_directory: str = CACHE_DIRECTORY, version: str = None, executor=None,
+                 job_ttl: float = JOB_TTL, max_finished_jobs: int = MAX_FINISHED_JOBS):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.concurrent_jobs = concurrent_jobs
+        self.cache_directory = cache_directory
+        self.version = version if version is not None else cache_version()
+        self.executor = executor
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        # Finished jobs in the order they finished: (time, job id)
+        self.finished = deque()
+        # Results of seeded jobs: {key: result}
+        self.cache = {}
+        # Jobs queued or running, so that identical requests share one: {key: job}
+        self.pending = {}
+        self.ids = itertools.count(1)
+        self.queue = None
+        self.server = None
+        self.tasks = []
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        """Start the job runners and listen for requests.
+
+        Returns:
+            int: The port listened on, useful with port 0.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        if self.cache_directory is not None:
+            os.makedirs(self.cache_directory, exist_ok=True)
+        self.queue = asyncio.Queue(self.queue_size)
+        self.tasks = [asyncio.create_task(self._run_jobs()) for _ in range(self.concurrent_jobs)]
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and running jobs, and shut the pool down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _cache_path(self, key: str):
+        return os.path.join(self.cache_directory, key + ".json")
+
+    def cached_result(self, key: str):
+        """Return the cached result of a job key, from memory or disk, or None."""
+        result = self.cache.get(key)
+        if result is None and self.cache_directory is not None and os.path.exists(self._cache_path(key)):
+            with open(self._cache_path(key)) as cache_file:
+                result = self.cache[key] = json.load(cache_file)
+        return result
+
+    def _store_result(self, key: str, result: dict):
+        self.cache[key] = result
+        if self.cache_directory is not None:
+            temporary = self._cache_path(key) + ".tmp"
+            with open(temporary, "w") as cache_file:
+                json.dump(result, cache_file)
+            os.replace(temporary, self._cache_path(key))
+
+    def _finish(self, job: Job):
+        """Record that a job is over, and forget the finished jobs that are too old or too many."""
+        now = time.monotonic()
+        self.finished.append((now, job.id))
+        while self.finished and (len(self.finished) > self.max_finished_jobs
+                                 or self.finished[0][0] <= now - self.job_ttl):
+            self.jobs.pop(self.finished.popleft()[1], None)
+
+    def submit(self, params: dict):
+        """Submit checked job parameters.
+
+        Returns:
+            Job: A finished job for cached results, the pending job with the
+                same parameters, or a new queued job.
+
+        Raises:
+            asyncio.QueueFull: If the queue is full.
+        """
+        key = job_key(params, self.version) if params["seed"] is not None else None
+        if key is not None:
+            if key in self.pending:
+                return self.pending[key]
+            result = self.cached_result(key)
+            if result is not None:
+                job = Job(str(next(self.ids)), params, key)
+                job.status, job.result, job.cached = "done", result, True
+                self.jobs[job.id] = job
+                self._finish(job)
+                return job
+
+        job = Job(str(next(self.ids)), params, key)
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        if key is not None:
+            self.pending[key] = job
+        return job
+
+    async def _run_jobs(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run_job(job, loop)
+            except Exception as error:
+                job.status, job.error = "failed", f"{type(error).__name__}: {error}"
+            finally:
+                self.pending.pop(job.key, None)
+                self._finish(job)
+                job.notify()
+                self.queue.task_done()
+
+    async def _run_job(self, job: Job, loop):
+        params = job.params
+        chunks = min(params["games"], MAX_CHUNKS)
+        seeds = shard_seeds(params["seed"], chunks)
+        job.status, job.chunks = "running", chunks
+        job.notify()
+
+        futures = [
+            loop.run_in_executor(self.executor, run_chunk, seed, games, params["rounds"], params["players"],
+                                 params["economy"], params["max_jail_turns"])
+            for seed, games in zip(seeds, split_games(params["games"], chunks))
+        ]
+        for future in asyncio.as_completed(futures):
+            await future
+            job.chunks_done += 1
+            job.notify()
+
+        # Combined in chunk order, whatever order they finished in
+        job.result = job_result(params, [future.result() for future in futures])
+        job.status = "done"
+        if job.key is not None:
+            self._store_result(job.key, job.result)
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY:
+                await self._respond(writer, 413, {"error": "Request body too large"})
+                return
+            body = await reader.readexactly(length) if length else b""
+            await self._route(method, target.split("?", 1)[0].rstrip("/"), body, writer)
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._respond(writer, 400, {"error": "Malformed request"})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer):
+        parts = path.strip("/").split("/")
+        if parts == ["health"] and method == "GET":
+            await self._respond(writer, 200, {"queued": self.queue.qsize(), "jobs": len(self.jobs),
+                                              "cached": len(self.cache)})
+        elif parts == ["jobs"] and method == "POST":
+            try:
+                params = job_params(json.loads(body or b"{}"))
+            except ValueError as error:
+                await self._respond(writer, 400, {"error": str(error)})
+                return
+            try:
+                job = self.submit(params)
+            except asyncio.QueueFull:
+                await self._respond(writer, 503, {"error": "The job queue is full"})
+                return
+            await self._respond(writer, 200 if job.finished else 202, job.describe())
+        elif parts[0] == "jobs" and len(parts) in (2, 3) and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await self._respond(writer, 404, {"error": f"No job {parts[1]}"})
+            elif len(parts) == 2:
+                await self._respond(writer, 200, job.describe())
+            elif parts[2] == "events":
+                await self._stream(writer, job)
+            else:
+                await self._respond(writer, 404, {"error": "Not found"})
+        elif parts[0] in ("health", "jobs"):
+            await self._respond(writer, 405, {"error": f"{method} is not allowed on {path}"})
+        else:
+            await self._respond(writer, 404, {"error": "Not found"})
+
+    async def _respond(self, writer, status: int, data: dict):
+        body = json.dumps(data).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _stream(self, writer, job: Job):
+        """Write the progress of a job as JSON lines until it is over, then its final state."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+        while not job.finished:
+            changed = job.changed
+            writer.write(json.dumps(job.progress()).encode() + b"\n")
+            await writer.drain()
+            await changed.wait()
+        writer.write(json.dumps(job.describe()).encode() + b"\n")
+        await writer.drain()
+
+
+async def serve(host: str, port: int, **options):
+    service = SimulationService(**options)
+    port = await service.start(host, port)
+    print(f"Simulation service listening on http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve simulation jobs over HTTP on localhost.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (localhost by default)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--workers", type=int, help="worker processes (the number of CPUs by default)")
+    parser.add_argument("--queue-size", type=int, default=100, help="most jobs waiting to run")
+    parser.add_argument("--concurrent-jobs", type=int, default=2, help="jobs sharing the pool at a time")
+    parser.add_argument("--cache", default=CACHE_DIRECTORY, help="directory of the cached results")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, queue_size=args.queue_size,
+                          concurrent_jobs=args.concurrent_jobs, cache_directory=args.cache))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
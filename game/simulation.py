@@ -0,0 +1,343 @@
+"""Library API for running simulations without prompts"""
+import csv
+import datetime
+import os
+import sys
+
+from models.board import Board
+from models.player import Player
+from game.arena import ArenaWriter
+from game.cards import CardDecks
+from game.checkpoint import Checkpointer, game_state, load_checkpoint, restore_game, restore_tracker, tracker_state
+from game.convergence import ConvergenceTracker
+from game.dice import Dice
+from game.events import BufferedTextSink
+from game.game_logic import Game
+from game.profiling import InstrumentedGame
+from game.runner import PUBLISH_ROUNDS, run_parallel
+from game.stats import GameStats
+
+# Verbosity levels
+QUIET = 0  # No output at all
+SUMMARY = 1  # Statistics once the simulation is over
+VERBOSE = 2  # Every roll, like the interactive script
+
+
+def summarize(stats: GameStats, board: Board, rounds: int, players: int, games: int = 1):
+    """Build the result of a simulation from its landing and dice counts."""
+    dice_stats = stats.dice_stats()
+    total_rolls = sum(dice_stats.values())
+    doubles_count = sum(count for combo, count in dice_stats.items() if combo[0] == combo[1])
+    return {
+        "rounds": rounds,
+        "players": players,
+        "games": games,
+        "stats": stats,
+        "landing_stats": stats.landing_stats(board),
+        "dice_stats": dice_stats,
+        "total_rolls": total_rolls,
+        "doubles_count": doubles_count,
+        "doubles_percentage": (doubles_count / total_rolls) * 100 if total_rolls > 0 else 0,
+    }
+
+
+def run_simulation(rounds: int, players, seed=None, verbosity: int = QUIET, games: int = 1, workers: int = None,
+                   tolerance: float = None, min_games: int = 10, report_every: int = 100, dice=None,
+                   economy: bool = False, instrumentation=None, checkpoint: str = None,
+                   checkpoint_rounds: int = None, checkpoint_seconds: float = None, resume: bool = False, arena=None,
+                   max_jail_turns: int = 3):
+    """Run a simulation and return its statistics.
+
+    Args:
+        rounds (int): Number of rounds to play in each game.
+        players: Number of players, or a list of player names.
+        seed: Seed for the dice and the card decks, random if None.
+        verbosity (int): QUIET, SUMMARY or VERBOSE.
+        games (int): Number of games to play, or the most games to play with a
+            tolerance (None for no limit).
+        workers (int): Play the games on this many processes when more than 1.
+        tolerance (float): Stop once every square's landing frequency confidence
+            interval half-width is below this value.
+        min_games (int): Fewest games to play before stopping on the tolerance.
+        report_every (int): Print the convergence every this many games, with
+            SUMMARY verbosity or more.
+        dice: Dice to roll instead of ones seeded with seed, such as
+            ``RecordingDice`` or ``ReplayDice``. Not used on several workers.
+        economy (bool): Play with money, so that a game ends early once one
+            player is left. Always plays on one process.
+        instrumentation (Instrumentation): Count and time the games with it
+            (see ``game.profiling``). Always plays on one process.
+        checkpoint (str): Write the state of the run to this file between
+            rounds, every ``checkpoint_rounds`` rounds and/or every
+            ``checkpoint_seconds`` seconds (every 60 seconds by default), and
+            delete it once the run is over. Always plays on one process.
+        resume (bool): Continue the run from the checkpoint file when there is
+            one, giving the same results as an uninterrupted run.
+        arena (StatsArena): Add the counts to this shared-memory arena as the
+            games go, so that other processes can follow the run (see
+            ``game.arena``). It needs a slot per shard on several workers.
+        max_jail_turns (int): Failed rolls before a player is released from jail.
+
+    Returns:
+        dict: The landing and dice counts (``stats``), their name-keyed views,
+            the totals computed by ``summarize``, the ``convergence`` tracker
+            when several games were played, and the ``wins`` of every player
+            name (None for unfinished games) with an economy.
+
+    Raises:
+        ValueError: If rounds is below 1, or games is None without a tolerance
+            to stop on.
+    """
+    if rounds < 1:
+        raise ValueError("rounds must be at least 1")
+    if games is None and tolerance is None:
+        raise ValueError("games is needed without a tolerance, or the run would never end")
+
+    if isinstance(players, int):
+        names = [f"Player {i + 1}" for i in range(players)]
+    else:
+        names = list(players)
+
+    if (workers is not None and workers > 1 and games is not None and games > 1 and tolerance is None and not economy
+            and instrumentation is None and checkpoint is None):
+        stats = run_parallel(games, rounds, len(names), master_seed=seed, max_workers=workers, arena=arena,
+                             max_jail_turns=max_jail_turns)
+        result = summarize(stats, Board(), rounds, len(names), games)
+        if verbosity >= SUMMARY:
+            print_statistics(result)
+        return result
+
+    board = Board()
+    sink = BufferedTextSink(sys.stdout) if verbosity >= VERBOSE else None
+    dice = dice if dice is not None else Dice(seed)
+    if instrumentation is not None:
+        game = InstrumentedGame(board, sink, dice, CardDecks(board, seed), instrumentation, max_jail_turns)
+        sink = game.sink if sink is not None else None
+    else:
+        game = Game(board, sink, dice, CardDecks(board, seed), max_jail_turns)
+    total = GameStats(len(board))
+    tracker = ConvergenceTracker(len(board)) if games != 1 or tolerance is not None else None
+    wins = {}
+
+    game_number = 0
+    checkpointer = None
+    countdown = -1  # Rounds until the checkpointer is asked, never without one
+    writer = ArenaWriter(arena) if arena is not None else None
+    publish_countdown = -1  # Rounds until the counts are published, never without an arena
+    turns = 0
+    resumed = None
+    if checkpoint is not None:
+        if not hasattr(game.dice, "getstate"):
+            raise ValueError("Only runs with Dice can be checkpointed")
+        checkpointer = Checkpointer(checkpoint, checkpoint_rounds, checkpoint_seconds)
+        countdown = checkpointer.check_every
+        params = {"rounds": rounds, "names": names, "seed": seed, "games": games, "tolerance": tolerance,
+                  "min_games": min_games, "economy": economy, "max_jail_turns": max_jail_turns}
+        resumed = load_checkpoint(checkpoint, params) if resume else None
+        if resumed is not None:
+            game_number = resumed["game"] - 1
+            total = GameStats(len(board), *resumed["total"])
+            if tracker is not None:
+                restore_tracker(tracker, resumed["tracker"])
+            wins = {name: count for name, count in resumed["wins"]}
+            if writer is not None:
+                # The games played before the interruption, the current one is published as it goes
+                writer.publish(total, games=game_number)
+
+    while games is None or game_number < games:
+        game_number += 1
+        game_players = [Player(name) for name in names]
+        for player in game_players:
+            player.position = game.game_start()
+
+        if sink is not None and resumed is None:
+            if games != 1:
+                sink.write(f"\n=== Game {game_number} ===\n")
+            for player in game_players:
+                sink.write(f"{player.name} starts at {player.position.value.name}\n")
+
+        # Counts of this game only
+        game.stats = GameStats(len(board))
+        if writer is not None:
+            writer.reset()
+            publish_countdown = PUBLISH_ROUNDS
+        if economy:
+            game.start_economy(game_players)
+
+        first_round = 0
+        if resumed is not None:
+            restore_game(game, game_players, resumed["state"])
+            first_round = resumed["round"]
+            resumed = None
+
+        # Without a sink there is no per-turn formatting or output
+        for round_number in range(first_round, rounds):
+            if economy and game.economy.finished:
+                break
+            if sink is not None:
+                sink.write(f"\nRound {round_number + 1}\n")
+            if writer is not None:
+                turns += game.economy.active if economy else len(names)
+            game.play_round(game_players)
+            publish_countdown -= 1
+            if not publish_countdown:
+                publish_countdown = PUBLISH_ROUNDS
+                writer.publish(game.stats, rounds=PUBLISH_ROUNDS, turns=turns)
+                turns = 0
+            countdown -= 1
+            if not countdown:
+                countdown = checkpointer.check_every
+                if checkpointer.due(countdown):
+                    checkpointer.save({
+                        "params": params,
+                        "game": game_number,
+                        "round": round_number + 1,
+                        "total": [total.landings, total.dice],
+                        "tracker": tracker_state(tracker),
+                        # As pairs, since unfinished games are counted under None
+                        "wins": list(wins.items()),
+                        "state": game_state(game, game_players),
+                    })
+
+        # The decks are played again in the next game
+        game.cards.collect(game_players)
+
+        if economy:
+            winner = game.economy.winner()
+            name = winner.name if winner is not None else None
+            wins[name] = wins.get(name, 0) + 1
+
+        if instrumentation is not None:
+            instrumentation.timer.enter("stats")
+        if writer is not None:
+            writer.publish(game.stats, games=1, rounds=PUBLISH_ROUNDS - publish_countdown, turns=turns)
+            turns = 0
+        total.merge(game.stats)
+        if tracker is not None:
+            tracker.add(game.stats)
+        if instrumentation is not None:
+            instrumentation.timer.exit()
+        if tracker is None:
+            continue
+
+        if verbosity >= SUMMARY and game_number % report_every == 0:
+            if sink is not None:
+                sink.flush()
+            print(tracker.report())
+        if tolerance is not None and tracker.converged(tolerance, min_games):
+            break
+
+    if sink is not None:
+        sink.flush()
+    if instrumentation is not None:
+        instrumentation.stop()
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    result = summarize(total, board, rounds, len(names), game_number)
+    result["convergence"] = tracker
+    if economy:
+        result["wins"] = wins
+    if verbosity >= SUMMARY:
+        print_statistics(result)
+    return result
+
+
+def print_statistics(result):
+    """Print the landing, dice and summary statistics of a simulation."""
+    print("\n===== GAME STATISTICS =====")
+
+    # Display landing spot statistics
+    print("\nLanding Spot Statistics:")
+    print("-----------------------")
+    sorted_landing_stats = sorted(result["landing_stats"].items(), key=lambda x: x[1], reverse=True)
+    for property_name, count in sorted_landing_stats:
+        print(f"{property_name}: {count} times")
+
+    # Display dice roll statistics
+    print("\nDice Roll Statistics:")
+    print("--------------------")
+    sorted_dice_stats = sorted(result["dice_stats"].items(), key=lambda x: x[1], reverse=True)
+    for dice_combo, count in sorted_dice_stats:
+        # For non-doubles, show as "1+6" instead of "1-6"
+        if dice_combo[0] == dice_combo[1]:
+            print(f"Double {dice_combo[0]}s (sum {dice_combo[0] + dice_combo[1]}): {count} times")
+        else:
+            print(f"Dice {dice_combo[0]}+{dice_combo[1]} (sum {dice_combo[0] + dice_combo[1]}): {count} times")
+
+    # Display summary statistics
+    print("\nSummary Statistics:")
+    print("-----------------")
+    print(f"Total dice rolls: {result['total_rolls']}")
+    print(f"Doubles rolled: {result['doubles_count']} times ({result['doubles_percentage']:.2f}%)")
+
+    # Display the winners of games played with money
+    if "wins" in result:
+        print("\nWinners:")
+        print("--------")
+        for name, count in sorted(result["wins"].items(), key=lambda x: x[1], reverse=True):
+            print(f"{name if name is not None else 'No winner'}: {count} games")
+
+    # Display how far the landing frequencies can be trusted
+    tracker = result.get("convergence")
+    if tracker is not None and tracker.games > 1:
+        print(f"Convergence: {tracker.report()}")
+
+
+def save_statistics(result, directory: str = os.path.join("stats", "data")):
+    """Append the statistics of a simulation to the CSV files in a directory.
+
+    Several games are saved like one game of all their rounds.
+    """
+    # Get current timestamp for the game
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rounds = result["rounds"] * result["games"]
+
+    # Create the directory if it doesn't exist
+    os.makedirs(directory, exist_ok=True)
+
+    # Save property statistics to CSV
+    property_csv_path = os.path.join(directory, "property_stats.csv")
+    property_file_exists = os.path.isfile(property_csv_path)
+
+    with open(property_csv_path, 'a', newline='') as csvfile:
+        fieldnames = ['timestamp', 'rounds', 'players', 'property_name', 'count']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        # Write header if file doesn't exist
+        if not property_file_exists:
+            writer.writeheader()
+
+        # Write data for each property
+        for property_name, count in result["landing_stats"].items():
+            writer.writerow({
+                'timestamp': timestamp,
+                'rounds': rounds,
+                'players': result["players"],
+                'property_name': property_name,
+                'count': count
+            })
+
+    # Save dice statistics to CSV
+    dice_csv_path = os.path.join(directory, "dice_stats.csv")
+    dice_file_exists = os.path.isfile(dice_csv_path)
+
+    with open(dice_csv_path, 'a', newline='') as csvfile:
+        fieldnames = ['timestamp', 'rounds', 'players', 'dice1', 'dice2', 'sum', 'count']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        # Write header if file doesn't exist
+        if not dice_file_exists:
+            writer.writeheader()
+
+        # Write data for each dice combination
+        for dice_combo, count in result["dice_stats"].items():
+            writer.writerow({
+                'timestamp': timestamp,
+                'rounds': rounds,
+                'players': result["players"],
+                'dice1': dice_combo[0],
+                'dice2': dice_combo[1],
+                'sum': dice_combo[0] + dice_combo[1],
+                'count': count
+            })
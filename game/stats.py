@@ -0,0 +1,71 @@
+"""Landing and dice counters"""
+from operator import add
+
+
+class GameStats:
+    """Landing and dice counts of one or more games.
+
+    Landings are counted per square index, so squares sharing a name (such as
+    the Community Chest squares) are kept apart. Dice are counted per ordered
+    outcome at ``(dice1 - 1) * 6 + (dice2 - 1)``.
+
+    The counters are plain lists rather than NumPy arrays: a game adds one to
+    them on every landing and roll, and indexing a list is several times
+    faster than indexing an array, which outweighs the faster merges.
+    """
+
+    def __init__(self, size: int, landings=None, dice=None):
+        self.landings = list(landings) if landings is not None else [0] * size
+        self.dice = list(dice) if dice is not None else [0] * 36
+
+    def __eq__(self, other):
+        if not isinstance(other, GameStats):
+            return NotImplemented
+        return self.landings == other.landings and self.dice == other.dice
+
+    def __add__(self, other):
+        return GameStats(len(self.landings)).merge(self).merge(other)
+
+    def __radd__(self, other):
+        # Allows sum() over a list of stats
+        if other == 0:
+            return GameStats(len(self.landings)).merge(self)
+        return self.__add__(other)
+
+    def merge(self, other):
+        """Add the counts of other stats to these ones."""
+        if len(other.landings) != len(self.landings):
+            raise ValueError("Cannot merge stats of boards with different sizes")
+        self.landings = list(map(add, self.landings, other.landings))
+        self.dice = list(map(add, self.dice, other.dice))
+        return self
+
+    @property
+    def total_rolls(self):
+        return sum(self.dice)
+
+    def dice_matrix(self):
+        """Return the ordered dice counts as a 6x6 list: matrix[dice1 - 1][dice2 - 1]."""
+        return [self.dice[row * 6:row * 6 + 6] for row in range(6)]
+
+    def landing_stats(self, board):
+        """Return landing counts keyed by property name, squares with the same name combined."""
+        stats = {}
+        for node in board.squares:
+            count = self.landings[node.index]
+            if count:
+                name = node.value.name
+                stats[name] = stats.get(name, 0) + count
+        return stats
+
+    def dice_stats(self):
+        """Return dice combination counts with (1, 6) and (6, 1) combined."""
+        stats = {}
+        for dice1 in range(1, 7):
+            for dice2 in range(dice1, 7):
+                count = self.dice[(dice1 - 1) * 6 + (dice2 - 1)]
+                if dice1 != dice2:
+                    count += self.dice[(dice2 - 1) * 6 + (dice1 - 1)]
+                if count:
+                    stats[(dice1, dice2)] = count
+        return stats
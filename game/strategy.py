@@ -0,0 +1,92 @@
+"""Player strategies consulted by the game at its decision points"""
+
+
+class Strategy:
+    """How a player decides: the default strategy.
+
+    The default waits in jail for doubles, buys every square it can afford and
+    keeps $200 when building. Subclasses override the decisions they change,
+    and ``params`` so that ``key`` tells their variants apart.
+    """
+
+    # Cash kept when building houses
+    build_reserve = 200
+
+    @property
+    def params(self):
+        """Parameters of the strategy, as a dict."""
+        return {}
+
+    @property
+    def key(self):
+        """Stable text identifying the strategy and its parameters, such as ``BuyBelow(max_price=200)``."""
+        params = ", ".join(f"{name}={value!r}" for name, value in sorted(self.params.items()))
+        return f"{type(self).__name__}({params})"
+
+    def __repr__(self):
+        return self.key
+
+    def pays_to_leave_jail(self, player, fine: int):
+        """Whether the player pays the fine to leave jail before rolling, instead of rolling for doubles.
+
+        Args:
+            player (Player): The player in jail, without a Get Out of Jail Free card.
+            fine (int): The fine, 0 when playing without money.
+        """
+        return False
+
+    def wants_to_buy(self, player, prop, price: int):
+        """Whether the player buys an unowned square they landed on.
+
+        Args:
+            player (Player): The player.
+            prop (Property): The square.
+            price (int): Its price.
+        """
+        return player.money >= price
+
+
+class PayToLeaveJail(Strategy):
+    """Pay the fine to leave jail at once, when the cash left stays above a reserve"""
+
+    def __init__(self, reserve: int = 0):
+        self.reserve = reserve
+
+    @property
+    def params(self):
+        return {"reserve": self.reserve}
+
+    def pays_to_leave_jail(self, player, fine: int):
+        return player.money - fine >= self.reserve
+
+
+class BuyBelow(Strategy):
+    """Only buy squares whose printed price is at most max_price"""
+
+    def __init__(self, max_price: int):
+        self.max_price = max_price
+
+    @property
+    def params(self):
+        return {"max_price": self.max_price}
+
+    def wants_to_buy(self, player, prop, price: int):
+        return price <= self.max_price and player.money >= price
+
+
+class KeepReserve(Strategy):
+    """Only buy, and build, while the cash left stays above a reserve"""
+
+    def __init__(self, reserve: int):
+        self.reserve = reserve
+        self.build_reserve = reserve
+
+    @property
+    def params(self):
+        return {"reserve": self.reserve}
+
+    def wants_to_buy(self, player, prop, price: int):
+        return player.money - price >= self.reserve
+
+
+DEFAULT_STRATEGY = Strategy()
@@ -0,0 +1,201 @@
+"""Tournaments of player strategies over many seeded games, with a result cache"""
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from models.board import Board
+from models.player import Player
+from game.cards import CardDecks
+from game.dice import Dice
+from game.game_logic import Game
+from game.version import cache_version
+
+CACHE_FILE = "tournament.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    key TEXT PRIMARY KEY,
+    seats TEXT NOT NULL,
+    winner INTEGER,
+    rounds INTEGER NOT NULL
+);
+"""
+
+DEFAULT_RULES = {"max_rounds": 500}
+
+
+def play_match(strategies, seed: int, rules: dict):
+    """Play one game with money between players following the strategies, in seat order.
+
+    Returns:
+        tuple: (winner, rounds) where winner is the seat of the last player
+            standing, or None when the game did not finish.
+    """
+    board = Board()
+    game = Game(board, dice=Dice(seed), cards=CardDecks(board, seed))
+    players = [Player(f"Player {seat + 1}", strategy) for seat, strategy in enumerate(strategies)]
+    for player in players:
+        player.position = game.game_start()
+    winner, rounds = game.play_game(players, max_rounds=rules["max_rounds"])
+    return (players.index(winner) if winner is not None else None), rounds
+
+
+def _play_matches(matches):
+    """Play a list of (strategies, seed, rules) matches, in a worker process."""
+    return [play_match(strategies, seed, rules) for strategies, seed, rules in matches]
+
+
+def match_key(strategies, seed: int, rules: dict, version: str):
+    """Return the cache key of a game: a hash of the strategies in seat order, the rules, the seed and the code version."""
+    text = json.dumps([[strategy.key for strategy in strategies], rules, seed, version], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """Results of tournament games in a SQLite database, by match key"""
+
+    def __init__(self, path=os.path.join("stats", "data", CACHE_FILE)):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def get(self, keys):
+        """Return the cached (winner, rounds) of the keys that are cached: {key: (winner, rounds)}."""
+        results = {}
+        keys = list(keys)
+        # Stay below the SQLite limit of query parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT key, winner, rounds FROM games WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            results.update((key, (winner, rounds)) for key, winner, rounds in rows)
+        return results
+
+    def put(self, rows):
+        """Store (key, seats, winner, rounds) rows in one transaction."""
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?)", rows)
+
+
+class TournamentResult:
+    """Wins of every strategy across a tournament"""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.games = dict.fromkeys(self.keys, 0)
+        self.wins = dict.fromkeys(self.keys, 0)
+        # Games of a strategy that did not finish
+        self.unfinished = dict.fromkeys(self.keys, 0)
+        # Wins of a strategy against another one: {(winner, loser): count}
+        self.head_to_head = {}
+        self.simulated = 0
+        self.cached = 0
+
+    def add(self, seats, winner):
+        for key in seats:
+            self.games[key] += 1
+            if winner is None:
+                self.unfinished[key] += 1
+        if winner is not None:
+            winner_key = seats[winner]
+            self.wins[winner_key] += 1
+            for key in seats:
+                if key != winner_key:
+                    self.head_to_head[winner_key, key] = self.head_to_head.get((winner_key, key), 0) + 1
+
+    def win_rate(self, key):
+        return self.wins[key] / self.games[key] if self.games[key] else 0.0
+
+    def report(self):
+        """Return a table of the strategies by win rate."""
+        lines = [f"{'Strategy':40} {'Games':>7} {'Wins':>7} {'Unfinished':>10} {'Win rate':>9}"]
+        for key in sorted(self.keys, key=self.win_rate, reverse=True):
+            lines.append(f"{key:40} {self.games[key]:7} {self.wins[key]:7} {self.unfinished[key]:10} "
+                         f"{self.win_rate(key):9.1%}")
+        lines.append(f"{self.simulated} games simulated, {self.cached} from the cache")
+        return "\n".join(lines)
+
+
+def run_tournament(strategies, seeds, players: int = 2, rules: dict = None, cache_path=None, workers: int = None,
+                   version: str = None):
+    """Play every pairing of strategies on every seed, reusing the cached games.
+
+    Each pairing is played once per seed and per seat order, so no strategy
+    keeps the advantage of playing first. Every game of a seed uses the same
+    dice and decks, so strategies are compared on the same luck.
+
+    Args:
+        strategies (list): The strategies, told apart by their ``key``.
+        seeds: Seeds of the games, such as ``range(100)``.
+        players (int): Number of players in each game.
+        rules (dict): Rule settings, DEFAULT_RULES by default.
+        cache_path (str): SQLite file of the cached results, stats/data/tournament.sqlite
+            by default, or False to play every game.
+        workers (int): Play the games on this many processes when more than 1.
+        version (str): Code version in the cache keys, ``cache_version()`` if None:
+            the git revision, with a hash of the sources when they have uncommitted changes.
+
+    Returns:
+        TournamentResult: The wins of every strategy.
+    """
+    strategies = list(strategies)
+    keys = [strategy.key for strategy in strategies]
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"Strategies must have different keys: {keys}")
+    rules = {**DEFAULT_RULES, **(rules or {})}
+    version = version if version is not None else cache_version()
+
+    matches = [
+        (seats, seed) for pairing in itertools.combinations(strategies, players)
+        for seats in itertools.permutations(pairing) for seed in seeds
+    ]
+    match_keys = [match_key(seats, seed, rules, version) for seats, seed in matches]
+
+    if cache_path is None:
+        cache_path = os.path.join("stats", "data", CACHE_FILE)
+    cache = None
+    cached = {}
+    if cache_path:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        cache = ResultCache(cache_path)
+        cached = cache.get(match_keys)
+
+    missing = [i for i, key in enumerate(match_keys) if key not in cached]
+    to_play = [(matches[i][0], matches[i][1], rules) for i in missing]
+    if workers is not None and workers > 1 and len(to_play) > 1:
+        # A few chunks per worker, so that the processes stay busy
+        size = max(1, len(to_play) // (workers * 4))
+        chunks = [to_play[start:start + size] for start in range(0, len(to_play), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            played = [outcome for chunk in executor.map(_play_matches, chunks) for outcome in chunk]
+    else:
+        played = _play_matches(to_play)
+
+    if cache is not None:
+        cache.put([
+            (match_keys[i], json.dumps([strategy.key for strategy in matches[i][0]]), winner, rounds)
+            for i, (winner, rounds) in zip(missing, played)
+        ])
+        cache.close()
+
+    outcomes = dict(cached)
+    outcomes.update((match_keys[i], outcome) for i, outcome in zip(missing, played))
+    result = TournamentResult(keys)
+    for (seats, _), key in zip(matches, match_keys):
+        result.add([strategy.key for strategy in seats], outcomes[key][0])
+    result.simulated = len(played)
+    result.cached = len(matches) - len(played)
+    return result
@@ -0,0 +1,215 @@
+"""Variance reduction for experiments comparing rule variants"""
+import numpy as np
+
+from models.board import Board
+from models.player import Player
+from game.cards import CardDecks
+from game.dice import ROLLS, Dice
+from game.game_logic import Game
+from game.runner import shard_seeds
+
+# Sampling modes, and the number of games of a group of dependent games
+MODES = {"independent": 1, "crn": 1, "antithetic": 2, "stratified": 36}
+
+
+class AntitheticDice:
+    """Dice that roll 7 minus each face of other dice, so that a pair of games balance each other"""
+
+    def __init__(self, dice):
+        self.dice = dice
+
+    def roll(self):
+        dice1, dice2, _ = self.dice.roll()
+        return ROLLS[(6 - dice1) * 6 + (6 - dice2)]
+
+
+class StratifiedOutcomes:
+    """Dice outcomes of a group of 36 games, stratified across the games.
+
+    The n-th rolls of the 36 games are a random permutation of the 36 ordered
+    outcomes, drawn independently for every n. Each game on its own still
+    rolls independent uniform dice, but together the games cover every
+    outcome exactly as often (Latin hypercube sampling of the rolls).
+    """
+
+    def __init__(self, seed, block_size: int = 1024):
+        self.seed = seed
+        self.block_size = block_size
+        # Blocks drawn so far: blocks[k][n, game] is the outcome of roll k * block_size + n of a game
+        self.blocks = []
+
+    def block(self, index: int):
+        while len(self.blocks) <= index:
+            rng = np.random.default_rng([self.seed, len(self.blocks)])
+            outcomes = np.tile(np.arange(36), (self.block_size, 1))
+            self.blocks.append(rng.permuted(outcomes, axis=1))
+        return self.blocks[index]
+
+    def dice(self, game: int):
+        """Return the dice of one game of the group."""
+        return StratifiedDice(self, game)
+
+
+class StratifiedDice:
+    """Dice of one game of a StratifiedOutcomes group"""
+
+    def __init__(self, outcomes: StratifiedOutcomes, game: int):
+        self.outcomes = outcomes
+        self.game = game
+        self._block = 0
+        self._rolls = iter(())
+
+    def roll(self):
+        try:
+            return next(self._rolls)
+        except StopIteration:
+            outcomes = self.outcomes.block(self._block)[:, self.game].tolist()
+            self._block += 1
+            self._rolls = map(ROLLS.__getitem__, outcomes)
+            return next(self._rolls)
+
+
+def landing_share(square: int):
+    """Metric: the share of the landings of a game on a square."""
+    def metric(game, players):
+        landings = game.stats.landings
+        total = sum(landings)
+        return landings[square] / total if total else 0.0
+    return metric
+
+
+class ExperimentResult:
+    """Metric values of every variant, by group of dependent games and game of the group"""
+
+    def __init__(self, mode: str, values: dict):
+        self.mode = mode
+        # {variant: array[group, game]}
+        self.values = {name: np.asarray(value, dtype=float) for name, value in values.items()}
+        self.names = list(values)
+        self.base = self.names[0]
+
+    @property
+    def groups(self):
+        return self.values[self.base].shape[0]
+
+    @property
+    def games(self):
+        """Games played per variant."""
+        return self.values[self.base].size
+
+    def _group_means(self, name: str):
+        return self.values[name].mean(axis=1)
+
+    def mean(self, name: str):
+        return float(self.values[name].mean())
+
+    def standard_error(self, name: str):
+        return float(np.sqrt(self._group_means(name).var(ddof=1) / self.groups))
+
+    def difference(self, name: str):
+        """Return the difference of the mean of a variant with the first one, and its standard error."""
+        differences = self._group_means(name) - self._group_means(self.base)
+        return float(differences.mean()), float(np.sqrt(differences.var(ddof=1) / self.groups))
+
+    def variance_reduction(self, name: str, difference: bool = False):
+        """Return how many times smaller the variance of the estimate is than with independent games.
+
+        The variance with independent games is estimated from the spread of
+        single games, which each roll independent uniform dice in every mode.
+        A reduction of 4 means independent sampling would need 4 times the games
+        for the same precision.
+
+        Args:
+            name (str): The variant.
+            difference (bool): For the difference with the first variant rather
+                than the mean of the variant.
+        """
+        if difference:
+            independent = (self.values[name].var(ddof=1) + self.values[self.base].var(ddof=1)) / self.games
+            achieved = self.difference(name)[1] ** 2
+        else:
+            independent = self.values[name].var(ddof=1) / self.games
+            achieved = self.standard_error(name) ** 2
+        return float(independent / achieved) if achieved > 0 else float("inf")
+
+    def report(self):
+        """Return a table of the variants with their means, differences and variance reductions."""
+        lines = [f"{self.games} games per variant, {self.mode} sampling",
+                 f"{'Variant':20} {'Mean':>10} {'SE':>9} {'Reduction':>9} {'Difference':>11} {'SE':>9} {'Reduction':>9}"]
+        for name in self.names:
+            line = (f"{name:20} {self.mean(name):10.5f} {self.standard_error(name):9.5f} "
+                    f"{self.variance_reduction(name):8.1f}x")
+            if name != self.base:
+                difference, error = self.difference(name)
+                line += f" {difference:11.5f} {error:9.5f} {self.variance_reduction(name, True):8.1f}x"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def run_experiment(variants: dict, metric, games: int = 360, rounds: int = 100, players: int = 4, seed=None,
+                   mode: str = "crn", board: Board = None):
+    """Play every rule variant on games sampled with a variance reduction mode.
+
+    Modes:
+        independent: every game of every variant has its own dice.
+        crn: common random numbers, every variant replays the same dice and
+            decks game for game, so the difference between variants is
+            measured on the same luck.
+        antithetic: common random numbers, with games in pairs where the
+            second game rolls 7 minus each face of the first.
+        stratified: common random numbers, with games in groups of 36 whose
+            n-th rolls are a permutation of the 36 dice outcomes.
+
+    Args:
+        variants (dict): Game options of every variant, such as
+            ``{"3 turns": {}, "1 turn": {"max_jail_turns": 1}}``. The first one
+            is the base the others are compared with.
+        metric: Function of a played ``(game, players)`` returning the number
+            to estimate, such as ``landing_share(square)``.
+        games (int): Games per variant, rounded up to whole groups.
+        rounds (int): Rounds of each game.
+        players (int): Players of each game.
+        seed: Seed of the experiment, random if None.
+        mode (str): One of MODES.
+
+    Returns:
+        ExperimentResult: The metric of every game, with the estimates and
+            their variance reductions.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown sampling mode {mode!r}, expected one of {', '.join(MODES)}")
+    board = board if board is not None else Board()
+    group_size = MODES[mode]
+    groups = max(2, -(-games // group_size))
+
+    # One seed per game, and one more set per variant with independent sampling
+    streams = len(variants) if mode == "independent" else 1
+    seeds = np.array(shard_seeds(seed, streams * groups * group_size), dtype=object)
+    seeds = seeds.reshape(streams, groups, group_size)
+
+    values = {}
+    for stream, (name, options) in enumerate(variants.items()):
+        game_seeds = seeds[stream if mode == "independent" else 0]
+        result = np.zeros((groups, group_size))
+        for group in range(groups):
+            outcomes = StratifiedOutcomes(int(game_seeds[group, 0])) if mode == "stratified" else None
+            for member in range(group_size):
+                game_seed = int(game_seeds[group, member])
+                if mode == "antithetic":
+                    # Both games of a pair roll from the first game's stream
+                    dice = Dice(int(game_seeds[group, 0]))
+                    if member:
+                        dice = AntitheticDice(dice)
+                elif mode == "stratified":
+                    dice = outcomes.dice(member)
+                else:
+                    dice = Dice(game_seed)
+                game = Game(board, dice=dice, cards=CardDecks(board, game_seed), **options)
+                game_players = [Player(f"Player {i + 1}") for i in range(players)]
+                for player in game_players:
+                    player.position = game.game_start()
+                for _ in range(rounds):
+                    game.play_round(game_players)
+                result[group, member] = metric(game, game_players)
+        values[name] = result
+    return ExperimentResult(mode, values)
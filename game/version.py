@@ -0,0 +1,50 @@
+"""Version of the simulation code, to record with results and key their caches by"""
+import hashlib
+import os
+import subprocess
+
+
+def code_version():
+    """Return the git revision of the code, or "unknown" outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Directories whose files decide the results of a simulation, relative to the project root
+SOURCE_DIRECTORIES = ("game", "models")
+SOURCE_EXTENSIONS = (".py", ".json", ".toml")
+
+
+def source_hash(root=None):
+    """Return a short hash of the simulation source files: the game and models packages with the board files."""
+    root = root if root is not None else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for directory in SOURCE_DIRECTORIES:
+        for path, subdirectories, files in os.walk(os.path.join(root, directory)):
+            subdirectories[:] = sorted(name for name in subdirectories if name not in ("__pycache__", "cache"))
+            for name in sorted(files):
+                if name.endswith(SOURCE_EXTENSIONS):
+                    file_path = os.path.join(path, name)
+                    digest.update(os.path.relpath(file_path, root).encode())
+                    with open(file_path, "rb") as source_file:
+                        digest.update(source_file.read())
+    return digest.hexdigest()[:12]
+
+
+def cache_version():
+    """Return the code version to key cached results by.
+
+    This is the git revision. When the checkout has uncommitted changes, or is
+    not a git checkout at all, a hash of the source files is added, so that
+    results cached before an edit are not served after it.
+    """
+    version = code_version()
+    if version == "unknown" or version.endswith("-dirty"):
+        version = f"{version}-{source_hash()}"
+    return version
@@ -1,144 +1,144 @@
-import csv
+import argparse
 import os
-import datetime
-from models.board import Board
-from models.player import Player
-from game.game_logic import Game
-
-# Init board
-board = Board()
-
-# Init game
-game = Game(board)
-
-# Number of rounds to play
-num_rounds = int(input("Enter the number of rounds to play: "))
-# Number of players up to 4
-num_players = int(input("Enter the number of players: "))
-
-# Init player
-players = []
-for i in range(num_players):
-    name = input(f"Enter player {i+1} name: ")
-    players.append(Player(name))
-    players[-1].position = game.game_start()
-
-for player in players:
-    print(f"{player.name} starts at {player.position.value.name}")
-
-for round in range(num_rounds):
-    print(f"\nRound {round + 1}")
-    for player_index, player in enumerate(players):
-        # Player may get multiple turns if they roll doubles
-        doubles_count = 0
-        taking_turn = True
-        
-        while taking_turn:
-            # Execute player's turn using the game's player_turn method
-            dice1, dice2, dice_roll, current_property, rolled_double, continue_turn = game.player_turn(player)
-
-            print(f"{player.name} rolled a {dice1} and a {dice2} for a total of {dice_roll}")
-            print(f"{player.name} landed on {current_property.name}")
-            
-            # Check if player rolled a double and if they should continue their turn
-            if rolled_double and continue_turn:
-                doubles_count += 1
-                print(f"{player.name} rolled a double! They get another turn.")
-                
-                # In Monopoly, if a player rolls 3 doubles in a row, they go to jail
-                if doubles_count == 3:
-                    print(f"{player.name} rolled 3 doubles in a row and is going to jail!")
-                    game.go_to_jail(player)
-                    taking_turn = False
-            else:
-                # No double or player was sent to jail, turn is over
-                taking_turn = False
-
-# Display game statistics
-print("\n===== GAME STATISTICS =====")
-
-# Get current timestamp for the game
-timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-# Display landing spot statistics
-print("\nLanding Spot Statistics:")
-print("-----------------------")
-landing_stats = game.get_landing_stats()
-sorted_landing_stats = sorted(landing_stats.items(), key=lambda x: x[1], reverse=True)
-for property_name, count in sorted_landing_stats:
-    print(f"{property_name}: {count} times")
-
-# Display dice roll statistics
-print("\nDice Roll Statistics:")
-print("--------------------")
-dice_stats = game.get_dice_stats()
-sorted_dice_stats = sorted(dice_stats.items(), key=lambda x: x[1], reverse=True)
-for dice_combo, count in sorted_dice_stats:
-    # For non-doubles, show as "1+6" instead of "1-6"
-    if dice_combo[0] == dice_combo[1]:
-        print(f"Double {dice_combo[0]}s (sum {dice_combo[0] + dice_combo[1]}): {count} times")
+
+from game.simulation import QUIET, SUMMARY, VERBOSE, run_simulation, save_statistics
+
+
+def parse_args(argv=None):
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description="Simulate Monopoly games and collect landing and dice statistics.")
+    parser.add_argument("--rounds", type=int, help="number of rounds to play (prompted if missing)")
+    parser.add_argument("--players", type=int, help="number of players (prompted with names if missing)")
+    parser.add_argument("--names", nargs="+", help="player names, instead of --players")
+    parser.add_argument("--games", type=int, help="number of games to play, or the most games with --tolerance")
+    parser.add_argument("--tolerance", type=float,
+                        help="play games until every landing frequency 95%% CI half-width is below this value")
+    parser.add_argument("--min-games", type=int, default=10, help="fewest games to play with --tolerance")
+    parser.add_argument("--seed", type=int, help="seed for the dice")
+    parser.add_argument("--workers", type=int, help="play the games on this many processes")
+    parser.add_argument("--economy", action="store_true",
+                        help="play with money: buying, rent, houses, mortgages and bankruptcy "
+                             "(a game ends once one player is left)")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="write the state of the run to FILE between rounds, to resume it with --resume")
+    parser.add_argument("--checkpoint-rounds", type=int, help="write a checkpoint every this many rounds")
+    parser.add_argument("--checkpoint-seconds", type=float,
+                        help="write a checkpoint every this many seconds (60 by default)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the run from the --checkpoint file, if there is one")
+    parser.add_argument("--profile", nargs="?", const="simulation.pstats", metavar="FILE",
+                        help="profile the simulation: write a cProfile dump to FILE (simulation.pstats by default) "
+                             "and print the counters, phase times and turns per second")
+    parser.add_argument("--live", action="store_true",
+                        help="count in shared memory as the games go, to follow the run with python -m game.arena NAME")
+    parser.add_argument("--quiet", "-q", action="store_true", help="only print the final statistics")
+    parser.add_argument("--silent", action="store_true", help="print nothing at all")
+    parser.add_argument("--no-save", action="store_true", help="do not save the statistics")
+    parser.add_argument("--storage", choices=["csv", "columnar", "sqlite"], default="csv",
+                        help="append to the CSV files, write a columnar partition (Parquet or .npz) "
+                             "or record the run in the SQLite run registry")
+    return parser.parse_args(argv)
+
+
+def profile_simulation(rounds, players, path, **simulation):
+    """Run a simulation under cProfile with instrumented games, dump the profile and print a summary."""
+    import cProfile
+    import pstats
+
+    from game.profiling import Instrumentation
+
+    instrumentation = Instrumentation()
+    profiler = cProfile.Profile()
+    result = profiler.runcall(run_simulation, rounds, players, instrumentation=instrumentation, **simulation)
+    profiler.dump_stats(path)
+
+    print(f"\n=== Profile (cProfile dump in {path}) ===")
+    print(instrumentation.report())
+    print("Top functions by own time:")
+    pstats.Stats(profiler).sort_stats(pstats.SortKey.TIME).print_stats(10)
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.resume and args.checkpoint is None:
+        raise SystemExit("--resume needs --checkpoint")
+
+    # Number of rounds to play
+    num_rounds = args.rounds
+    if num_rounds is None:
+        num_rounds = int(input("Enter the number of rounds to play: "))
+
+    # Players by name, or numbered players
+    players = args.names or args.players
+    if players is None:
+        # Number of players up to 4
+        num_players = int(input("Enter the number of players: "))
+        players = [input(f"Enter player {i+1} name: ") for i in range(num_players)]
+
+    if args.silent:
+        verbosity = QUIET
+    elif args.quiet:
+        verbosity = SUMMARY
     else:
-        print(f"Dice {dice_combo[0]}+{dice_combo[1]} (sum {dice_combo[0] + dice_combo[1]}): {count} times")
-
-# Display summary statistics
-print("\nSummary Statistics:")
-print("-----------------")
-total_rolls = sum(dice_stats.values())
-print(f"Total dice rolls: {total_rolls}")
-
-# Calculate doubles statistics
-doubles_count = sum(count for combo, count in dice_stats.items() if combo[0] == combo[1])
-doubles_percentage = (doubles_count / total_rolls) * 100 if total_rolls > 0 else 0
-print(f"Doubles rolled: {doubles_count} times ({doubles_percentage:.2f}%)")
-
-# Save statistics to CSV files
-# Create stats/data directory if it doesn't exist
-os.makedirs("stats/data", exist_ok=True)
-
-# Save property statistics to CSV
-property_csv_path = "stats/data/property_stats.csv"
-property_file_exists = os.path.isfile(property_csv_path)
-
-with open(property_csv_path, 'a', newline='') as csvfile:
-    fieldnames = ['timestamp', 'rounds', 'players', 'property_name', 'count']
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-    
-    # Write header if file doesn't exist
-    if not property_file_exists:
-        writer.writeheader()
-    
-    # Write data for each property
-    for property_name, count in landing_stats.items():
-        writer.writerow({
-            'timestamp': timestamp,
-            'rounds': num_rounds,
-            'players': num_players,
-            'property_name': property_name,
-            'count': count
-        })
-
-# Save dice statistics to CSV
-dice_csv_path = "stats/data/dice_stats.csv"
-dice_file_exists = os.path.isfile(dice_csv_path)
-
-with open(dice_csv_path, 'a', newline='') as csvfile:
-    fieldnames = ['timestamp', 'rounds', 'players', 'dice1', 'dice2', 'sum', 'count']
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-    
-    # Write header if file doesn't exist
-    if not dice_file_exists:
-        writer.writeheader()
-    
-    # Write data for each dice combination
-    for dice_combo, count in dice_stats.items():
-        writer.writerow({
-            'timestamp': timestamp,
-            'rounds': num_rounds,
-            'players': num_players,
-            'dice1': dice_combo[0],
-            'dice2': dice_combo[1],
-            'sum': dice_combo[0] + dice_combo[1],
-            'count': count
-        })
-
-print("\nStatistics saved to CSV files in the stats folder.")
+        verbosity = VERBOSE
+
+    # Without a tolerance one game is played by default, with one games are played until converged
+    games = args.games
+    if games is None and args.tolerance is None:
+        games = 1
+
+    simulation = dict(seed=args.seed, verbosity=verbosity, games=games, workers=args.workers,
+                      tolerance=args.tolerance, min_games=args.min_games, economy=args.economy,
+                      checkpoint=args.checkpoint, checkpoint_rounds=args.checkpoint_rounds,
+                      checkpoint_seconds=args.checkpoint_seconds, resume=args.resume)
+    arena = None
+    if args.live:
+        from game.arena import StatsArena
+        from models.board import Board
+
+        # A slot for each shard of a parallel run
+        arena = StatsArena.create(len(Board()), slots=os.cpu_count() or 1)
+        simulation["arena"] = arena
+        print(f"Live statistics: python -m game.arena {arena.name}", flush=True)
+    try:
+        if args.profile:
+            result = profile_simulation(num_rounds, players, args.profile, **simulation)
+        else:
+            result = run_simulation(num_rounds, players, **simulation)
+    finally:
+        if arena is not None:
+            arena.close()
+
+    if not args.no_save:
+        if args.storage == "sqlite":
+            from models.board import Board
+            from stats.registry import REGISTRY_FILE, RunRegistry
+
+            # Record the run with a unique id, its parameters and per-square counts
+            stats = result["stats"]
+            square_names = [node.value.name for node in Board().squares]
+            with RunRegistry(os.path.join("stats", "data", REGISTRY_FILE)) as registry:
+                run_id = registry.register_run(square_names, stats.landings, stats.dice, result["rounds"],
+                                               result["players"], games=result["games"], seed=args.seed)
+            if verbosity > QUIET:
+                print(f"\nStatistics saved as run {run_id} in the run registry in the stats folder.")
+        elif args.storage == "columnar":
+            from stats.storage import write_run
+
+            # Save statistics as typed columns, one partition per run
+            write_run(result["landing_stats"], result["dice_stats"], result["rounds"] * result["games"],
+                      result["players"], os.path.join("stats", "data"))
+            if verbosity > QUIET:
+                print("\nStatistics saved to columnar partitions in the stats folder.")
+        else:
+            # Save statistics to CSV files
+            save_statistics(result)
+            if verbosity > QUIET:
+                print("\nStatistics saved to CSV files in the stats folder.")
+
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Board definition files, compiled into flat arrays and cached on disk"""
+import hashlib
+import json
+import os
+import pickle
+from array import array
+
+from .property_model import SquareKind
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+BOARDS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "boards")
+DEFAULT_BOARD = os.path.join(BOARDS_DIRECTORY, "standard.json")
+CACHE_DIRECTORY = os.path.join(BOARDS_DIRECTORY, "cache")
+
+# Bumped when the compiled form changes, so that older cache files are not read
+COMPILED_VERSION = 1
+
+KINDS = {kind.name.lower(): kind for kind in SquareKind}
+PURCHASABLE = (SquareKind.STREET, SquareKind.RAILROAD, SquareKind.UTILITY)
+# Most squares in a group, by kind, as far as the rent tables of the economy go
+GROUP_LIMITS = {SquareKind.STREET: 4, SquareKind.RAILROAD: 4, SquareKind.UTILITY: 2}
+
+# Compiled boards of this process by path: {path: (mtime_ns, size, compiled, squares)}
+_loaded = {}
+
+
+def parse_definition(content: bytes, path: str):
+    """Parse the JSON or TOML text of a board definition, by the extension of its path.
+
+    Returns:
+        dict: ``{"name": ..., "squares": [{"name", "kind", "price", "group", "rents", "house_cost"}, ...]}``
+    """
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"Reading {path} needs Python 3.11 or later (tomllib)")
+        return tomllib.loads(content.decode("utf-8"))
+    return json.loads(content)
+
+
+def compile_definition(definition: dict):
+    """Check a board definition and turn it into flat per-square arrays.
+
+    A square has a ``name`` and a ``kind`` (street by default, or corner,
+    railroad, utility, tax, chance, chest, go_to_jail). Streets, railroads and
+    utilities have a ``price`` and a ``group``, and streets the six ``rents``
+    (no house, 1 to 4 houses, hotel) and the ``house_cost``.
+
+    Returns:
+        dict: ``name``, ``names`` and ``groups`` lists, and ``kinds``, ``prices``,
+            ``group_index`` (-1 without a group), ``house_costs`` and ``rents``
+            (six per square) arrays, with 0 where a square has no such value.
+
+    Raises:
+        ValueError: If the definition is not a valid board.
+    """
+    squares = definition.get("squares")
+    if not squares:
+        raise ValueError("A board definition needs a non-empty list of squares")
+
+    names = []
+    groups = []
+    group_numbers = {}
+    group_kinds = []
+    group_sizes = []
+    kinds = array("b")
+    prices = array("l")
+    group_index = array("l")
+    house_costs = array("l")
+    rents = array("l")
+    for index, square in enumerate(squares):
+        name = square.get("name")
+        if not name:
+            raise ValueError(f"Square {index} has no name")
+        kind = KINDS.get(square.get("kind", "street"))
+        if kind is None:
+            raise ValueError(f"Square {index} ({name}) has an unknown kind {square['kind']!r}, "
+                             f"expected one of {', '.join(KINDS)}")
+        price = square.get("price", 0)
+        group = square.get("group")
+        if kind in PURCHASABLE and (not price or group is None):
+            raise ValueError(f"Square {index} ({name}) can be bought and needs a price and a group")
+        square_rents = square.get("rents", (0,) * 6)
+        if kind == SquareKind.STREET and ("rents" not in square or "house_cost" not in square):
+            raise ValueError(f"Square {index} ({name}) is a street and needs rents and a house_cost")
+        if len(square_rents) != 6:
+            raise ValueError(f"Square {index} ({name}) needs 6 rents: no house, 1 to 4 houses and a hotel")
+
+        if group is not None:
+            if group not in group_numbers:
+                group_numbers[group] = len(groups)
+                groups.append(group)
+                group_kinds.append(kind)
+                group_sizes.append(0)
+            number = group_numbers[group]
+            if group_kinds[number] != kind:
+                raise ValueError(f"Square {index} ({name}) is a {kind.name.lower()} in group {group} "
+                                 f"of {group_kinds[number].name.lower()} squares")
+            group_sizes[number] += 1
+            if group_sizes[number] > GROUP_LIMITS.get(kind, 0):
+                raise ValueError(f"Group {group} has more than {GROUP_LIMITS.get(kind, 0)} squares")
+        names.append(name)
+        kinds.append(kind)
+        prices.append(price)
+        group_index.append(group_numbers[group] if group is not None else -1)
+        house_costs.append(square.get("house_cost", 0))
+        rents.extend(square_rents)
+
+    if "Jail" not in names:
+        raise ValueError("A board needs a square named Jail")
+    if SquareKind.GO_TO_JAIL not in kinds:
+        raise ValueError("A board needs a go_to_jail square")
+
+    return {
+        "name": definition.get("name", ""),
+        "names": names,
+        "groups": groups,
+        "kinds": kinds,
+        "prices": prices,
+        "group_index": group_index,
+        "house_costs": house_costs,
+        "rents": rents,
+    }
+
+
+def _write_cache(path: str, compiled: dict):
+    """Write a compiled board, replacing any previous file atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as cache_file:
+        pickle.dump(compiled, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+
+def load_compiled(path: str = DEFAULT_BOARD, cache_directory=CACHE_DIRECTORY):
+    """Return the compiled arrays of a board definition file, and the Property arguments of its squares.
+
+    The compiled board is cached in ``cache_directory`` under the hash of the
+    file content, so a process reads it back with one unpickling instead of
+    parsing and checking the definition, and in memory by path, so boards
+    built again in the same process only look at the file's modification time.
+
+    Args:
+        path (str): JSON or TOML board definition.
+        cache_directory (str): Directory of the compiled boards, or None to not
+            cache them on disk. A directory that cannot be written to is skipped.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == stat.st_mtime_ns and loaded[1] == stat.st_size:
+        return loaded[2], loaded[3]
+
+    with open(path, "rb") as definition_file:
+        content = definition_file.read()
+    compiled = None
+    cache_path = None
+    if cache_directory is not None:
+        digest = hashlib.sha256(content).hexdigest()
+        cache_path = os.path.join(cache_directory, f"{digest}-{COMPILED_VERSION}.pickle")
+        try:
+            with open(cache_path, "rb") as cache_file:
+                compiled = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            compiled = None
+
+    if compiled is None:
+        compiled = compile_definition(parse_definition(content, path))
+        if cache_path is not None:
+            try:
+                _write_cache(cache_path, compiled)
+            except OSError:
+                pass
+
+    squares = square_arguments(compiled)
+    _loaded[path] = (stat.st_mtime_ns, stat.st_size, compiled, squares)
+    return compiled, squares
+
+
+def square_arguments(compiled: dict):
+    """Return the Property arguments of every square of a compiled board.
+
+    Returns:
+        tuple: ``(name, purchase, kind, group, rents, house_cost)`` of every
+            square, with None where a square has no such value.
+    """
+    groups = compiled["groups"]
+    rents = compiled["rents"]
+    squares = []
+    for index, (name, kind, price, group, house_cost) in enumerate(zip(
+            compiled["names"], compiled["kinds"], compiled["prices"], compiled["group_index"],
+            compiled["house_costs"])):
+        kind = SquareKind(kind)
+        squares.append((
+            name, price or None, kind, groups[group] if group >= 0 else None,
+            tuple(rents[index * 6:index * 6 + 6]) if kind == SquareKind.STREET else None, house_cost or None,
+        ))
+    return tuple(squares)
+
+
+def synthetic_definition(size: int, group_size: int = 3):
+    """Return the definition of a large board for scaling tests.
+
+    The board starts with Go, has Jail a quarter of the way and Go To Jail at
+    three quarters, and between them repeats rows of chance, chest and tax
+    squares, railroads, utilities and streets in groups of ``group_size``
+    (at most 4). Railroads come in groups of 4 and utilities in pairs.
+    """
+    if size < 8:
+        raise ValueError("A synthetic board needs at least 8 squares")
+    pattern = ["street"] * group_size + ["chance", "railroad"] + ["street"] * group_size + ["chest", "utility", "tax"]
+    special = {0: {"name": "Go", "kind": "corner"}, size // 4: {"name": "Jail", "kind": "corner"},
+               3 * size // 4: {"name": "Go To Jail", "kind": "go_to_jail"}}
+    squares = []
+    counts = {"street": 0, "railroad": 0, "utility": 0}
+    for index in range(size):
+        if index in special:
+            squares.append(special[index])
+            continue
+        kind = pattern[index % len(pattern)]
+        square = {"name": f"{kind.title()} {index}", "kind": kind}
+        if kind == "street":
+            group = counts[kind] // group_size
+            price = 60 + 20 * (group % 18)
+            square.update(price=price, group=f"Group {group}", house_cost=50 * (1 + price // 100),
+                          rents=[price // 10, price // 2, 3 * price // 2, 4 * price, 5 * price, 6 * price])
+        elif kind == "railroad":
+            square.update(price=200, group=f"Railroad {counts[kind] // 4}")
+        elif kind == "utility":
+            square.update(price=150, group=f"Utility {counts[kind] // 2}")
+        if kind in counts:
+            counts[kind] += 1
+        squares.append(square)
+    return {"name": f"Synthetic {size}", "squares": squares}
@@ -1,26 +1,49 @@
+from .portfolio import Portfolio
 from .property_model import Property
 
 class Player:
-    def __init__(self, name: str):
+    __slots__ = ("name", "position", "money", "in_jail", "jail_turns", "bankrupt", "jail_cards", "portfolio",
+                 "strategy")
+
+    def __init__(self, name: str, strategy=None):
         self.name = name
         self.position = None
         self.money = 1500  # Standard starting money in Monopoly
         self.in_jail = False
         self.jail_turns = 0  # Track how many turns a player has been in jail
-        self.net_worth = 0
-        self.properties = []
+        self.bankrupt = False
+        # Get Out of Jail Free cards held: [(deck, card), ...]
+        self.jail_cards = []
+        # Owned properties and buildings with their running value
+        self.portfolio = Portfolio()
+        # Strategy consulted at the decision points of the game, the default one if None
+        self.strategy = strategy
+
+    @property
+    def square(self):
+        """Index of the square the player is on (0 is "Go")."""
+        if self.position is None:
+            return 0
+        return self.position.index
+
+    @property
+    def properties(self):
+        """Owned properties, in the order they were acquired."""
+        return list(self.portfolio)
+
+    @property
+    def net_worth(self):
+        """Money plus the printed price of the properties and the cost of the buildings."""
+        return self.money + self.portfolio.value
 
     def update_net_worth(self):
-        """Update the player's net worth."""
-        self.net_worth = self.money
-        # @todo Add properties to net worth
+        """Return the player's net worth, kept up to date by the portfolio."""
+        return self.net_worth
 
-    def add_property(self, property: Property):
+    def add_property(self, property: Property, mortgaged: bool = False):
         """Add a property to the player's properties."""
-        self.properties.append(property)
-        self.update_net_worth()
+        self.portfolio.add(property, mortgaged)
 
     def remove_property(self, property: Property):
         """Remove a property from the player's properties."""
-        self.properties.remove(property)
-        self.update_net_worth()
+        self.portfolio.remove(property)
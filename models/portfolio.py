@@ -0,0 +1,68 @@
+from .property_model import Property
+
+
+class Portfolio:
+    """Properties and buildings a player owns, with running totals.
+
+    The totals are updated on every change, so the value of the portfolio and
+    the cash it can raise are known without going over the properties.
+    """
+
+    __slots__ = ("properties", "group_counts", "value", "liquidation")
+
+    def __init__(self):
+        # Owned properties, in the order they were acquired: {property: mortgaged}
+        self.properties = {}
+        # Number of properties owned in every group: {group: count}
+        self.group_counts = {}
+        # Printed price of the properties plus the cost of the buildings
+        self.value = 0
+        # Cash raised by selling every building and mortgaging every property
+        self.liquidation = 0
+
+    def __len__(self):
+        return len(self.properties)
+
+    def __contains__(self, prop: Property):
+        return prop in self.properties
+
+    def __iter__(self):
+        return iter(self.properties)
+
+    def add(self, prop: Property, mortgaged: bool = False):
+        """Add a property, which may come mortgaged."""
+        self.properties[prop] = mortgaged
+        self.group_counts[prop.group] = self.group_counts.get(prop.group, 0) + 1
+        self.value += prop.purchase or 0
+        if not mortgaged:
+            self.liquidation += (prop.purchase or 0) // 2
+
+    def remove(self, prop: Property):
+        """Remove a property, without its buildings."""
+        mortgaged = self.properties.pop(prop)
+        self.group_counts[prop.group] -= 1
+        self.value -= prop.purchase or 0
+        if not mortgaged:
+            self.liquidation -= (prop.purchase or 0) // 2
+
+    def mortgaged(self, prop: Property):
+        """Whether an owned property is mortgaged."""
+        return self.properties[prop]
+
+    def mortgage(self, prop: Property):
+        self.properties[prop] = True
+        self.liquidation -= prop.purchase // 2
+
+    def unmortgage(self, prop: Property):
+        self.properties[prop] = False
+        self.liquidation += prop.purchase // 2
+
+    def add_buildings(self, prop: Property, count: int = 1):
+        """Add houses or a hotel built on a property at their cost."""
+        self.value += count * prop.house_cost
+        self.liquidation += count * (prop.house_cost // 2)
+
+    def remove_buildings(self, prop: Property, count: int = 1):
+        """Remove houses or a hotel sold back from a property."""
+        self.value -= count * prop.house_cost
+        self.liquidation -= count * (prop.house_cost // 2)
@@ -1,10 +1,35 @@
+from enum import IntEnum
+
+
+class SquareKind(IntEnum):
+    """Kind of square on the board"""
+
+    CORNER = 0
+    STREET = 1
+    RAILROAD = 2
+    UTILITY = 3
+    TAX = 4
+    CHANCE = 5
+    CHEST = 6
+    GO_TO_JAIL = 7
+
+
 class Property:
     """Define the attributes of a property"""
 
+    __slots__ = ("name", "purchase", "kind", "group", "rents", "house_cost")
+
     # Constructor
-    def __init__(self, name: str, purchase: int = None):
+    def __init__(self, name: str, purchase: int = None, kind: SquareKind = SquareKind.STREET, group: str = None,
+                 rents: tuple = None, house_cost: int = None):
         self.name = name
         self.purchase = purchase
+        self.kind = kind
+        # Color group, or "Railroad" and "Utility"
+        self.group = group
+        # Street rent with no houses, 1 to 4 houses and a hotel
+        self.rents = rents
+        self.house_cost = house_cost
 
     # Getter
     @property
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+SQLite registry of Monopoly simulation runs.
+
+Every run gets a unique id with its parameters, seed and code version. Its
+per-square landing counts and ordered dice counts are bulk inserted in one
+transaction, and the views used by the visualization scripts are indexed
+aggregate queries.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import uuid
+
+from game.version import cache_version, code_version, source_hash  # noqa: F401
+
+REGISTRY_FILE = "runs.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    rounds INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    seed INTEGER,
+    code_version TEXT,
+    params TEXT
+);
+CREATE TABLE IF NOT EXISTS property_counts (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    square INTEGER NOT NULL,
+    property_name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, square)
+);
+CREATE TABLE IF NOT EXISTS dice_counts (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    dice1 INTEGER NOT NULL,
+    dice2 INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, dice1, dice2)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_size ON runs(rounds, players);
+CREATE INDEX IF NOT EXISTS idx_property_counts_name ON property_counts(property_name, run_id);
+"""
+
+
+class RunRegistry:
+    """Runs and their counts in a SQLite database"""
+
+    def __init__(self, path=os.path.join("data", REGISTRY_FILE)):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def register_run(self, square_names, landings, dice, rounds, players, games=1, seed=None,
+                     version=None, params=None):
+        """Record a run and its counts in one transaction.
+
+        Args:
+            square_names (list): Property name of every square index.
+            landings (list): Landing count of every square index.
+            dice (list): Count of every ordered dice outcome (dice1 - 1) * 6 + (dice2 - 1).
+            rounds (int): Number of rounds in each game.
+            players (int): Number of players.
+            games (int): Number of games in the run.
+            seed (int): Seed of the run, if any.
+            version (str): Code version, the git revision if None.
+            params (dict): Other parameters of the run, stored as JSON.
+
+        Returns:
+            str: The unique id of the run.
+        """
+        run_id = uuid.uuid4().hex
+        created_at = datetime.datetime.now().isoformat(timespec="microseconds")
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, created_at, rounds, players, games, seed,
+                 version if version is not None else code_version(), json.dumps(params or {})),
+            )
+            self.connection.executemany(
+                "INSERT INTO property_counts VALUES (?, ?, ?, ?)",
+                [(run_id, square, name, count) for square, (name, count) in enumerate(zip(square_names, landings))],
+            )
+            self.connection.executemany(
+                "INSERT INTO dice_counts VALUES (?, ?, ?, ?)",
+                [(run_id, outcome // 6 + 1, outcome % 6 + 1, count) for outcome, count in enumerate(dice)],
+            )
+        return run_id
+
+    def runs(self):
+        """Return every run as a list of dicts."""
+        cursor = self.connection.execute("SELECT * FROM runs ORDER BY created_at")
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def property_rows(self):
+        """Return one (run_id, created_at, rounds, players, property_name, count) row per run and property name.
+
+        Squares sharing a name are added up, like the rows of the CSV file.
+        """
+        return self.connection.execute("""
+            SELECT runs.run_id, runs.created_at, runs.rounds * runs.games, runs.players, property_name, SUM(count)
+            FROM property_counts JOIN runs USING (run_id)
+            GROUP BY runs.run_id, property_name
+        """).fetchall()
+
+    def dice_rows(self):
+        """Return one (run_id, created_at, rounds, players, dice1, dice2, sum, count) row per run and combination.
+
+        Combinations are normalized so that (1, 6) and (6, 1) are the same, like the rows of the CSV file.
+        """
+        return self.connection.execute("""
+            SELECT runs.run_id, runs.created_at, runs.rounds * runs.games, runs.players,
+                   MIN(dice1, dice2) AS low, MAX(dice1, dice2) AS high, dice1 + dice2, SUM(count)
+            FROM dice_counts JOIN runs USING (run_id)
+            GROUP BY runs.run_id, low, high
+        """).fetchall()
+
+    def property_averages(self):
+        """Return {property_name: average landings per run}."""
+        return dict(self.connection.execute("""
+            SELECT property_name, AVG(total) FROM (
+                SELECT run_id, property_name, SUM(count) AS total
+                FROM property_counts GROUP BY run_id, property_name
+            ) GROUP BY property_name
+        """).fetchall())
+
+    def property_by_game_size(self):
+        """Return (property_name, game_size, average landings per run) rows, game_size being rounds * players."""
+        return self.connection.execute("""
+            SELECT property_name, size, AVG(total) FROM (
+                SELECT property_name, runs.rounds * runs.games * runs.players AS size, SUM(count) AS total
+                FROM property_counts JOIN runs USING (run_id) GROUP BY runs.run_id, property_name
+            ) GROUP BY property_name, size
+        """).fetchall()
+
+    def game_sizes(self):
+        """Return {(rounds, players): number of runs}, the rounds of a run being those of all its games."""
+        return {
+            (rounds, players): number for rounds, players, number in self.connection.execute(
+                "SELECT rounds * games, players, COUNT(*) FROM runs GROUP BY rounds * games, players"
+            )
+        }
+
+    def dice_averages(self):
+        """Return {(low, high): average count per run} of every combination, (1, 6) and (6, 1) being the same."""
+        return {
+            (low, high): average for low, high, average in self.connection.execute("""
+                SELECT low, high, AVG(total) FROM (
+                    SELECT MIN(dice1, dice2) AS low, MAX(dice1, dice2) AS high, SUM(count) AS total
+                    FROM dice_counts GROUP BY run_id, low, high
+                ) GROUP BY low, high
+            """)
+        }
+
+    def dice_sum_averages(self):
+        """Return {sum: average count per run and combination} of every dice sum, like the rows of the CSV file."""
+        return dict(self.connection.execute("""
+            SELECT low + high, AVG(total) FROM (
+                SELECT MIN(dice1, dice2) AS low, MAX(dice1, dice2) AS high, SUM(count) AS total
+                FROM dice_counts GROUP BY run_id, low, high
+            ) GROUP BY low + high ORDER BY low + high
+        """).fetchall())
+
+    def doubles_percentages(self):
+        """Return {run_id: percentage of rolls that were doubles}."""
+        return dict(self.connection.execute("""
+            SELECT run_id, 100.0 * SUM(CASE WHEN dice1 = dice2 THEN count ELSE 0 END) / SUM(count)
+            FROM dice_counts GROUP BY run_id HAVING SUM(count) > 0
+        """).fetchall())
+
+
+def load_frame(table, directory="data"):
+    """Load the rows of the registry in a directory as a DataFrame with the CSV columns and run_id.
+
+    Args:
+        table (str): "property_stats" or "dice_stats".
+        directory (str): Statistics directory holding the registry.
+    """
+    import pandas as pd
+
+    with RunRegistry(os.path.join(directory, REGISTRY_FILE)) as registry:
+        if table == "property_stats":
+            columns = ["run_id", "timestamp", "rounds", "players", "property_name", "count"]
+            rows = registry.property_rows()
+        else:
+            columns = ["run_id", "timestamp", "rounds", "players", "dice1", "dice2", "sum", "count"]
+            rows = registry.dice_rows()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def has_registry(directory="data"):
+    """Whether the statistics directory holds a run registry."""
+    return os.path.isfile(os.path.join(directory, REGISTRY_FILE))
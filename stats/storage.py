@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Columnar storage of Monopoly statistics.
+
+Every run is written once as typed columns in its own partition file, under a
+directory per table and per day:
+
+    columnar/property_stats/date=2025-03-20/<run_id>.parquet
+    columnar/dice_stats/date=2025-03-20/<run_id>.parquet
+
+Parquet is used when pyarrow is installed, compressed NumPy ``.npz`` files
+otherwise. Readers only open the partitions of the days they ask for and only
+the columns they need.
+"""
+
+import datetime
+import os
+import sys
+import uuid
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+COLUMNAR_DIR = "columnar"
+PROPERTY_TABLE = "property_stats"
+DICE_TABLE = "dice_stats"
+
+# Column types of each table, rows match the CSV files
+SCHEMAS = {
+    PROPERTY_TABLE: {
+        "timestamp": "datetime64[s]",
+        "rounds": np.int32,
+        "players": np.int16,
+        "property_name": str,
+        "count": np.int64,
+    },
+    DICE_TABLE: {
+        "timestamp": "datetime64[s]",
+        "rounds": np.int32,
+        "players": np.int16,
+        "dice1": np.int8,
+        "dice2": np.int8,
+        "sum": np.int8,
+        "count": np.int64,
+    },
+}
+
+
+def _extension():
+    return ".parquet" if pq is not None else ".npz"
+
+
+def _write_partition(path, columns):
+    """Write a dict of typed column arrays to one partition file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file so readers never see half a partition
+    temporary = path + ".tmp"
+    if path.endswith(".parquet"):
+        pq.write_table(pa.table(columns), temporary)
+    else:
+        with open(temporary, "wb") as partition:
+            np.savez_compressed(partition, **columns)
+    os.replace(temporary, path)
+
+
+def _read_partition(path, columns=None):
+    """Read the columns of one partition file as a dict of arrays."""
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ImportError(f"pyarrow is required to read {path}")
+        table = pq.read_table(path, columns=columns)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    with np.load(path) as partition:
+        names = columns if columns is not None else partition.files
+        return {name: partition[name] for name in names}
+
+
+def _typed_columns(table, rows, timestamp, rounds, players):
+    """Build the typed columns of a table from its per-row values."""
+    schema = SCHEMAS[table]
+    count = len(rows["count"])
+    columns = {
+        "timestamp": np.full(count, np.datetime64(timestamp, "s")),
+        "rounds": np.full(count, rounds, dtype=schema["rounds"]),
+        "players": np.full(count, players, dtype=schema["players"]),
+    }
+    for name, values in rows.items():
+        columns[name] = np.array(values, dtype=schema[name])
+    return columns
+
+
+def write_run(landing_stats, dice_stats, rounds, players, directory="data", timestamp=None, run_id=None):
+    """Write the statistics of one run as one partition per table.
+
+    Args:
+        landing_stats (dict): Landing counts keyed by property name.
+        dice_stats (dict): Dice combination counts keyed by (dice1, dice2).
+        rounds (int): Number of rounds of the run.
+        players (int): Number of players of the run.
+        directory (str): Statistics directory holding the columnar directory.
+        timestamp (datetime.datetime): Time of the run, now if None.
+        run_id (str): Name of the partition files, random if None.
+
+    Returns:
+        str: The run id.
+    """
+    timestamp = timestamp or datetime.datetime.now().replace(microsecond=0)
+    run_id = run_id or uuid.uuid4().hex
+    partition = f"date={timestamp.date().isoformat()}"
+
+    tables = {
+        PROPERTY_TABLE: {
+            "property_name": list(landing_stats.keys()),
+            "count": list(landing_stats.values()),
+        },
+        DICE_TABLE: {
+            "dice1": [combo[0] for combo in dice_stats],
+            "dice2": [combo[1] for combo in dice_stats],
+            "sum": [combo[0] + combo[1] for combo in dice_stats],
+            "count": list(dice_stats.values()),
+        },
+    }
+    for table, rows in tables.items():
+        path = os.path.join(directory, COLUMNAR_DIR, table, partition, run_id + _extension())
+        _write_partition(path, _typed_columns(table, rows, timestamp, rounds, players))
+
+    return run_id
+
+
+def partitions(table, directory="data", since=None, until=None):
+    """List the partition files of a table, for the days between since and until included."""
+    table_dir = os.path.join(directory, COLUMNAR_DIR, table)
+    if not os.path.isdir(table_dir):
+        return []
+
+    paths = []
+    for partition in sorted(os.listdir(table_dir)):
+        day = datetime.date.fromisoformat(partition.split("=", 1)[1])
+        if (since is not None and day < since) or (until is not None and day > until):
+            continue
+        partition_dir = os.path.join(table_dir, partition)
+        paths.extend(
+            os.path.join(partition_dir, name)
+            for name in sorted(os.listdir(partition_dir))
+            if name.endswith((".parquet", ".npz"))
+        )
+    return paths
+
+
+def has_columnar(directory="data"):
+    """Whether the statistics directory holds columnar data."""
+    return os.path.isdir(os.path.join(directory, COLUMNAR_DIR))
+
+
+def sources(directory="data", csv_file=None):
+    """Return the statistics sources present in a directory, in the order the charts prefer them.
+
+    Args:
+        csv_file (str): Name of the CSV file of the table, such as "property_stats.csv".
+    """
+    from stats.registry import has_registry
+
+    present = []
+    if has_registry(directory):
+        present.append("run registry")
+    if has_columnar(directory):
+        present.append("columnar partitions")
+    if csv_file is not None and os.path.isfile(os.path.join(directory, csv_file)):
+        present.append(csv_file)
+    return present
+
+
+def read_table(table, directory="data", columns=None, since=None, until=None):
+    """Read a table into a DataFrame with the columns of the CSV file.
+
+    Args:
+        table (str): PROPERTY_TABLE or DICE_TABLE.
+        directory (str): Statistics directory holding the columnar directory.
+        columns (list): Columns to read, all if None.
+        since (datetime.date): First day to read.
+        until (datetime.date): Last day to read.
+    """
+    import pandas as pd
+
+    names = columns if columns is not None else list(SCHEMAS[table])
+    chunks = {name: [] for name in names}
+    for path in partitions(table, directory, since, until):
+        for name, values in _read_partition(path, names).items():
+            chunks[name].append(values)
+
+    data = {}
+    for name in names:
+        if chunks[name]:
+            data[name] = np.concatenate(chunks[name])
+        else:
+            data[name] = np.array([], dtype=SCHEMAS[table][name])
+    return pd.DataFrame(data)
+
+
+def convert_csv(directory="data"):
+    """Write the runs of the CSV files as columnar partitions, one per timestamp.
+
+    Returns:
+        int: The number of runs converted.
+    """
+    import pandas as pd
+
+    properties = pd.read_csv(os.path.join(directory, "property_stats.csv"))
+    dice = pd.read_csv(os.path.join(directory, "dice_stats.csv"))
+    dice_runs = {key: group for key, group in dice.groupby(["timestamp", "rounds", "players"])}
+
+    converted = 0
+    for (timestamp, rounds, players), group in properties.groupby(["timestamp", "rounds", "players"]):
+        landing_stats = dict(zip(group["property_name"], group["count"]))
+        dice_group = dice_runs.get((timestamp, rounds, players))
+        dice_stats = {}
+        if dice_group is not None:
+            dice_stats = dict(zip(zip(dice_group["dice1"], dice_group["dice2"]), dice_group["count"]))
+
+        write_run(landing_stats, dice_stats, int(rounds), int(players), directory,
+                  timestamp=datetime.datetime.fromisoformat(timestamp))
+        converted += 1
+
+    return converted
+
+
+if __name__ == "__main__":
+    # Convert the CSV history of a statistics directory
+    stats_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    print(f"Converted {convert_csv(stats_dir)} runs to columnar partitions in {stats_dir}")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Incremental summary of the Monopoly statistics CSV files.
+
+The summary keeps running sums, counts and sums of squares of the landing and
+dice counts, together with a watermark (the byte offset read so far) for each
+CSV file. Updating it only reads the rows appended since the last update, and
+charts are drawn from the summary however long the history is.
+"""
+
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_FILE = "summary.json"
+SUMMARY_VERSION = 1
+PROPERTY_CSV = "property_stats.csv"
+DICE_CSV = "dice_stats.csv"
+
+# Width in percent of the doubles percentage histogram bins
+DOUBLES_BIN_WIDTH = 0.5
+
+
+def _moments(values):
+    """Return [sum, count, sum of squares] of values."""
+    values = np.asarray(values, dtype=float)
+    return [float(values.sum()), int(len(values)), float((values ** 2).sum())]
+
+
+def _add(target, key, moments):
+    """Add [sum, count, sum of squares] moments to target[key]."""
+    current = target.setdefault(key, [0.0, 0, 0.0])
+    for i, value in enumerate(moments):
+        current[i] += value
+
+
+class StatsSummary:
+    """Running aggregates of the property and dice statistics"""
+
+    def __init__(self, path=os.path.join("data", SUMMARY_FILE)):
+        self.path = os.fspath(path)
+        self.reset()
+        if os.path.exists(path):
+            with open(path) as summary_file:
+                data = json.load(summary_file)
+            if data.get("version") == SUMMARY_VERSION:
+                self.data = data
+
+    def reset(self):
+        """Forget every aggregate and watermark."""
+        self.data = {
+            "version": SUMMARY_VERSION,
+            # {csv file name: {"offset": bytes read, "columns": header}}
+            "watermarks": {},
+            # {property_name: [sum, count, sum of squares]}
+            "properties": {},
+            # {property_name: {game_size: [sum, count, sum of squares]}}
+            "property_by_game_size": {},
+            # {"rounds,players": number of games}
+            "game_sizes": {},
+            # {"dice1,dice2": [sum, count, sum of squares]}
+            "dice": {},
+            # {dice sum: [sum, count, sum of squares]}
+            "dice_sums": {},
+            # Doubles percentage of each game: moments and fixed width histogram
+            "doubles": [0.0, 0, 0.0],
+            "doubles_histogram": [0] * int(100 / DOUBLES_BIN_WIDTH + 1),
+        }
+
+    def save(self):
+        """Write the summary, replacing the previous one atomically."""
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as summary_file:
+            json.dump(self.data, summary_file)
+        os.replace(temporary, self.path)
+
+    def _new_rows(self, directory, name):
+        """Read the rows of a CSV file appended since the watermark and move the watermark."""
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            return None
+
+        watermark = self.data["watermarks"].get(name)
+        size = os.path.getsize(path)
+        if watermark is not None and size < watermark["offset"]:
+            # The file was replaced or truncated, start over
+            raise ValueError(f"{path} is shorter than its watermark")
+
+        with open(path, newline="") as csv_file:
+            if watermark is None:
+                columns = csv_file.readline().strip().split(",")
+            else:
+                columns = watermark["columns"]
+                csv_file.seek(watermark["offset"])
+            # Stop at the last complete row, a run may still be writing
+            chunk = csv_file.read()
+            end = chunk.rfind("\n") + 1
+            offset = csv_file.tell() - len(chunk[end:].encode())
+
+        self.data["watermarks"][name] = {"offset": offset, "columns": columns}
+        if not chunk[:end].strip():
+            return None
+
+        return pd.read_csv(io.StringIO(chunk[:end]), header=None, names=columns)
+
+    def update(self, directory="data"):
+        """Fold the rows appended to the CSV files since the last update.
+
+        Returns:
+            int: The number of new rows.
+        """
+        try:
+            properties = self._new_rows(directory, PROPERTY_CSV)
+            dice = self._new_rows(directory, DICE_CSV)
+        except ValueError:
+            self.reset()
+            return self.update(directory)
+
+        new_rows = 0
+        if properties is not None:
+            self.fold_properties(properties)
+            new_rows += len(properties)
+        if dice is not None:
+            self.fold_dice(dice)
+            new_rows += len(dice)
+        return new_rows
+
+    def fold_properties(self, df):
+        """Add property rows to the aggregates."""
+        game_size = df['rounds'] * df['players']
+        for name, counts in df.groupby('property_name')['count']:
+            _add(self.data["properties"], name, _moments(counts))
+        for (name, size), counts in df.groupby([df['property_name'], game_size])['count']:
+            _add(self.data["property_by_game_size"].setdefault(name, {}), str(int(size)), _moments(counts))
+
+        games = df.drop_duplicates(['timestamp', 'rounds', 'players'])
+        for (rounds, players), number in games.groupby(['rounds', 'players']).size().items():
+            key = f"{int(rounds)},{int(players)}"
+            self.data["game_sizes"][key] = self.data["game_sizes"].get(key, 0) + int(number)
+
+    def fold_dice(self, df):
+        """Add dice rows to the aggregates."""
+        for (dice1, dice2), counts in df.groupby(['dice1', 'dice2'])['count']:
+            _add(self.data["dice"], f"{int(dice1)},{int(dice2)}", _moments(counts))
+        for dice_sum, counts in df.groupby('sum')['count']:
+            _add(self.data["dice_sums"], str(int(dice_sum)), _moments(counts))
+
+        # Doubles percentage of each game
+        doubles = df['count'].where(df['dice1'] == df['dice2'], 0)
+        games = pd.DataFrame({'timestamp': df['timestamp'], 'rounds': df['rounds'], 'players': df['players'],
+                              'total': df['count'], 'doubles': doubles})
+        games = games.groupby(['timestamp', 'rounds', 'players'])[['total', 'doubles']].sum()
+        games = games[games['total'] > 0]
+        percentages = (games['doubles'] / games['total'] * 100).to_numpy()
+
+        moments = _moments(percentages)
+        for i in range(3):
+            self.data["doubles"][i] += moments[i]
+        bins = np.rint(percentages / DOUBLES_BIN_WIDTH).astype(int)
+        histogram = self.data["doubles_histogram"]
+        for index, number in zip(*np.unique(bins, return_counts=True)):
+            histogram[index] += int(number)
+
+    @staticmethod
+    def _frame(aggregates, key_names):
+        """Turn {key: [sum, count, sum of squares]} into a DataFrame with the mean and standard deviation."""
+        rows = []
+        for key, (total, count, squares) in aggregates.items():
+            mean = total / count
+            variance = max(squares / count - mean ** 2, 0.0)
+            rows.append(list(key) + [mean, np.sqrt(variance), count])
+        return pd.DataFrame(rows, columns=key_names + ['count', 'std', 'rows'])
+
+    def property_means(self):
+        """Return the mean count of every property as a Series."""
+        frame = self._frame({(name,): value for name, value in self.data["properties"].items()}, ['property_name'])
+        return frame.set_index('property_name')['count']
+
+    def property_by_game_size(self):
+        """Return the mean count of every property and game size as a DataFrame."""
+        aggregates = {
+            (name, int(size)): value
+            for name, sizes in self.data["property_by_game_size"].items()
+            for size, value in sizes.items()
+        }
+        return self._frame(aggregates, ['property_name', 'game_size'])[['property_name', 'game_size', 'count']]
+
+    def game_sizes(self):
+        """Return {(rounds, players): number of games}."""
+        return {
+            tuple(int(part) for part in key.split(",")): number
+            for key, number in self.data["game_sizes"].items()
+        }
+
+    def dice_means(self):
+        """Return the mean count of every dice combination as a 6x6 matrix."""
+        matrix = np.zeros((6, 6))
+        for key, (total, count, _) in self.data["dice"].items():
+            dice1, dice2 = (int(part) for part in key.split(","))
+            matrix[dice1 - 1, dice2 - 1] = total / count
+        return matrix
+
+    def dice_sum_means(self):
+        """Return the mean count of every dice sum as a Series."""
+        frame = self._frame({(int(key),): value for key, value in self.data["dice_sums"].items()}, ['sum'])
+        return frame.sort_values('sum').set_index('sum')['count']
+
+    def doubles_percentages(self):
+        """Return (mean, bin centers, games per bin) of the doubles percentage of the games."""
+        total, count, _ = self.data["doubles"]
+        histogram = np.array(self.data["doubles_histogram"])
+        centers = np.arange(len(histogram)) * DOUBLES_BIN_WIDTH
+        return (total / count if count else 0.0), centers, histogram
+
+
+def update_summary(directory="data"):
+    """Load the summary of a statistics directory, fold the new CSV rows and save it."""
+    summary = StatsSummary(os.path.join(directory, SUMMARY_FILE))
+    if summary.update(directory):
+        summary.save()
+    return summary
@@ -4,35 +4,50 @@ Visualize Monopoly dice statistics from CSV data.
 """
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+# Make the simulation packages importable when run from the stats directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats.registry import REGISTRY_FILE, RunRegistry
+from stats.storage import DICE_TABLE, has_columnar, read_table, sources
+from stats.summary import update_summary
+
 # Set style
 sns.set(style="whitegrid")
 plt.rcParams["figure.figsize"] = (14, 8)
 
-def load_dice_data():
-    """Load dice statistics from CSV file."""
+def load_dice_data(columns=None, since=None):
+    """Load dice statistics from the columnar store or the CSV file."""
+    if has_columnar("data"):
+        return read_table(DICE_TABLE, "data", columns=columns, since=since)
+
     csv_path = os.path.join("data", "dice_stats.csv")
     if not os.path.exists(csv_path):
         print(f"Error: Could not find {csv_path}")
         return None
     
-    return pd.read_csv(csv_path)
+    return pd.read_csv(csv_path, usecols=columns)
 
 def visualize_dice_combinations(df):
     """Create a heatmap of dice combinations."""
-    # Create a pivot table for the dice combinations
-    dice_matrix = np.zeros((6, 6))
-    
     # Group by dice1 and dice2 and calculate the mean count
-    for _, row in df.iterrows():
-        dice1 = int(row['dice1']) - 1  # Adjust for 0-indexing
-        dice2 = int(row['dice2']) - 1  # Adjust for 0-indexing
-        dice_matrix[dice1, dice2] = row['count']
+    means = df.groupby(['dice1', 'dice2'])['count'].mean()
     
+    # Fill the matrix for the dice combinations, adjusting for 0-indexing
+    dice_matrix = np.zeros((6, 6))
+    dice1 = means.index.get_level_values('dice1').to_numpy(dtype=int) - 1
+    dice2 = means.index.get_level_values('dice2').to_numpy(dtype=int) - 1
+    dice_matrix[dice1, dice2] = means.to_numpy()
+    
+    plot_dice_combinations(dice_matrix)
+
+def plot_dice_combinations(dice_matrix):
+    """Create a heatmap of a 6x6 matrix of dice combination counts."""
     # Create the heatmap
     plt.figure(figsize=(12, 10))
     ax = sns.heatmap(dice_matrix, annot=True, fmt=".1f", cmap="YlOrRd", 
@@ -55,7 +70,11 @@ def visualize_dice_combinations(df):
 def visualize_dice_sums(df):
     """Create a bar plot of dice sum frequencies."""
     # Group by sum and calculate the mean count
-    sum_counts = df.groupby('sum')['count'].mean().reset_index()
+    plot_dice_sums(df.groupby('sum')['count'].mean())
+
+def plot_dice_sums(sum_means):
+    """Create a bar plot of the mean count of every dice sum."""
+    sum_counts = sum_means.rename('count').rename_axis('sum').reset_index()
     
     # Create the plot
     plt.figure(figsize=(14, 8))
@@ -93,22 +112,30 @@ def visualize_dice_sums(df):
 
 def visualize_doubles_percentage(df):
     """Create a pie chart showing the percentage of doubles rolled."""
-    # Add a column to identify doubles
-    df['is_double'] = df['dice1'] == df['dice2']
+    # Count of the rolls that were doubles, zero for the other rows
+    game_keys = ['run_id'] if 'run_id' in df.columns else ['timestamp', 'rounds', 'players']
+    rolls = df[game_keys].assign(
+        total_rolls=df['count'],
+        doubles_count=df['count'].where(df['dice1'] == df['dice2'], 0),
+    )
     
-    # Group by game (timestamp, rounds, players) and calculate doubles percentage
-    game_stats = df.groupby(['timestamp', 'rounds', 'players']).apply(
-        lambda x: pd.Series({
-            'total_rolls': x['count'].sum(),
-            'doubles_count': x[x['is_double']]['count'].sum(),
-        })
-    ).reset_index()
+    # Group by game (run_id, or timestamp, rounds, players without one) and calculate doubles percentage
+    game_stats = rolls.groupby(game_keys)[['total_rolls', 'doubles_count']].sum().reset_index()
     
     game_stats['doubles_percentage'] = (game_stats['doubles_count'] / game_stats['total_rolls']) * 100
     
     # Calculate the average doubles percentage
     avg_doubles_pct = game_stats['doubles_percentage'].mean()
-    
+    plot_doubles_percentage(avg_doubles_pct, game_stats['doubles_percentage'])
+
+def plot_doubles_percentage(avg_doubles_pct, percentages, weights=None):
+    """Create a pie chart of the average doubles percentage and a histogram of the games.
+
+    Args:
+        avg_doubles_pct (float): Average doubles percentage of the games.
+        percentages (array): Doubles percentage of every game, or histogram bin centers.
+        weights (array): Number of games in every bin when percentages are bin centers.
+    """
     # Create the pie chart
     plt.figure(figsize=(10, 10))
     plt.pie([avg_doubles_pct, 100 - avg_doubles_pct], 
@@ -128,7 +155,7 @@ def visualize_doubles_percentage(df):
     
     # Create a histogram of doubles percentages across games
     plt.figure(figsize=(12, 8))
-    sns.histplot(game_stats['doubles_percentage'], kde=True, bins=10)
+    sns.histplot(x=percentages, weights=weights, kde=True, bins=10)
     plt.axvline(x=16.67, color='r', linestyle='--', label='Expected (16.67%)')
     plt.title('Distribution of Doubles Percentages Across Games', fontsize=18)
     plt.xlabel('Doubles Percentage', fontsize=14)
@@ -147,6 +174,38 @@ def main():
     # Create the data directory if it doesn't exist
     os.makedirs(os.path.join("data"), exist_ok=True)
     
+    present = sources("data", "dice_stats.csv")
+    if len(present) > 1:
+        print(f"Warning: plotting the {present[0]} only, ignoring the {' and '.join(present[1:])} in data")
+
+    # The run registry answers with aggregate queries, without loading its rows
+    if present and present[0] == "run registry":
+        with RunRegistry(os.path.join("data", REGISTRY_FILE)) as registry:
+            dice_matrix = np.zeros((6, 6))
+            for (low, high), average in registry.dice_averages().items():
+                dice_matrix[low - 1, high - 1] = average
+            sum_means = pd.Series(registry.dice_sum_averages(), name='count').rename_axis('sum')
+            percentages = np.array(list(registry.doubles_percentages().values()))
+        plot_dice_combinations(dice_matrix)
+        plot_dice_sums(sum_means)
+        plot_doubles_percentage(percentages.mean() if len(percentages) else 0.0, percentages)
+        print("All dice visualizations complete!")
+        return
+
+    # The CSV history is folded into a summary incrementally
+    if "columnar partitions" not in present:
+        if not os.path.exists(os.path.join("data", "dice_stats.csv")):
+            print(f"Error: Could not find {os.path.join('data', 'dice_stats.csv')}")
+            return
+        summary = update_summary("data")
+        plot_dice_combinations(summary.dice_means())
+        plot_dice_sums(summary.dice_sum_means())
+        avg_doubles_pct, centers, histogram = summary.doubles_percentages()
+        played = histogram > 0
+        plot_doubles_percentage(avg_doubles_pct, centers[played], histogram[played])
+        print("All dice visualizations complete!")
+        return
+
     # Load the data
     df = load_dice_data()
     if df is None:
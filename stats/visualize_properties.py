@@ -4,28 +4,104 @@ Visualize Monopoly property statistics from CSV data.
 """
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+# Make the simulation packages importable when run from the stats directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats.registry import REGISTRY_FILE, RunRegistry
+from stats.storage import PROPERTY_TABLE, has_columnar, read_table, sources
+from stats.summary import update_summary
+
 # Set style
 sns.set(style="whitegrid")
 plt.rcParams["figure.figsize"] = (14, 8)
 
-def load_property_data():
-    """Load property statistics from CSV file."""
+# Define the Monopoly board layout with 11 properties on each side
+# Standard Monopoly board has 40 spaces (10 on each side with corners)
+BOARD_LAYOUT = [
+    # Bottom row (left to right)
+    ["Go", "Mediteranean Avenue", "Community Chest", "Baltic Avenue", "Income Tax", 
+     "Reading Railroad", "Oriental Avenue", "Chance", "Vermont Avenue", "Connecticut Avenue", "Jail"],
+    # Left column (bottom to top)
+    ["Boardwalk", "", "", "", "", "", "", "", "", "", "St. Charles Place"],
+    ["Luxury Tax", "", "", "", "", "", "", "", "", "", "States Avenue"],
+    ["Park Place", "", "", "", "", "", "", "", "", "", "Virginia Avenue"],
+    ["Chance", "", "", "", "", "", "", "", "", "", "Pennsylvania Railroad"],
+    ["Short Line", "", "", "", "", "", "", "", "", "", "St. James Place"],
+    ["Pennsylvania Avenue", "", "", "", "", "", "", "", "", "", "Community Chest"],
+    ["Community Chest", "", "", "", "", "", "", "", "", "", "Tennessee Avenue"],
+    ["North Carolina Avenue", "", "", "", "", "", "", "", "", "", "New York Avenue"],
+    ["Pacific Avenue", "", "", "", "", "", "", "", "", "", "Kentucky Avenue"],
+    # Top row (right to left)
+    ["Go To Jail", "Marvin Gardens", "Ventnor Avenue", "Atlantic Avenue", "B. & O. Railroad", 
+     "Illinois Avenue", "Indiana Avenue", "Chance", "Water Works", "Free Parking", ""]
+]
+
+# Board cells of every property name, and where to write it, computed once
+LAYOUT_NAMES = np.array(BOARD_LAYOUT)
+LAYOUT_ROWS, LAYOUT_COLS = np.nonzero(LAYOUT_NAMES != "")
+LAYOUT_LABELS = LAYOUT_NAMES[LAYOUT_ROWS, LAYOUT_COLS]
+# Text position and rotation of the labels, rotated on the bottom and top rows, shifted inwards on the columns
+LAYOUT_ROW_LABEL = (LAYOUT_ROWS == 0) | (LAYOUT_ROWS == 10)
+LAYOUT_X = LAYOUT_COLS + np.select([LAYOUT_ROW_LABEL, LAYOUT_COLS == 0], [0.5, 0.7], 0.3)
+LAYOUT_Y = LAYOUT_ROWS + np.select([LAYOUT_ROWS == 0, LAYOUT_ROWS == 10], [0.7, 0.3], 0.5)
+LAYOUT_ROTATION = np.where(LAYOUT_ROW_LABEL, 45, 0)
+
+def load_property_data(columns=None, since=None):
+    """Load property statistics from the columnar store or the CSV file."""
+    if has_columnar("data"):
+        return read_table(PROPERTY_TABLE, "data", columns=columns, since=since)
+
     csv_path = os.path.join("data", "property_stats.csv")
     if not os.path.exists(csv_path):
         print(f"Error: Could not find {csv_path}")
         return None
     
-    return pd.read_csv(csv_path)
+    return pd.read_csv(csv_path, usecols=columns)
+
+def game_sizes(df):
+    """Count the games in df by (rounds, players)."""
+    game_keys = ['run_id'] if 'run_id' in df.columns else ['timestamp']
+    games = df[game_keys + ['rounds', 'players']].drop_duplicates()
+    return {
+        (int(rounds), int(players)): int(number)
+        for (rounds, players), number in games.groupby(['rounds', 'players']).size().items()
+    }
+
+def theoretical_landing_frequency(sizes):
+    """Expected landings per property from the Markov chain, averaged over games of the given sizes.
+
+    Args:
+        sizes (dict): Number of games keyed by (rounds, players).
+    """
+    try:
+        from models.board import Board
+        from game.markov import expected_landing_stats
+    except ImportError:
+        return None
+
+    board = Board()
+    expected = pd.DataFrame([expected_landing_stats(board, rounds, players) for rounds, players in sizes])
+    weights = np.array(list(sizes.values()), dtype=float)
+    return expected.mul(weights, axis=0).sum() / weights.sum()
 
 def visualize_landing_frequency(df):
     """Create a bar plot of landing frequencies for all properties."""
-    # Group by property_name and calculate the mean count
-    property_avg = df.groupby('property_name')['count'].mean().reset_index()
+    plot_landing_frequency(df.groupby('property_name')['count'].mean(), game_sizes(df))
+
+def plot_landing_frequency(property_means, sizes):
+    """Create a bar plot of the mean landings of every property.
+
+    Args:
+        property_means (pd.Series): Mean count keyed by property name.
+        sizes (dict): Number of games keyed by (rounds, players), for the theoretical frequency.
+    """
+    property_avg = property_means.rename('count').rename_axis('property_name').reset_index()
     property_avg = property_avg.sort_values('count', ascending=False)
     
     # Create the plot
@@ -40,6 +116,14 @@ def visualize_landing_frequency(df):
     # Add count values to the end of each bar
     for i, v in enumerate(property_avg['count']):
         ax.text(v + 0.5, i, f"{v:.1f}", va='center')
+
+    # Add theoretical landing frequency
+    theoretical = theoretical_landing_frequency(sizes)
+    if theoretical is not None:
+        expected = theoretical.reindex(property_avg['property_name']).to_numpy()
+        plt.plot(expected, range(len(expected)), 'r|', markersize=14, markeredgewidth=2,
+                 label='Theoretical (Markov chain)')
+        plt.legend()
     
     # Save the figure
     plt.tight_layout()
@@ -50,39 +134,13 @@ def visualize_landing_frequency(df):
 
 def visualize_property_heatmap(df):
     """Create a heatmap of the Monopoly board with landing frequencies."""
-    # Define the Monopoly board layout with 11 properties on each side
-    # Standard Monopoly board has 40 spaces (10 on each side with corners)
-    board_layout = [
-        # Bottom row (left to right)
-        ["Go", "Mediteranean Avenue", "Community Chest", "Baltic Avenue", "Income Tax", 
-         "Reading Railroad", "Oriental Avenue", "Chance", "Vermont Avenue", "Connecticut Avenue", "Jail"],
-        # Left column (bottom to top)
-        ["Boardwalk", "", "", "", "", "", "", "", "", "", "St. Charles Place"],
-        ["Luxury Tax", "", "", "", "", "", "", "", "", "", "States Avenue"],
-        ["Park Place", "", "", "", "", "", "", "", "", "", "Virginia Avenue"],
-        ["Chance", "", "", "", "", "", "", "", "", "", "Pennsylvania Railroad"],
-        ["Short Line", "", "", "", "", "", "", "", "", "", "St. James Place"],
-        ["Pennsylvania Avenue", "", "", "", "", "", "", "", "", "", "Community Chest"],
-        ["Community Chest", "", "", "", "", "", "", "", "", "", "Tennessee Avenue"],
-        ["North Carolina Avenue", "", "", "", "", "", "", "", "", "", "New York Avenue"],
-        ["Pacific Avenue", "", "", "", "", "", "", "", "", "", "Kentucky Avenue"],
-        # Top row (right to left)
-        ["Go To Jail", "Marvin Gardens", "Ventnor Avenue", "Atlantic Avenue", "B. & O. Railroad", 
-         "Illinois Avenue", "Indiana Avenue", "Chance", "Water Works", "Free Parking", ""]
-    ]
-    
+    plot_property_heatmap(df.groupby('property_name')['count'].mean())
+
+def plot_property_heatmap(property_means):
+    """Create a heatmap of the Monopoly board with the mean landings of every property."""
     # Create a matrix for the heatmap
     heatmap_data = np.zeros((11, 11))
-    
-    # Group by property_name and calculate the mean count
-    property_avg = df.groupby('property_name')['count'].mean().to_dict()
-    
-    # Fill the heatmap data
-    for i in range(11):
-        for j in range(11):
-            property_name = board_layout[i][j]
-            if property_name in property_avg:
-                heatmap_data[i, j] = property_avg[property_name]
+    heatmap_data[LAYOUT_ROWS, LAYOUT_COLS] = property_means.reindex(LAYOUT_LABELS).fillna(0).to_numpy()
     
     # Create the heatmap
     plt.figure(figsize=(16, 14))
@@ -90,26 +148,8 @@ def visualize_property_heatmap(df):
                      linewidths=.5, cbar_kws={'label': 'Average Landing Frequency'})
     
     # Add property names as annotations
-    for i in range(11):
-        for j in range(11):
-            if board_layout[i][j]:
-                # Adjust text position and rotation based on position on board
-                if i == 0:  # Bottom row
-                    ax.text(j + 0.5, i + 0.7, board_layout[i][j], 
-                            ha='center', va='center', fontsize=7, 
-                            color='black', rotation=45)
-                elif i == 10:  # Top row
-                    ax.text(j + 0.5, i + 0.3, board_layout[i][j], 
-                            ha='center', va='center', fontsize=7, 
-                            color='black', rotation=45)
-                elif j == 0:  # Left column
-                    ax.text(j + 0.7, i + 0.5, board_layout[i][j], 
-                            ha='center', va='center', fontsize=7, 
-                            color='black', rotation=0)
-                elif j == 10:  # Right column
-                    ax.text(j + 0.3, i + 0.5, board_layout[i][j], 
-                            ha='center', va='center', fontsize=7, 
-                            color='black', rotation=0)
+    for x, y, label, rotation in zip(LAYOUT_X, LAYOUT_Y, LAYOUT_LABELS, LAYOUT_ROTATION):
+        ax.text(x, y, label, ha='center', va='center', fontsize=7, color='black', rotation=rotation)
     
     # Add title
     plt.title('Monopoly Board Landing Frequency Heatmap', fontsize=18)
@@ -128,9 +168,17 @@ def visualize_by_game_size(df):
     
     # Group by property_name and game_size
     grouped = df.groupby(['property_name', 'game_size'])['count'].mean().reset_index()
-    
+    plot_by_game_size(grouped, df.groupby('property_name')['count'].mean())
+
+def plot_by_game_size(grouped, property_means):
+    """Plot the mean landings by game size of the 10 most landed on properties.
+
+    Args:
+        grouped (pd.DataFrame): Mean count by property_name and game_size.
+        property_means (pd.Series): Mean count keyed by property name.
+    """
     # Get the top 10 most landed on properties
-    top_properties = df.groupby('property_name')['count'].mean().nlargest(10).index.tolist()
+    top_properties = property_means.nlargest(10).index.tolist()
     filtered_df = grouped[grouped['property_name'].isin(top_properties)]
     
     # Create the plot
@@ -155,6 +203,36 @@ def main():
     # Create the data directory if it doesn't exist
     os.makedirs(os.path.join("data"), exist_ok=True)
     
+    present = sources("data", "property_stats.csv")
+    if len(present) > 1:
+        print(f"Warning: plotting the {present[0]} only, ignoring the {' and '.join(present[1:])} in data")
+
+    # The run registry answers with aggregate queries, without loading its rows
+    if present and present[0] == "run registry":
+        with RunRegistry(os.path.join("data", REGISTRY_FILE)) as registry:
+            property_means = pd.Series(registry.property_averages(), name='count').rename_axis('property_name')
+            sizes = registry.game_sizes()
+            by_game_size = pd.DataFrame(registry.property_by_game_size(),
+                                        columns=['property_name', 'game_size', 'count'])
+        plot_landing_frequency(property_means, sizes)
+        plot_property_heatmap(property_means)
+        plot_by_game_size(by_game_size, property_means)
+        print("All property visualizations complete!")
+        return
+
+    # The CSV history is folded into a summary incrementally
+    if "columnar partitions" not in present:
+        if not os.path.exists(os.path.join("data", "property_stats.csv")):
+            print(f"Error: Could not find {os.path.join('data', 'property_stats.csv')}")
+            return
+        summary = update_summary("data")
+        property_means = summary.property_means()
+        plot_landing_frequency(property_means, summary.game_sizes())
+        plot_property_heatmap(property_means)
+        plot_by_game_size(summary.property_by_game_size(), property_means)
+        print("All property visualizations complete!")
+        return
+
     # Load the data
     df = load_property_data()
     if df is None:
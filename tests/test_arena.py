@@ -0,0 +1,64 @@
+import io
+
+from game.arena import SEQUENCE, ArenaWriter, StatsArena, monitor
+from game.runner import run_parallel, run_shard, shard_seeds
+from game.simulation import run_simulation
+from game.stats import GameStats
+
+
+def test_arena_counts():
+    """Test that published counts add up in a snapshot, and are read through an attached arena."""
+    with StatsArena.create(40, slots=2) as arena:
+        stats = GameStats(40)
+        writer = ArenaWriter(arena, 1)
+        stats.landings[5] += 3
+        stats.dice[0] += 2
+        writer.publish(stats, rounds=2, turns=8)
+        stats.landings[5] += 1
+        writer.publish(stats, games=1)
+
+        attached = StatsArena.attach(arena.name)
+        snapshot = attached.snapshot()
+        assert (snapshot.games, snapshot.rounds, snapshot.turns) == (1, 2, 8)
+        assert snapshot.stats == stats
+        assert not attached.finished
+        attached.close()
+
+        # Each publication is one completed update of the slot
+        assert arena.rows[1, SEQUENCE] == 4
+        assert not arena.rows[0].any()
+
+
+def test_parallel_arena():
+    """Test that shards count in place in an arena, giving the totals their returned stats would."""
+    with StatsArena.create(40, slots=3) as arena:
+        stats = run_parallel(games=6, rounds=10, players=2, master_seed=1, shards=3, max_workers=2, arena=arena)
+        snapshot = arena.snapshot()
+        assert (snapshot.games, snapshot.rounds, snapshot.turns) == (6, 60, 120)
+    shards = [run_shard(seed, 2, 10, 2) for seed in shard_seeds(1, 3)]
+    assert stats == snapshot.stats == sum(shards)
+
+
+def test_simulation_arena():
+    """Test that a single-process run publishes its games as it goes, long games included."""
+    with StatsArena.create(40) as arena:
+        result = run_simulation(2500, 2, seed=3, games=2, arena=arena)
+        snapshot = arena.snapshot()
+    assert snapshot.stats == result["stats"]
+    assert (snapshot.games, snapshot.rounds, snapshot.turns) == (2, 5000, 10000)
+
+
+def test_monitor():
+    """Test that the monitor stops with the final counts once the run is over."""
+    arena = StatsArena.create(40)
+    ArenaWriter(arena).publish(GameStats(40, dice=[1] * 36), games=1, rounds=1, turns=4)
+    attached = StatsArena.attach(arena.name)
+    # Marked as over by the creator, as closing it does
+    arena.header[3] = 1
+    assert attached.finished
+    attached.close()
+
+    out = io.StringIO()
+    monitor(arena.name, interval=0.01, out=out)
+    arena.close()
+    assert out.getvalue().startswith("1 games, 1 rounds, 4 turns, 36 rolls")
@@ -0,0 +1,47 @@
+from game.batch import GameBatch
+from game.rules import dice_outcome, roll_tables
+from models.board import Board
+
+
+def test_roll_tables():
+    """Test single roll outcomes for the jail and doubles rules."""
+    board = Board()
+    size = len(board)
+    next_state, landed, again, speeding = roll_tables(board)
+
+    # A double from Go moves and rolls again
+    key = 0 * 36 + dice_outcome(2, 2)
+    assert next_state[key] == 4 and landed[key] == 4 and again[key]
+
+    # Rolling onto Go To Jail ends the turn in jail, counted as a Jail landing
+    start = board.go_to_jail_position - 7
+    key = start * 36 + dice_outcome(3, 4)
+    assert next_state[key] == size and landed[key] == board.jail_position and not again[key]
+
+    # A player in jail without a double stays there until the third failed roll
+    key = size * 36 + dice_outcome(1, 2)
+    assert next_state[key] == size + 1 and landed[key] == size
+    key = (size + 2) * 36 + dice_outcome(1, 2)
+    assert next_state[key] == board.jail_position + 3
+
+    # The third double sends the player to jail
+    next_state, landed, again, speeding = roll_tables(board, last_roll=True)
+    key = 0 * 36 + dice_outcome(2, 2)
+    assert next_state[key] == size and landed[key] == 4 and speeding[key]
+
+
+def test_game_batch():
+    """Test that a batch counts one landing or jail roll per roll."""
+    board = Board()
+    batch = GameBatch(board, num_games=50, num_players=3, seed=1)
+    landings = batch.run(20)
+
+    assert landings.shape == (50, len(board))
+    assert landings[:, board.go_to_jail_position].sum() == 0
+    assert (batch.dice.sum(axis=(1, 2)) >= 20 * 3).all()
+    assert (batch.position[batch.in_jail] == board.jail_position).all()
+    assert sum(batch.get_dice_stats().values()) == batch.dice.sum()
+
+    # Same seed, same games
+    again = GameBatch(board, num_games=50, num_players=3, seed=1)
+    assert (again.run(20) == landings).all()
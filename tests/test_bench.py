@@ -0,0 +1,37 @@
+from benchmarks.bench import BENCHMARKS, MEMORY_SLACK_KIB, compare, load_baseline, main, measure
+
+
+def test_compare():
+    """Test that only drops in speed or growth of memory beyond the thresholds are regressions."""
+    baseline = {"a": {"ops_per_second": 1000.0, "peak_kib": 1000.0}, "b": {"ops_per_second": 10.0, "peak_kib": 1.0}}
+    results = {
+        "a": {"ops_per_second": 700.0, "peak_kib": 1000.0 * 1.5 + MEMORY_SLACK_KIB + 1},
+        "b": {"ops_per_second": 9.0, "peak_kib": 2.0},
+        "new": {"ops_per_second": 1.0, "peak_kib": 1.0},
+    }
+    assert compare(results, baseline, threshold=0.25, memory_threshold=0.5) == [
+        ("a", "ops_per_second", 1000.0, 700.0),
+        ("a", "peak_kib", 1000.0, 1000.0 * 1.5 + MEMORY_SLACK_KIB + 1),
+    ]
+    assert compare(results, baseline, threshold=0.5, memory_threshold=1.0) == []
+
+    # The calibrated speed is compared when both sides have it
+    baseline["b"]["calibrated_ops"] = 2.0
+    results["b"]["calibrated_ops"] = 1.0
+    assert compare(results, baseline, threshold=0.25, memory_threshold=1.0) == [
+        ("a", "ops_per_second", 1000.0, 700.0),
+        ("b", "calibrated_ops", 2.0, 1.0),
+    ]
+
+
+def test_measure_and_baseline(tmp_path, capsys):
+    """Test measuring a benchmark and comparing it with a saved baseline."""
+    assert {"board_construction", "full_game", "save_statistics", "visualize_property_heatmap"} <= set(BENCHMARKS)
+    metrics = measure("board_traverse", repeat=1)
+    assert metrics["ops_per_second"] > 0 and metrics["calibrated_ops"] > 0 and metrics["peak_kib"] >= 0
+
+    path = str(tmp_path / "baseline.json")
+    assert main(["board_traverse", "--save", "--repeat", "1", "--baseline", path]) == 0
+    assert set(load_baseline(path)) == {"board_traverse"}
+    assert main(["board_traverse", "--repeat", "1", "--baseline", path, "--threshold", "0.99"]) == 0
+    assert "No regressions" in capsys.readouterr().out
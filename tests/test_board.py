@@ -28,6 +28,7 @@ def test_board():
         "Income Tax",
         "Reading Railroad",
         "Oriental Avenue",
+        "Chance",
         "Vermont Avenue",
         "Connecticut Avenue",
         "Jail",
@@ -43,3 +44,21 @@ def test_board():
         current_position = current_position.next
         assert current_position.value.name == expected_name
 
+
+def test_board_index():
+    """Test index-based access and modular traversal of the board."""
+    board = Board()
+
+    assert len(board) == len(board.squares)
+    assert board[0] is board.start
+
+    # Every square links to the next index, wrapping back to "Go"
+    for index, node in enumerate(board.squares):
+        assert node.index == index
+        assert node.next is board[(index + 1) % len(board)]
+
+    # Traversal wraps around the board
+    last = board[len(board) - 1]
+    assert board.traverse(1, last) is board.start
+    assert board.traverse(5).value.name == "Reading Railroad"
+    assert board.traverse(len(board) + 5).value.name == "Reading Railroad"
@@ -0,0 +1,131 @@
+import json
+import os
+
+import pytest
+
+import models.board_file as board_file
+from game.cards import CardDecks
+from game.dice import Dice
+from game.game_logic import Game
+from models.board import Board
+from models.board_file import compile_definition, load_compiled, synthetic_definition
+from models.player import Player
+from models.property_model import SquareKind
+
+SMALL_BOARD = """
+name = "Small"
+
+[[squares]]
+name = "Go"
+kind = "corner"
+
+[[squares]]
+name = "Old Kent Road"
+price = 60
+group = "Brown"
+rents = [2, 10, 30, 90, 160, 250]
+house_cost = 50
+
+[[squares]]
+name = "Jail"
+kind = "corner"
+
+[[squares]]
+name = "Kings Cross Station"
+kind = "railroad"
+price = 200
+group = "Railroad"
+
+[[squares]]
+name = "Go To Jail"
+kind = "go_to_jail"
+
+[[squares]]
+name = "Chance"
+kind = "chance"
+"""
+
+
+def test_standard_board_file():
+    """Test that the default board is read from its file, with the values of every square."""
+    board = Board()
+    assert board.name == "Standard"
+    assert len(board) == 40
+    assert board.jail_position == 10
+    assert board.go_to_jail_position == 30
+    boardwalk = board.squares[board.positions["Boardwalk"][0]].value
+    assert (boardwalk.purchase, boardwalk.group, boardwalk.house_cost) == (400, "Dark Blue", 200)
+    assert boardwalk.rents == (50, 200, 600, 1400, 1700, 2000)
+    reading = board.squares[5].value
+    assert (reading.kind, reading.purchase, reading.rents, reading.house_cost) == (SquareKind.RAILROAD, 200, None, None)
+    assert board.squares[0].value.purchase is None
+    assert board.squares[-1].next is board.start
+
+
+def test_compiled_cache(tmp_path, monkeypatch):
+    """Test that a compiled board is cached by content hash and read back without compiling it."""
+    path = tmp_path / "small.toml"
+    path.write_text(SMALL_BOARD)
+    cache = tmp_path / "cache"
+
+    compiled, squares = load_compiled(str(path), str(cache))
+    assert compiled["names"][:3] == ["Go", "Old Kent Road", "Jail"]
+    assert squares[3] == ("Kings Cross Station", 200, SquareKind.RAILROAD, "Railroad", None, None)
+    assert len(os.listdir(cache)) == 1
+
+    # A new process reads the cache file
+    board_file._loaded.clear()
+    monkeypatch.setattr(board_file, "compile_definition", lambda definition: pytest.fail("compiled again"))
+    assert load_compiled(str(path), str(cache))[0] == compiled
+
+    # A changed file is compiled again, under a new hash
+    monkeypatch.undo()
+    path.write_text(SMALL_BOARD.replace("price = 60", "price = 80"))
+    os.utime(path, ns=(0, 0))
+    assert load_compiled(str(path), str(cache))[1][1][1] == 80
+    assert len(os.listdir(cache)) == 2
+
+
+def test_small_board_game(tmp_path):
+    """Test a game on a board without most of the squares the cards name."""
+    path = tmp_path / "small.toml"
+    path.write_text(SMALL_BOARD)
+    board = Board(str(path))
+    game = Game(board, dice=Dice(3), cards=CardDecks(board, 3))
+    players = [Player("Player 1"), Player("Player 2")]
+    for player in players:
+        player.position = game.game_start()
+    game.play_game(players, max_rounds=50)
+    assert sum(game.stats.landings) > 0
+
+
+def test_synthetic_board(tmp_path):
+    """Test that a large synthetic board compiles and can be played."""
+    path = tmp_path / "large.json"
+    path.write_text(json.dumps(synthetic_definition(2000)))
+    board = Board(str(path))
+    assert len(board) == 2000
+    assert board.jail_position == 500
+    assert board.go_to_jail_position == 1500
+
+    game = Game(board, dice=Dice(1), cards=CardDecks(board, 1))
+    players = [Player(f"Player {i + 1}") for i in range(4)]
+    for player in players:
+        player.position = game.game_start()
+    game.play_game(players, max_rounds=100)
+
+
+@pytest.mark.parametrize("squares, message", [
+    ([{"name": "Jail", "kind": "corner"}], "go_to_jail"),
+    ([{"name": "Jail", "kind": "corner"}, {"name": "Go To Jail", "kind": "go_to_jail"},
+      {"name": "Tram", "kind": "tram"}], "unknown kind"),
+    ([{"name": "Jail", "kind": "corner"}, {"name": "Go To Jail", "kind": "go_to_jail"},
+      {"name": "Lane", "price": 60, "group": "Brown"}], "rents"),
+    ([{"name": "Jail", "kind": "corner"}, {"name": "Go To Jail", "kind": "go_to_jail"}]
+     + [{"name": f"Line {i}", "kind": "railroad", "price": 200, "group": "Railroad"} for i in range(5)],
+     "more than 4"),
+])
+def test_invalid_definitions(squares, message):
+    """Test that invalid boards are reported."""
+    with pytest.raises(ValueError, match=message):
+        compile_definition({"squares": squares})
@@ -0,0 +1,96 @@
+import random
+
+from game.cards import CHANCE_CARDS, JAIL, CardDecks, Deck, card_outcomes, card_tables
+from game.dice import ReplayDice
+from game.events import CallbackSink, EventType
+from game.game_logic import Game
+from models.board import Board
+from models.player import Player
+
+
+def test_card_tables():
+    """Test the compiled card destinations of the Chance squares."""
+    board = Board()
+    size = len(board)
+    destination, deck_size = card_tables(board)
+    chance = board.positions["Chance"]
+
+    assert len(board) == 40 and board[7].value.name == "Chance"
+    assert [deck_size[square] for square in chance] == [16, 16, 16]
+    assert deck_size[0] == 0
+
+    def moves(text, square):
+        return {destination[slot * size + square] for slot, card in enumerate(CHANCE_CARDS) if card.text.startswith(text)}
+
+    assert moves("Go Back 3", 7) == {4}
+    assert moves("Go to Jail", 7) == {JAIL}
+    assert moves("Advance to the nearest Railroad", 7) == {15}
+    assert moves("Advance to the nearest Railroad", 36) == {5}
+    assert moves("Advance to the nearest Utility", 22) == {28}
+    assert moves("Bank pays", 22) == {22}
+
+    outcomes = card_outcomes(board)
+    assert all(abs(sum(probability for probability, _ in square) - 1) < 1e-12 for square in outcomes)
+    # Going back 3 from the last Chance square draws a Community Chest card
+    assert dict((target, probability) for probability, target in outcomes[36])[0] == 1 / 16 + 1 / 16 / 16
+
+
+def test_deck_cycles():
+    """Test that a deck is drawn in a shuffled cycle and kept cards leave it."""
+    deck = Deck("Chance", CHANCE_CARDS, Board(), random.Random(1))
+    first = [deck.draw() for _ in range(16)]
+    kept = [card for card in first if deck.cards[card].keep]
+    assert sorted(first) == list(range(16))
+    assert [deck.draw() for _ in range(15)] == [card for card in first if card not in kept]
+
+    deck.put_back(kept[0])
+    assert list(deck.order)[-1] == kept[0]
+
+
+def test_cards_in_game():
+    """Test drawing cards in a game with money and using a Get Out of Jail Free card."""
+    board = Board()
+    cards = CardDecks(board, seed=2)
+    events = []
+    game = Game(board, CallbackSink(lambda event_type, player, data: events.append((event_type, data))),
+                ReplayDice([(3, 4), (1, 2)]), cards)
+    player, other = Player("Test"), Player("Other")
+    game.start_economy([player, other])
+    player.position = board.start
+
+    deck = cards.chance
+    jail_card = next(card for card in range(16) if deck.cards[card].keep)
+    deck.order.remove(jail_card)
+    deck.order.appendleft(jail_card)
+    game.player_turn(player)
+    assert (EventType.CARD, {"deck": "Chance", "text": "Get Out of Jail Free"}) in events
+    assert player.jail_cards == [(deck, jail_card)]
+    assert game.stats.landings[7] == 1
+
+    game.go_to_jail(player)
+    game.player_turn(player)
+    assert not player.in_jail and player.square == board.jail_position + 3
+    assert player.jail_cards == [] and deck.order[-1] == jail_card
+
+    money = player.money
+    birthday = next(card for card in cards.chest.cards if card.each_player > 0)
+    game.economy.apply_card(player, birthday)
+    assert (player.money, other.money) == (money + 10, 1490)
+
+
+def test_decks_keep_their_cards(monkeypatch):
+    """Test that Get Out of Jail Free cards held at the end of a game or at bankruptcy go back to their decks."""
+    import game.simulation
+
+    decks = []
+
+    def recording_decks(*args, **kwargs):
+        decks.append(CardDecks(*args, **kwargs))
+        return decks[-1]
+
+    monkeypatch.setattr(game.simulation, "CardDecks", recording_decks)
+    game.simulation.run_simulation(30, 4, seed=1, games=300)
+    game.simulation.run_simulation(200, 4, seed=1, games=30, economy=True)
+    for cards in decks:
+        assert len(cards.chance.order) == 16
+        assert len(cards.chest.order) == 16
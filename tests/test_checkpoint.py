@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from game import checkpoint as checkpoint_module
+from game.simulation import run_simulation
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(monkeypatch, saves: int):
+    """Make the run stop right after writing its n-th checkpoint."""
+    save = checkpoint_module.Checkpointer.save
+
+    def save_then_stop(self, state):
+        save(self, state)
+        if self.saved == saves:
+            raise Interrupted
+    monkeypatch.setattr(checkpoint_module.Checkpointer, "save", save_then_stop)
+
+
+@pytest.mark.parametrize("economy", [False, True])
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch, economy):
+    """Test that a run resumed from a checkpoint ends with the same results as an uninterrupted one."""
+    settings = dict(rounds=150, players=3, seed=11, games=4, economy=economy)
+    expected = run_simulation(**settings)
+
+    path = str(tmp_path / "run.checkpoint")
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 5)
+        with pytest.raises(Interrupted):
+            run_simulation(**settings, checkpoint=path, checkpoint_rounds=70)
+    assert os.path.exists(path)
+
+    result = run_simulation(**settings, checkpoint=path, checkpoint_rounds=70, resume=True)
+    assert result["stats"] == expected["stats"]
+    assert result["convergence"].landings.mean == expected["convergence"].landings.mean
+    assert result.get("wins") == expected.get("wins")
+    assert not os.path.exists(path)
+
+
+def test_resume_other_run(tmp_path, monkeypatch):
+    """Test that a checkpoint is not resumed by a run with other parameters."""
+    path = str(tmp_path / "run.checkpoint")
+    interrupt_after(monkeypatch, 1)
+    with pytest.raises(Interrupted):
+        run_simulation(100, 2, seed=1, checkpoint=path, checkpoint_rounds=10)
+    with pytest.raises(ValueError):
+        run_simulation(100, 2, seed=2, checkpoint=path, resume=True)
@@ -0,0 +1,53 @@
+import statistics
+
+import pytest
+
+from game.convergence import ConvergenceTracker, RunningStats
+from game.simulation import run_simulation
+from game.stats import GameStats
+
+
+def test_running_stats():
+    """Test the running mean and variance against the statistics module."""
+    samples = [[1.0, 4.0], [2.0, 8.0], [4.0, 3.0], [7.0, 5.0]]
+    running = RunningStats(2)
+    for sample in samples:
+        running.add(sample)
+
+    for i in range(2):
+        column = [sample[i] for sample in samples]
+        assert abs(running.mean[i] - statistics.mean(column)) < 1e-12
+        assert abs(running.variance()[i] - statistics.variance(column)) < 1e-12
+
+    low, high = running.confidence_intervals()[0]
+    assert low < running.mean[0] < high
+
+
+def test_convergence_tracker():
+    """Test landing frequencies per game and the stopping rule."""
+    tracker = ConvergenceTracker(2)
+    tracker.add(GameStats(2, [1, 3]))
+    assert tracker.landings.mean == [0.25, 0.75]
+    assert not tracker.converged(1.0)
+
+    for _ in range(9):
+        tracker.add(GameStats(2, [1, 3]))
+    assert tracker.converged(0.01)
+
+
+def test_run_simulation_tolerance():
+    """Test that a simulation stops once the landing frequencies converged."""
+    result = run_simulation(50, 2, seed=3, games=None, tolerance=0.01, min_games=5)
+
+    tracker = result["convergence"]
+    assert result["games"] == tracker.games >= 5
+    assert tracker.max_half_width() < 0.01
+    assert sum(result["stats"].landings) == sum(result["landing_stats"].values())
+
+
+def test_run_simulation_without_end():
+    """Test that runs which could never end are refused."""
+    with pytest.raises(ValueError, match="games"):
+        run_simulation(50, 2, games=None)
+    with pytest.raises(ValueError, match="rounds"):
+        run_simulation(0, 2, games=None, tolerance=0.01)
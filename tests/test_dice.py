@@ -0,0 +1,46 @@
+import pytest
+
+from game.cards import CardDecks
+from game.dice import Dice, RecordingDice, ReplayDice
+from game.game_logic import Game
+from models.board import Board
+from models.player import Player
+
+
+def play(dice, rounds=50):
+    """Play a two player game with the dice and return its counts."""
+    board = Board()
+    game = Game(board, dice=dice, cards=CardDecks(board, 0))
+    players = [Player("A"), Player("B")]
+    for player in players:
+        player.position = game.game_start()
+    for _ in range(rounds):
+        game.play_round(players)
+    return game.stats
+
+
+def test_seeded_dice():
+    """Test that seeded dice roll the same sequence across block refills."""
+    first = Dice(3, block_size=7)
+    second = Dice(3, block_size=100)
+    rolls = [first.roll() for _ in range(50)]
+    assert rolls == [second.roll() for _ in range(50)]
+    assert all(total == dice1 + dice2 and 1 <= dice1 <= 6 and 1 <= dice2 <= 6 for dice1, dice2, total in rolls)
+
+    first.seed(3)
+    assert first.roll() == rolls[0]
+
+
+def test_record_and_replay():
+    """Test that replaying a recorded game gives the same counts."""
+    recording = RecordingDice(Dice(11))
+    stats = play(recording)
+    assert len(recording.history) == stats.total_rolls
+    assert play(ReplayDice(recording.history)) == stats
+
+    replay = ReplayDice([(6, 6)])
+    assert replay.roll() == (6, 6, 12)
+    with pytest.raises(IndexError):
+        replay.roll()
+    with pytest.raises(ValueError):
+        ReplayDice([(0, 7)])
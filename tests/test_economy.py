@@ -0,0 +1,100 @@
+from game.dice import Dice, ReplayDice
+from game.economy import BANK, HOTEL, HOUSES, SALARY, Economy
+from game.game_logic import Game
+from models.board import Board
+from models.player import Player
+
+
+def square(board, name):
+    return board.positions[name][0]
+
+
+def test_rent_levels():
+    """Test that rent follows group ownership and buildings."""
+    board = Board()
+    owner, visitor = Player("Owner"), Player("Visitor")
+    economy = Economy(board, [owner, visitor])
+    baltic = square(board, "Baltic Avenue")
+
+    economy.buy(owner, baltic)
+    assert economy.rent(baltic, 7) == 4
+    assert owner.properties == [board[baltic].value]
+
+    economy.buy(owner, square(board, "Mediteranean Avenue"))
+    assert economy.monopolies(owner) == [economy.group[baltic]]
+    assert economy.rent(baltic, 7) == 8
+
+    for houses in range(1, HOTEL + 1):
+        assert economy.build(baltic)
+        assert economy.rent(baltic, 7) == (20, 60, 180, 320, 450)[houses - 1]
+    assert economy.houses_left == HOUSES
+
+    economy.land(visitor, baltic, 7)
+    assert (owner.money, visitor.money) == (1500 - 120 - 5 * 50 + 450, 1500 - 450)
+
+
+def test_railroads_and_utilities():
+    """Test that railroad and utility rent depends on how many are owned."""
+    board = Board()
+    owner = Player("Owner")
+    economy = Economy(board, [owner])
+    electric = square(board, "Electric Company")
+    reading = square(board, "Reading Railroad")
+
+    economy.buy(owner, reading)
+    economy.buy(owner, electric)
+    assert (economy.rent(reading, 8), economy.rent(electric, 8)) == (25, 32)
+
+    economy.buy(owner, square(board, "Short Line"))
+    economy.buy(owner, square(board, "Water Works"))
+    assert (economy.rent(reading, 8), economy.rent(electric, 8)) == (50, 80)
+
+    economy.mortgage(reading)
+    assert economy.rent(reading, 8) == 0
+
+
+def test_bankruptcy():
+    """Test that a player who cannot pay hands everything to their creditor."""
+    board = Board()
+    owner, visitor = Player("Owner"), Player("Visitor")
+    economy = Economy(board, [owner, visitor])
+    boardwalk = square(board, "Boardwalk")
+    economy.buy(owner, boardwalk)
+    economy.buy(owner, square(board, "Park Place"))
+    economy.buy(visitor, square(board, "Baltic Avenue"))
+    while economy.build(boardwalk) and economy.houses[boardwalk] < HOTEL:
+        pass
+
+    visitor.money = 100
+    assert not economy.pay(visitor, economy.rent(boardwalk, 2), owner)
+    assert visitor.bankrupt and visitor.money == 0
+    assert economy.owner[square(board, "Baltic Avenue")] == economy.player_index[owner]
+    # Nothing was mortgaged, since that could not have covered the rent
+    assert economy.mortgages[economy.player_index[owner]] == 0
+    assert economy.finished and economy.winner() is owner
+
+
+def test_salary_and_full_game():
+    """Test passing Go and playing seeded games to the end."""
+    board = Board()
+    game = Game(board, dice=ReplayDice([(1, 3)]))
+    player = Player("Test")
+    player.position = board[len(board) - 1]
+    game.start_economy([player])
+    game.player_turn(player)
+    assert player.money == 1500 + SALARY - 60
+
+    for seed in range(5):
+        game = Game(board, dice=Dice(seed))
+        players = [Player(f"Player {i + 1}") for i in range(3)]
+        for player in players:
+            player.position = game.game_start()
+        winner, rounds = game.play_game(players, max_rounds=300)
+
+        economy = game.economy
+        assert all(player.money >= 0 for player in players)
+        assert (winner is not None) == (sum(not player.bankrupt for player in players) == 1)
+        for index, player in enumerate(players):
+            owned = [board[square].value for square in range(len(board)) if economy.owner[square] == index]
+            assert sorted(owned, key=id) == sorted(player.properties, key=id)
+        assert all(economy.houses[square] == 0 for square in range(len(board)) if economy.owner[square] == BANK)
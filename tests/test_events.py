@@ -0,0 +1,65 @@
+import io
+
+from game.dice import Dice
+from game.events import BufferedTextSink, CallbackSink, EventType
+from game.game_logic import Game
+from models.board import Board
+from models.player import Player
+
+
+def test_callback_sink():
+    """Test that a game hands its events to a callback."""
+    events = []
+    board = Board()
+    game = Game(board, CallbackSink(lambda event_type, player, data: events.append((event_type, data))), Dice(5))
+    player = Player("Test")
+    player.position = board.start
+
+    for _ in range(50):
+        game.take_turn(player)
+
+    rolls = [data for event_type, data in events if event_type is EventType.ROLLED]
+    assert len(rolls) == sum(game.get_dice_stats().values())
+    assert all(data["total"] == data["dice1"] + data["dice2"] for data in rolls)
+
+    game.move_player(player, (board.go_to_jail_position - player.square) % len(board))
+    assert events[-2] == (EventType.MOVED, {"square": "Go To Jail", "index": board.go_to_jail_position})
+    assert events[-1] == (EventType.JAILED, {"reason": "go_to_jail"})
+
+
+def test_buffered_text_sink():
+    """Test that text is only written once the buffer is full or flushed."""
+    stream = io.StringIO()
+    sink = BufferedTextSink(stream, buffer_lines=3)
+    player = Player("Test")
+
+    sink.emit(EventType.ROLLED, player, dice1=2, dice2=3, total=5)
+    sink.emit(EventType.MOVED, player, square="Baltic Avenue", index=3)
+    assert stream.getvalue() == ""
+
+    sink.emit(EventType.JAILED, player, reason="doubles")
+    sink.emit(EventType.STAYED, player, jail_turns=1, max_jail_turns=3)
+    assert stream.getvalue().splitlines() == [
+        "Test rolled a 2 and a 3 for a total of 5",
+        "Test landed on Baltic Avenue",
+        "Test rolled 3 doubles in a row and is going to jail!",
+    ]
+
+    sink.flush()
+    assert stream.getvalue().endswith("(Turn 1/3)\n")
+
+
+def test_jail_limit_messages():
+    """Test that the jail messages give the jail limit of the game."""
+    stream = io.StringIO()
+    sink = BufferedTextSink(stream)
+    game = Game(Board(), sink, Dice(2), max_jail_turns=2)
+    players = [Player("Player 1"), Player("Player 2")]
+    for player in players:
+        player.position = game.game_start()
+    game.play_game(players, max_rounds=300)
+    sink.flush()
+
+    text = stream.getvalue()
+    assert "(Turn 1/2)" in text and "in Jail for 2 turns" in text
+    assert "/3)" not in text and "for 3 turns" not in text
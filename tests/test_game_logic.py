@@ -0,0 +1,31 @@
+from game.game_logic import Game
+from models.board import Board
+from models.player import Player
+from models.property_model import SquareKind
+
+
+def test_board_square_index():
+    """Test the square kind and name indexes built by the board."""
+    board = Board()
+
+    assert board[board.jail_position].value.name == "Jail"
+    assert board[board.go_to_jail_position].value.name == "Go To Jail"
+    assert board.kinds[board.go_to_jail_position] == SquareKind.GO_TO_JAIL
+    assert board.kinds[5] == SquareKind.RAILROAD
+    assert len(board.positions["Community Chest"]) == 3
+    assert len(board.positions["Chance"]) == 3
+
+
+def test_go_to_jail_square():
+    """Landing on Go To Jail sends the player to Jail and counts a Jail landing."""
+    board = Board()
+    game = Game(board)
+    player = Player("Test")
+    player.position = board.start
+
+    current_property = game.move_player(player, board.go_to_jail_position)
+
+    assert current_property.name == "Jail"
+    assert player.square == board.jail_position
+    assert player.in_jail
+    assert game.get_landing_stats() == {"Jail": 1}
@@ -0,0 +1,33 @@
+import numpy as np
+
+from game import markov
+from models.board import Board
+
+
+def test_transition_matrices():
+    """Test that turn transitions are probabilities and are cached."""
+    board = Board()
+    turn, landings = markov.transition_matrices(board)
+
+    assert turn.shape == (len(board) + 3, len(board) + 3)
+    assert np.allclose(turn.sum(axis=1), 1)
+    assert (landings[:, board.go_to_jail_position] == 0).all()
+    assert markov.transition_matrices(board)[0] is turn
+
+
+def test_landing_probabilities():
+    """Test the stationary and finite horizon landing counts."""
+    board = Board()
+    probabilities = markov.landing_probabilities(board)
+
+    assert np.isclose(probabilities.sum(), 1)
+    assert probabilities.argmax() == board.jail_position
+
+    # Cards that advance to Illinois Avenue make it more likely than its neighbour
+    assert probabilities[board.positions["Illinois Avenue"][0]] > probabilities[board.positions["Indiana Avenue"][0]]
+
+    # First turn from "Go": one landing per roll plus a Jail landing for a third double,
+    # fewer when a card drawn after a double sends the player to jail
+    first_turn = markov.expected_landings(board, 1)
+    assert 1 + 1 / 6 < first_turn.sum() < 1 + 1 / 6 + 1 / 36 + 1 / 216
+    assert np.allclose(markov.expected_landings(board, 5, players=3), 3 * markov.expected_landings(board, 5))
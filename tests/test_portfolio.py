@@ -0,0 +1,51 @@
+import pytest
+
+from game.dice import Dice
+from game.economy import BANK
+from game.game_logic import Game
+from models.board import Board, PropertyNode
+from models.player import Player
+from models.property_model import Property
+
+
+def recomputed(economy, player):
+    """Net worth and liquidation value of a player, computed from the economy arrays."""
+    value = liquidation = 0
+    for square, node in enumerate(economy.board.squares):
+        if economy.owner[square] != economy.player_index[player]:
+            continue
+        prop = node.value
+        value += prop.purchase + economy.houses[square] * (prop.house_cost or 0)
+        liquidation += economy.houses[square] * ((prop.house_cost or 0) // 2)
+        if not economy.mortgaged[square]:
+            liquidation += prop.purchase // 2
+    return player.money + value, liquidation
+
+
+def test_running_totals():
+    """Test that the portfolio totals match a recomputation throughout seeded games."""
+    board = Board()
+    for seed in range(3):
+        game = Game(board, dice=Dice(seed))
+        players = [Player(f"Player {i + 1}") for i in range(3)]
+        for player in players:
+            player.position = game.game_start()
+        game.start_economy(players)
+        for _ in range(200):
+            game.play_round(players)
+            for player in players:
+                assert (player.net_worth, player.portfolio.liquidation) == recomputed(game.economy, player)
+                assert len(player.portfolio) == sum(owner == game.economy.player_index[player]
+                                                    for owner in game.economy.owner)
+            if game.economy.finished:
+                break
+        assert all(owner == BANK or not players[owner].bankrupt for owner in game.economy.owner)
+
+
+def test_slots():
+    """Test that the models keep no per-instance dictionary."""
+    prop = Property("Baltic Avenue", 60)
+    for obj in (Player("Test"), prop, PropertyNode(prop)):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unknown = 1
@@ -0,0 +1,48 @@
+import pstats
+
+from game.profiling import PHASES, Instrumentation, PhaseTimer
+from game.simulation import QUIET, run_simulation
+from main import main
+
+
+def test_phase_timer():
+    """Test that nested phases pause the phase they were entered from."""
+    ticks = iter(range(100))
+    timer = PhaseTimer(clock=lambda: next(ticks))  # started at 0
+    timer.enter("movement")  # 1
+    timer.enter("stats")  # 2
+    timer.exit()  # 3
+    timer.exit()  # 4
+    timer.stop()  # 5
+    assert timer.totals == {**dict.fromkeys(PHASES, 0.0), "other": 2, "movement": 2, "stats": 1}
+
+
+def test_instrumented_simulation():
+    """Test that instrumented games count their turns and play exactly like plain ones."""
+    instrumentation = Instrumentation()
+    result = run_simulation(200, 3, seed=3, verbosity=QUIET, games=2, instrumentation=instrumentation)
+
+    assert result["stats"] == run_simulation(200, 3, seed=3, verbosity=QUIET, games=2)["stats"]
+    assert instrumentation.turns == 2 * 200 * 3
+    assert instrumentation.rolls == result["total_rolls"]
+    # Doubles that end on Go To Jail do not extend a streak
+    assert 0 < sum(length * count for length, count in instrumentation.doubles_streaks.items()) <= \
+        result["doubles_count"]
+    assert 0 < instrumentation.jail_exits <= instrumentation.jail_entries
+    assert instrumentation.squares_traversed > instrumentation.rolls
+    assert all(instrumentation.timer.totals[phase] > 0 for phase in ("dice", "movement", "jail", "stats"))
+    assert "turns/s" in instrumentation.report()
+
+    # The jail limit is the one of the plain game too
+    short = run_simulation(200, 3, seed=3, verbosity=QUIET, games=2, instrumentation=Instrumentation(),
+                           max_jail_turns=1)
+    assert short["stats"] == run_simulation(200, 3, seed=3, verbosity=QUIET, games=2, max_jail_turns=1)["stats"]
+    assert short["stats"] != result["stats"]
+
+
+def test_profile_option(tmp_path, capsys):
+    """Test that --profile writes a cProfile dump and prints the summary."""
+    path = tmp_path / "run.pstats"
+    main(["--rounds", "20", "--players", "2", "--seed", "1", "--silent", "--no-save", "--profile", str(path)])
+    assert "turns/s" in capsys.readouterr().out
+    assert pstats.Stats(str(path)).total_calls > 0
@@ -0,0 +1,69 @@
+from stats.registry import RunRegistry, load_frame
+from stats.storage import sources
+
+
+def test_register_run(tmp_path):
+    """Test that runs get unique ids and their counts are aggregated per run."""
+    names = ["Go", "Chance", "Jail", "Chance"]
+    dice = [0] * 36
+    dice[0] = 2  # (1, 1)
+    dice[1] = 1  # (1, 2)
+    dice[6] = 3  # (2, 1)
+
+    with RunRegistry(tmp_path / "runs.sqlite") as registry:
+        first = registry.register_run(names, [1, 2, 3, 4], dice, 10, 2, seed=5, version="test")
+        second = registry.register_run(names, [3, 0, 1, 0], dice, 10, 2, seed=5, version="test")
+        assert first != second
+
+        runs = registry.runs()
+        assert [run["seed"] for run in runs] == [5, 5]
+        assert registry.property_averages() == {"Go": 2.0, "Chance": 3.0, "Jail": 2.0}
+        assert registry.doubles_percentages()[first] == 100 * 2 / 6
+
+    properties = load_frame("property_stats", tmp_path)
+    assert len(properties) == 6
+    assert properties.groupby("run_id")["count"].sum().to_dict() == {first: 10, second: 4}
+
+    dice_frame = load_frame("dice_stats", tmp_path)
+    row = dice_frame[(dice_frame["run_id"] == first) & (dice_frame["dice1"] == 1) & (dice_frame["dice2"] == 2)]
+    assert row["count"].tolist() == [4]
+
+
+def test_chart_aggregates(tmp_path):
+    """Test that the aggregate queries of the charts match the same aggregations of the loaded rows."""
+    names = ["Go", "Chance", "Jail", "Chance"]
+    with RunRegistry(tmp_path / "runs.sqlite") as registry:
+        for seed, rounds in enumerate((10, 10, 20)):
+            dice = [(seed * 7 + outcome * 3) % 5 for outcome in range(36)]
+            registry.register_run(names, [seed, 2, 3 + seed, 1], dice, rounds, 2, games=2, version="test")
+        by_game_size = registry.property_by_game_size()
+        sizes = registry.game_sizes()
+        dice_averages = registry.dice_averages()
+        sum_averages = registry.dice_sum_averages()
+
+    properties = load_frame("property_stats", tmp_path)
+    expected = properties.assign(game_size=properties["rounds"] * properties["players"])
+    expected = expected.groupby(["property_name", "game_size"])["count"].mean().to_dict()
+    assert {(name, size): average for name, size, average in by_game_size} == expected
+    assert sizes == {(20, 2): 2, (40, 2): 1}
+
+    dice = load_frame("dice_stats", tmp_path)
+    assert dice_averages == dice.groupby(["dice1", "dice2"])["count"].mean().to_dict()
+    assert sum_averages == dice.groupby("sum")["count"].mean().to_dict()
+
+
+def test_sources(tmp_path):
+    """Test that the statistics sources are listed in the order the charts prefer them."""
+    (tmp_path / "property_stats.csv").write_text("timestamp,rounds,players,property_name,count\n")
+    assert sources(tmp_path, "property_stats.csv") == ["property_stats.csv"]
+    RunRegistry(tmp_path / "runs.sqlite").close()
+    assert sources(tmp_path, "property_stats.csv") == ["run registry", "property_stats.csv"]
+
+
+def test_game_sizes_mixed_games(tmp_path):
+    """Test that runs of the same total rounds count together, however their rounds are split in games."""
+    names = ["Go", "Chance", "Jail", "Chance"]
+    with RunRegistry(tmp_path / "runs.sqlite") as registry:
+        for rounds, games in ((10, 2), (20, 1), (5, 4), (20, 2)):
+            registry.register_run(names, [1, 2, 3, 4], [1] * 36, rounds, 2, games=games, version="test")
+        assert registry.game_sizes() == {(20, 2): 3, (40, 2): 1}
@@ -0,0 +1,22 @@
+from game.runner import run_parallel, run_shard, shard_seeds, split_games
+
+
+def test_split_games():
+    """Test that games and seeds are split deterministically over shards."""
+    assert split_games(10, 4) == [3, 3, 2, 2]
+    assert sum(split_games(7, 7)) == 7
+    assert shard_seeds(42, 3) == shard_seeds(42, 3)
+    assert len(set(shard_seeds(42, 3))) == 3
+
+
+def test_run_parallel():
+    """Test that the same master seed and shards give the same merged totals."""
+    first = run_parallel(games=6, rounds=10, players=2, master_seed=1, shards=3, max_workers=2)
+    second = run_parallel(games=6, rounds=10, players=2, master_seed=1, shards=3, max_workers=3)
+    assert first == second
+
+    assert first.total_rolls >= 6 * 10 * 2
+
+    # Merged totals are the sum of the shards
+    shards = [run_shard(seed, 2, 10, 2) for seed in shard_seeds(1, 3)]
+    assert first == shards[0] + shards[1] + shards[2]
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from game.service import SimulationService, job_key, job_params, run_chunk
+from game import version
+
+
+async def request(port: int, method: str, path: str, data=None):
+    """Send a request to the service and return (status, body lines)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(data).encode() if data is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, [json.loads(line) for line in body.splitlines() if line]
+
+
+def test_service(tmp_path):
+    """Test submitting a job, streaming its progress and serving it again from the cache."""
+    async def scenario():
+        service = SimulationService(queue_size=2, cache_directory=str(tmp_path), version="test",
+                                    executor=ThreadPoolExecutor(2))
+        port = await service.start(port=0)
+        try:
+            job = {"rounds": 30, "players": 3, "games": 4, "seed": 5}
+            status, (submitted,) = await request(port, "POST", "/jobs", job)
+            assert status == 202 and submitted["status"] in ("queued", "running")
+
+            status, events = await request(port, "GET", f"/jobs/{submitted['job']}/events")
+            assert status == 200
+            assert events[-1]["status"] == "done" and events[-1]["progress"] == 1
+            result = events[-1]["result"]
+            assert sum(result["dice"]) == result["total_rolls"] >= 30 * 3 * 4
+
+            # The same parameters again, from the cache, also after a restart
+            status, (cached,) = await request(port, "POST", "/jobs", job)
+            assert status == 200 and cached["cached"] and cached["result"] == result
+            service.cache.clear()
+            status, (cached,) = await request(port, "POST", "/jobs", job)
+            assert cached["cached"] and cached["result"] == result
+
+            assert (await request(port, "POST", "/jobs", {"rounds": 0, "players": 3}))[0] == 400
+            assert (await request(port, "POST", "/jobs", {"rounds": 5, "players": 3, "max_jail_turns": 0}))[0] == 400
+            status, (error,) = await request(port, "POST", "/jobs", [])
+            assert status == 400 and error["error"] == "The job must be a JSON object"
+            for body in ([1], 5):
+                assert (await request(port, "POST", "/jobs", body))[0] == 400
+            assert (await request(port, "GET", "/jobs/unknown"))[0] == 404
+            status, (health,) = await request(port, "GET", "/health")
+            assert health["cached"] == 1
+            return result
+        finally:
+            await service.close()
+
+    result = asyncio.run(scenario())
+    assert len(result["landings"]) == len(result["squares"]) == 40
+
+
+def test_queue_full(tmp_path):
+    """Test that jobs beyond the queue size are refused."""
+    async def scenario():
+        service = SimulationService(queue_size=1, concurrent_jobs=1, cache_directory=None, version="test",
+                                    executor=ThreadPoolExecutor(1))
+        port = await service.start(port=0)
+        try:
+            statuses = [(await request(port, "POST", "/jobs", {"rounds": 2000, "players": 4, "games": 2, "seed": seed}))[0]
+                        for seed in range(4)]
+        finally:
+            await service.close()
+        return statuses
+
+    assert 503 in asyncio.run(scenario())
+
+
+def test_default_version(monkeypatch):
+    """Test that a service on uncommitted code keys its cache by a hash of the sources."""
+    monkeypatch.setattr(version, "code_version", lambda: "abc1234-dirty")
+    service = SimulationService(cache_directory=None, executor=ThreadPoolExecutor(1))
+    assert service.version == f"abc1234-dirty-{version.source_hash()}"
+    service.executor.shutdown()
+
+
+def test_max_jail_turns():
+    """Test that the jail limit of a job is played and keys its cache."""
+    params = job_params({"rounds": 5, "players": 2, "seed": 1})
+    assert params["max_jail_turns"] == 3
+    short = job_params({"rounds": 5, "players": 2, "seed": 1, "max_jail_turns": 1})
+    assert job_key(short, "test") != job_key(params, "test")
+    assert run_chunk(7, 2, 200, 2, False, 3) == run_chunk(7, 2, 200, 2, False)
+    assert run_chunk(7, 2, 200, 2, False, 1) != run_chunk(7, 2, 200, 2, False)
+
+
+def test_finished_jobs_evicted():
+    """Test that finished jobs are forgotten beyond the cap or the time to live, their results staying cached."""
+    service = SimulationService(cache_directory=None, version="test", executor=ThreadPoolExecutor(1),
+                                max_finished_jobs=2)
+    jobs = []
+    for seed in range(3):
+        params = job_params({"rounds": 5, "players": 2, "seed": seed})
+        service.cache[job_key(params, "test")] = {"seed": seed}
+        jobs.append(service.submit(params))
+    assert list(service.jobs) == [jobs[1].id, jobs[2].id]
+
+    service.job_ttl = 0
+    service.submit(job_params({"rounds": 5, "players": 2, "seed": 0}))
+    assert service.jobs == {} and len(service.cache) == 3
+    service.executor.shutdown()
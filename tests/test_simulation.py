@@ -0,0 +1,27 @@
+import csv
+
+from game.simulation import QUIET, run_simulation, save_statistics
+
+
+def test_run_simulation(capsys):
+    """Test that a quiet simulation prints nothing and is reproducible with a seed."""
+    result = run_simulation(20, 3, seed=7, verbosity=QUIET)
+    assert capsys.readouterr().out == ""
+
+    assert result["players"] == 3
+    assert result["total_rolls"] == sum(result["dice_stats"].values())
+    assert result["total_rolls"] >= 20 * 3
+    assert run_simulation(20, ["A", "B", "C"], seed=7) == result
+
+
+def test_save_statistics(tmp_path):
+    """Test that statistics are appended to the CSV files."""
+    result = run_simulation(10, 2, seed=1, games=2)
+    save_statistics(result, tmp_path)
+    save_statistics(result, tmp_path)
+
+    with open(tmp_path / "property_stats.csv", newline="") as csvfile:
+        rows = list(csv.DictReader(csvfile))
+    assert len(rows) == 2 * len(result["landing_stats"])
+    assert rows[0]["rounds"] == "20"
+    assert sum(int(row["count"]) for row in rows) == 2 * sum(result["landing_stats"].values())
@@ -0,0 +1,40 @@
+from game.cards import Card, CardDecks
+from game.game_logic import Game
+from game.stats import GameStats
+from models.board import Board
+from models.player import Player
+
+
+def test_game_stats_per_square():
+    """Test that landings on squares sharing a name are counted apart."""
+    board = Board()
+    # A Community Chest deck whose card does not move the player
+    game = Game(board, cards=CardDecks(board, chest=[Card("Receive $25 consultancy fee", money=25)]))
+    player = Player("Test")
+    player.position = board.start
+
+    first, second = board.positions["Community Chest"][:2]
+    game.move_player(player, first)
+    game.move_player(player, second - first)
+
+    assert game.stats.landings[first] == 1
+    assert game.stats.landings[second] == 1
+    assert game.get_landing_stats() == {"Community Chest": 2}
+
+
+def test_game_stats_merge():
+    """Test merging counts and the dice views."""
+    first = GameStats(3, [1, 0, 2], [1] + [0] * 35)
+    second = GameStats(3, [0, 5, 1])
+    second.dice[6] = 2  # (2, 1)
+    second.dice[1] = 1  # (1, 2)
+
+    total = first + second
+    assert total.landings == [1, 5, 3]
+    assert total.dice_stats() == {(1, 1): 1, (1, 2): 3}
+    assert total.dice_matrix()[1][0] == 2
+    assert sum([first, second]) == total
+    assert first.landings == [1, 0, 2]
+
+    first.merge(second)
+    assert first == total
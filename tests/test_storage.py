@@ -0,0 +1,27 @@
+import datetime
+
+from stats.storage import DICE_TABLE, PROPERTY_TABLE, partitions, read_table, write_run
+
+
+def test_columnar_round_trip(tmp_path):
+    """Test that runs are written as partitions and read back by day and column."""
+    landing_stats = {"Go": 3, "Jail": 5}
+    dice_stats = {(1, 1): 2, (2, 5): 4}
+    write_run(landing_stats, dice_stats, 10, 2, tmp_path, timestamp=datetime.datetime(2025, 3, 20, 8, 0, 0))
+    write_run(landing_stats, dice_stats, 20, 4, tmp_path, timestamp=datetime.datetime(2025, 3, 21, 8, 0, 0))
+
+    assert len(partitions(PROPERTY_TABLE, tmp_path)) == 2
+
+    properties = read_table(PROPERTY_TABLE, tmp_path)
+    assert list(properties.columns) == ["timestamp", "rounds", "players", "property_name", "count"]
+    assert properties["count"].sum() == 16
+    assert properties.groupby("property_name")["count"].mean().to_dict() == {"Go": 3, "Jail": 5}
+
+    dice = read_table(DICE_TABLE, tmp_path, columns=["sum", "count"], since=datetime.date(2025, 3, 21))
+    assert list(dice.columns) == ["sum", "count"]
+    assert dice["sum"].tolist() == [2, 7]
+
+
+def test_empty_store(tmp_path):
+    """Test reading a table without any partitions."""
+    assert len(read_table(DICE_TABLE, tmp_path)) == 0
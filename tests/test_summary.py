@@ -0,0 +1,50 @@
+import pandas as pd
+
+from stats.summary import StatsSummary, update_summary
+
+
+def append_run(directory, timestamp, rounds, players, landings, dice):
+    """Append one run to the CSV files like save_statistics."""
+    for name, header, rows in (
+        ("property_stats.csv", "timestamp,rounds,players,property_name,count",
+         [f"{name},{count}" for name, count in landings.items()]),
+        ("dice_stats.csv", "timestamp,rounds,players,dice1,dice2,sum,count",
+         [f"{d1},{d2},{d1 + d2},{count}" for (d1, d2), count in dice.items()]),
+    ):
+        path = directory / name
+        with open(path, "a") as csv_file:
+            if path.stat().st_size == 0:
+                csv_file.write(header + "\n")
+            for row in rows:
+                csv_file.write(f"{timestamp},{rounds},{players},{row}\n")
+
+
+def test_incremental_summary(tmp_path):
+    """Test that only appended rows are folded and the means match the full history."""
+    append_run(tmp_path, "2025-03-20 08:00:00", 10, 1, {"Go": 2, "Jail": 4}, {(1, 1): 3, (2, 5): 9})
+    assert update_summary(tmp_path).property_means().to_dict() == {"Go": 2, "Jail": 4}
+
+    append_run(tmp_path, "2025-03-20 09:00:00", 20, 2, {"Go": 6, "Jail": 4}, {(1, 1): 1, (2, 5): 3})
+    summary = StatsSummary(tmp_path / "summary.json")
+    assert summary.update(tmp_path) == 4
+    assert summary.update(tmp_path) == 0
+
+    properties = pd.read_csv(tmp_path / "property_stats.csv")
+    assert summary.property_means().to_dict() == properties.groupby("property_name")["count"].mean().to_dict()
+    assert summary.game_sizes() == {(10, 1): 1, (20, 2): 1}
+    assert sorted(summary.property_by_game_size()["game_size"].unique()) == [10, 40]
+    assert summary.dice_means()[0, 0] == 2
+    assert summary.dice_sum_means().to_dict() == {2: 2, 7: 6}
+    assert summary.doubles_percentages()[0] == 25
+
+
+def test_truncated_csv_rebuilds(tmp_path):
+    """Test that a CSV file shorter than its watermark rebuilds the summary."""
+    append_run(tmp_path, "2025-03-20 08:00:00", 10, 1, {"Go": 2, "Jail": 4}, {(1, 1): 3})
+    append_run(tmp_path, "2025-03-20 09:00:00", 10, 1, {"Go": 6, "Jail": 4}, {(1, 1): 3})
+    update_summary(tmp_path)
+
+    for name in ("property_stats.csv", "dice_stats.csv"):
+        (tmp_path / name).unlink()
+    append_run(tmp_path, "2025-03-21 08:00:00", 10, 1, {"Go": 8}, {(1, 1): 3})
+    assert update_summary(tmp_path).property_means().to_dict() == {"Go": 8}
@@ -0,0 +1,64 @@
+from game.dice import ReplayDice
+from game.economy import JAIL_FINE, Economy
+from game.game_logic import Game
+from game.strategy import BuyBelow, PayToLeaveJail, Strategy
+from game.tournament import run_tournament
+from models.board import Board
+from models.player import Player
+from game import version
+
+
+def test_strategy_decisions():
+    """Test that the game and the economy follow the players' strategies."""
+    board = Board()
+    cheap, default = Player("Cheap", BuyBelow(100)), Player("Default")
+    economy = Economy(board, [cheap, default])
+    boardwalk = board.positions["Boardwalk"][0]
+    assert not economy.wants_to_buy(cheap, boardwalk)
+    assert economy.wants_to_buy(default, boardwalk)
+    assert economy.wants_to_buy(cheap, board.positions["Baltic Avenue"][0])
+
+    game = Game(board, dice=ReplayDice([(1, 2)]))
+    player = Player("Payer", PayToLeaveJail())
+    player.position = game.game_start()
+    game.start_economy([player, Player("Other")])
+    game.go_to_jail(player)
+    game.player_turn(player)
+    assert not player.in_jail
+    assert player.square == board.jail_position + 3
+    # The fine, then States Avenue
+    assert player.money == 1500 - JAIL_FINE - board[player.square].value.purchase
+
+
+def test_tournament_cache(tmp_path):
+    """Test that a tournament only plays the pairings missing from its cache."""
+    cache = str(tmp_path / "tournament.sqlite")
+    strategies = [Strategy(), PayToLeaveJail()]
+    first = run_tournament(strategies, range(3), rules={"max_rounds": 100}, cache_path=cache, version="test")
+    # Both seat orders of the one pairing on every seed
+    assert first.simulated == 6 and first.cached == 0
+    assert all(first.games[key] == 6 for key in first.keys)
+    assert sum(first.wins.values()) + first.unfinished[strategies[0].key] == 6
+
+    strategies.append(BuyBelow(200))
+    second = run_tournament(strategies, range(3), rules={"max_rounds": 100}, cache_path=cache, version="test",
+                            workers=2)
+    assert second.simulated == 12 and second.cached == 6
+    uncached = run_tournament(strategies, range(3), rules={"max_rounds": 100}, cache_path=False, version="test")
+    assert uncached.wins == second.wins and uncached.head_to_head == second.head_to_head
+
+
+def test_cache_version(tmp_path, monkeypatch):
+    """Test that uncommitted or unversioned code keys the caches by a hash of its sources."""
+    (tmp_path / "game").mkdir()
+    source = tmp_path / "game" / "rules.py"
+    source.write_text("JAIL_FINE = 50\n")
+    before = version.source_hash(tmp_path)
+    source.write_text("JAIL_FINE = 100\n")
+    assert version.source_hash(tmp_path) != before
+
+    monkeypatch.setattr(version, "code_version", lambda: "abc1234")
+    assert version.cache_version() == "abc1234"
+    for revision in ("abc1234-dirty", "unknown"):
+        monkeypatch.setattr(version, "code_version", lambda: revision)
+        assert version.cache_version() == f"{revision}-{version.source_hash()}"
@@ -0,0 +1,38 @@
+import pytest
+
+from game.dice import Dice
+from game.variance import AntitheticDice, StratifiedOutcomes, run_experiment
+
+
+def doubles_share(game, players):
+    dice = game.stats.dice
+    return sum(dice[outcome * 7] for outcome in range(6)) / sum(dice)
+
+
+def test_sampling_dice():
+    """Test that antithetic dice mirror the faces and stratified dice cover every outcome."""
+    dice, mirror = Dice(4), AntitheticDice(Dice(4))
+    for _ in range(100):
+        (dice1, dice2, total), (mirror1, mirror2, mirror_total) = dice.roll(), mirror.roll()
+        assert (mirror1, mirror2, mirror_total) == (7 - dice1, 7 - dice2, 14 - total)
+
+    outcomes = StratifiedOutcomes(seed=3, block_size=8)
+    rolls = [[dice.roll() for _ in range(20)] for dice in map(outcomes.dice, range(36))]
+    for n in range(20):
+        assert len({game_rolls[n] for game_rolls in rolls}) == 36
+
+
+def test_run_experiment():
+    """Test the estimates and variance reductions of the sampling modes."""
+    variants = {"3 turns": {}, "1 turn": {"max_jail_turns": 1}}
+    crn = run_experiment({"a": {}, "b": {}}, doubles_share, games=20, rounds=10, players=2, seed=1, mode="crn")
+    # The same games for both variants
+    assert crn.difference("b") == (0.0, 0.0)
+
+    stratified = run_experiment(variants, doubles_share, games=144, rounds=10, players=2, seed=1, mode="stratified")
+    assert stratified.games == 144
+    assert stratified.variance_reduction("3 turns") > 5
+    assert "stratified" in stratified.report()
+
+    with pytest.raises(ValueError):
+        run_experiment(variants, doubles_share, mode="sobol")